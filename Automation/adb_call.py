@@ -13,6 +13,8 @@ import time # <-- ADDED for sleep
 import xml.etree.ElementTree as ET
 from datetime import datetime
 
+from BRAIN.ai_chat_res.tool_executor import cancellable_sleep, cancelled
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -41,6 +43,10 @@ def run_adb_command(command_args, device_id=None):
     else:
         full_command = [adb_executable] + command_args
 
+    if cancelled():
+        # The tool call that needed this command passed its deadline (BRAIN/ai_chat_res/tool_executor.py)
+        return False, "Error: ADB command cancelled."
+
     logging.info(f"Running ADB command: {' '.join(shlex.quote(str(arg)) for arg in full_command)}")
 
     try:
@@ -207,7 +213,9 @@ def connect_adb_wifi(usb_device_id):
 
     # Wait a moment for the adb daemon on the device to restart
     print("Waiting a few seconds for device ADB to restart...")
-    time.sleep(10) # Adjust sleep time if needed
+    if not cancellable_sleep(10): # Adjust sleep time if needed
+        print("Wi-Fi ADB setup cancelled (the request took too long).")
+        return False, None
 
     # Connect to the device over Wi-Fi
     wifi_device_addr = f"{ip_address}:{ADB_WIFI_PORT}"
@@ -18,6 +18,7 @@ sys.path.insert(0, project_root)
 
 from Data.DLG import plug_out, plug_in
 from ENGINE.TTS.TTS_DF import speak
+from BRAIN.ai_chat_res.tool_cache import invalidate_tools
 
 
 def check_plugin_status():
@@ -28,6 +29,7 @@ def check_plugin_status():
         battery = psutil.sensors_battery()
 
         if battery.power_plugged != previous_state:
+            invalidate_tools("power")  # Cached battery answers are stale now
             if battery.power_plugged:
               random_low = random.choice(plug_in)
               speak(random_low)
@@ -46,6 +48,7 @@ def check_plugin_status1():
     battery = psutil.sensors_battery()
 
     if battery.power_plugged != previous_state:
+        invalidate_tools("power")
         if battery.power_plugged:
             random_low = random.choice(plug_in1)
             speak(random_low)  # Assuming speak function is defined
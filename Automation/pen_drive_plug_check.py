@@ -30,6 +30,8 @@ except ImportError:
     dialog_available = False
     logging.warning("Could not import DLG or TTS modules for pen_drive_plug_check.")
 
+from BRAIN.ai_chat_res.tool_cache import invalidate_tools
+
 
 def get_usb_devices():
     """
@@ -134,6 +136,8 @@ def pen_drive_connected():
 
             added = current_devices - previous_devices_monitor
             removed = previous_devices_monitor - current_devices
+            if added or removed:
+                invalidate_tools("usb")  # Cached pen drive answers are stale now
 
             if added:
                 for device in added:
@@ -4,26 +4,21 @@ import os
 if __name__ == '__main__':
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
-from groq import Groq
-from json import load, dump
-import datetime
-from dotenv import dotenv_values
-from BRAIN.ai_chat_res.RealtimeSearchEngine_groq import RealTimeSearchEngine
+from BRAIN.ai_chat_res.llm_client import get_env
+from BRAIN.ai_chat_res.model_cascade import chat_cascade, offline_mode
+from BRAIN.ai_chat_res.RealtimeSearchEngine_groq import RealTimeSearchEngineStream
+from BRAIN.ai_chat_res.chat_history import chat_history
+from BRAIN.ai_chat_res.context_window import context_window
+from BRAIN.ai_chat_res.completion_cache import completion_cache, make_key, is_follow_up, time_context
 
 # Load environment variables from .env file
-env_vars = dotenv_values(".env")
+env_vars = get_env()
 
 # Access environment variables
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize Groq client
-client = Groq(api_key=GroqAPIKey)
-
-# Initialize an empty list to store chat messages.
-messages = []
-
 # Define a system message that provides context to the AI chatbot about its role and behavior.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI voice assistant named {Assistantname} which also has real-time up-to-date information from the internet.
 You are {Assistantname}, an AI assistant created to help {Username} with various tasks and provide information.
@@ -66,29 +61,9 @@ SystemChatBot = [{
     "content": System
 }]
 
-# Attempt to load chat history from a JSON file.
-try:
-    with open(r"Data/ChatLog.json", "r") as f:
-        messages = load(f)
-except FileNotFoundError:
-    # if the file doesn't exist, create an empty JSON file to store chat log.
-    with open(r"Data/ChatLog.json", "w") as f:
-        dump([], f)
-
-# Function to get real-time information
-def Information():
-    current_date_time = datetime.datetime.now()
-    day = current_date_time.strftime("%A")
-    date = current_date_time.strftime("%d")
-    month = current_date_time.strftime("%B")
-    year = current_date_time.strftime("%Y")
-    hour = current_date_time.strftime("%H")
-    minute = current_date_time.strftime("%M")
-    second = current_date_time.strftime("%S")
-    data = f"User this Real-time information if needed:\n"
-    data += f"Day: {day}\nDate: {date}\nMonth: {month}\nYear: {year}\n"
-    data += f"Time: {hour} hours, {minute} minutes, {second} seconds.\n"
-    return data
+# Function to get real-time information (date only, unless the query asks about the time)
+def Information(Query=None):
+    return time_context(Query)
 
 # Function to modify the answer to remove empty lines
 def AnswerModifier(Answer):
@@ -97,65 +72,93 @@ def AnswerModifier(Answer):
     modified_Answer = "\n".join(non_empty_lines)
     return modified_Answer
 
-# Function to get a response from the AI
-def ChatBot(Query):
+# Hard token budget for one ChatBot request: llama3-70b-8192 has an 8192-token context
+# and max_tokens reserves 2089 of it for the answer
+CHATBOT_CONTEXT_BUDGET = 6000
+
+# How long answers are reused: general answers for a few hours, search fallbacks briefly
+CHATBOT_CACHE_TTL = 6 * 3600
+REALTIME_FALLBACK_CACHE_TTL = 10 * 60
+
+# Function to stream a response from the AI
+def ChatBotStream(Query, budget_tokens=CHATBOT_CONTEXT_BUDGET):
     """
-    Function to get a response from the AI chatbot.
+    Streams the chatbot's answer as text deltas while it is being generated.
+    The chat history is saved once the answer is complete.
+
+    Only as much history as fits in budget_tokens is sent: the latest turns verbatim
+    and a rolling summary of the older ones.
     """
-    global messages
     try:
-        # Load existing chat history/log
-        chat_log_path = r"Data/ChatLog.json"
-        if os.path.exists(chat_log_path):
-            with open(chat_log_path, "r") as f:
-                messages = load(f)
-        else:
-            messages = []
-
-        messages.append({"role": "user", "content": Query})
-
         # Get real-time information
-        real_time_info = Information()
-
-        # Prepare the initial message set for AI response
-        completion_messages = (
-            SystemChatBot +
-            [{"role": "system", "content": real_time_info}] +
-            messages
+        real_time_info = Information(Query)
+
+        # Standalone questions are answered from the completion cache when possible.
+        # The key leaves out the history, so follow-ups ("tell me more") are never cached.
+        cache_key = None
+        if not is_follow_up(Query):
+            cache_key = make_key("llama3-70b-8192", SystemChatBot + [
+                {"role": "system", "content": real_time_info},
+                {"role": "user", "content": Query},
+            ], max_tokens=2089, temperature=0.7)
+            cached_answer = completion_cache.get(cache_key)
+            if cached_answer is not None:
+                yield cached_answer
+                chat_history.append_turn(Query, cached_answer)
+                return
+
+        # Prepare the message set for AI response within the token budget
+        completion_messages = context_window.build(
+            SystemChatBot + [{"role": "system", "content": real_time_info}],
+            chat_history.messages(),
+            [{"role": "user", "content": Query}],
+            budget_tokens,
         )
 
-        # Get response from the AI model
-        completion = client.chat.completions.create(
-            model="llama3-70b-8192",
-            messages=completion_messages,
-            max_tokens=2089,
-            temperature=0.7,
-            top_p=1,
-            stream=True,
-            stop=None
-        )
+        # Get response from the AI model (llama3-70b-8192, hedged to a faster model when slow)
+        # and pass every delta on as soon as it arrives
+        answer_parts = []
+        for delta in chat_cascade.stream(completion_messages, max_tokens=2089, temperature=0.7, top_p=1):
+            answer_parts.append(delta)
+            yield delta
+        Answer = "".join(answer_parts).strip()
 
-        # Process AI response
-        Answer = "".join(chunk.choices[0].delta.content for chunk in completion if chunk.choices[0].delta.content)
-        Answer = Answer.replace("</s>", "").strip()
+        # Local-model answers are not kept for when the cloud models are back
+        cache_ttl = 0 if offline_mode() else CHATBOT_CACHE_TTL
 
-        # **Check if AI response is empty or not relevant**
-        if not Answer or "I don't know" in Answer or "I'm not sure" in Answer:
+        # **Check if AI response is empty or not relevant** (no web search in offline mode)
+        if (not Answer or "I don't know" in Answer or "I'm not sure" in Answer) and not offline_mode():
             print("Using RealTimeSearchEngine for accurate data...")
-            real_time_response = RealTimeSearchEngine(Query)
-            Answer = real_time_response if real_time_response else "Sorry, I couldn't find relevant data."
-
-        messages.append({"role": "assistant", "content": Answer})
-
-        # Save updated chat history/log
-        with open(chat_log_path, "w") as f:
-            dump(messages, f, indent=4)
-
-        return AnswerModifier(Answer)
+            if Answer:
+                yield "\n"
+            fallback_parts = []
+            for delta in RealTimeSearchEngineStream(Query, save_history=False):
+                fallback_parts.append(delta)
+                yield delta
+            real_time_response = "".join(fallback_parts).strip()
+            if not real_time_response:
+                real_time_response = "Sorry, I couldn't find relevant data."
+                yield real_time_response
+                cache_ttl = 0
+            Answer = real_time_response
+            cache_ttl = min(cache_ttl, REALTIME_FALLBACK_CACHE_TTL)
+
+        if cache_key and not Answer.startswith("An error occured"):
+            completion_cache.put(cache_key, Answer, cache_ttl)
+
+        # Save this turn to the chat history/log
+        chat_history.append_turn(Query, Answer)
 
     except Exception as e:
         print(f"Error: {e}")
-        return "An error occurred while processing your request."
+        yield "An error occurred while processing your request."
+
+# Function to get a response from the AI
+def ChatBot(Query, budget_tokens=CHATBOT_CONTEXT_BUDGET):
+    """
+    Function to get a response from the AI chatbot.
+    """
+    return AnswerModifier("".join(ChatBotStream(Query, budget_tokens)))
 
 # Example usage
 # if __name__ == "__main__":
@@ -1,31 +1,19 @@
-from googlesearch import search
 # from googleapiclient.discovery import build
-from groq import Groq
-from json import load, dump
-import requests
-from dotenv import dotenv_values
-import yfinance as yf
-import plotly.graph_objects as go
-import pandas as pd
-from prophet import Prophet
-import re  # Import regular expression module
-from duckduckgo_search import DDGS
-# import datetime
-from bs4 import BeautifulSoup
-from BRAIN.ai_chat_res.stock.stockRealtime import get_stock_real_time_info
-from datetime import datetime
+from BRAIN.ai_chat_res.llm_client import get_env
+from BRAIN.ai_chat_res.chat_history import chat_history
+from BRAIN.ai_chat_res.completion_cache import completion_cache, make_key, time_context
+from BRAIN.ai_chat_res.model_cascade import offline_mode, search_cascade
+from BRAIN.ai_chat_res.retrieval import retriever
+from BRAIN.ai_chat_res.web_search import ddg_results, format_results, google_results, web_search
 
 
 
 # Load environment variables
-env_vars = dotenv_values(".env")
+env_vars = get_env()
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize Groq client
-client = Groq(api_key=GroqAPIKey)
-
 # System prompt
 System = f"""You are {Assistantname}, an AI assistant with real-time capabilities. Follow these rules:
 1. Provide current information using the provided search results and real-time data
@@ -39,43 +27,20 @@ System = f"""You are {Assistantname}, an AI assistant with real-time capabilitie
 9. If the user asks in Hindi, reply in Hindi using English script (Hinglish)
 10. If the user asks something like \"What is X? in Hindi\", reply in Hindi using English script (Hinglish)"""
 
-# Load chat history
-try:
-    with open(r"Data/ChatLog.json", "r") as f:
-        ChatLog = load(f)
-except FileNotFoundError:
-    with open(r"Data/ChatLog.json", "w") as f:
-        ChatLog = []
-        dump(ChatLog, f)
-
-# Function to get real-time information
-def Information():
-    current_date_time = datetime.now()  # Use datetime.now() directly
-    day = current_date_time.strftime("%A")
-    date = current_date_time.strftime("%d")
-    month = current_date_time.strftime("%B")
-    year = current_date_time.strftime("%Y")
-    hour = current_date_time.strftime("%H")
-    minute = current_date_time.strftime("%M")
-    second = current_date_time.strftime("%S")
-    data = f"User this Real-time information if needed:\n"
-    data += f"Day: {day}\nDate: {date}\nMonth: {month}\nYear: {year}\n"
-    data += f"Time: {hour} hours, {minute} minutes, {second} seconds.\n"
-    return data
+# How long a search-grounded answer is reused
+REALTIME_CACHE_TTL = 10 * 60
+# Seconds all search sources together may take; slower sources are left out of the answer
+SEARCH_DEADLINE = 4.0
+
+# Function to get real-time information (date only, unless the query asks about the time)
+def Information(prompt=None):
+    return time_context(prompt)
 
 
 # Function to get real-time information from the internet using Google
 def GoogleSearch(query):
     try:
-        results = list(search(query, num_results=20))
-        Answer = f"The search results for '{query}' are:\n[start]\n"
-        for result in results:
-            Answer += f"Title: {result}\n"
-            Answer += f"URL: {result}\n\n"
-            Answer += f"Description: {result}\n\n"
-            Answer += f"Snippet: {result}\n\n"
-        Answer += "[end]"
-        return Answer
+        return format_results(query, google_results(query, max_results=20), max_results=20)
     except Exception as e:
         return f"The search results for '{query}' are:\n[start]\nNo results found. Error: {e}[end]"
     
@@ -92,14 +57,7 @@ def perform_ddg_search(query: str, max_results: int = 10) -> None:
         str: formatted search results as a string.
     """
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
-            answer = f"The search results for '{query}' are:\n[start]\n"
-            for result in results:
-                answer += f"Title: {result.get('title')}\n"
-                answer += f"URL: {result.get('link')}\n\n"
-            answer += "[end]"
-            return answer
+        return format_results(query, ddg_results(query, max_results=max_results), max_results=max_results)
     except Exception as e:
         return f"The search results for '{query}' are:\n[start]\nNo results found. Error: {e}\n[end]"
 
@@ -247,14 +205,24 @@ def AnswerModifier(Answer):
     non_empty_lines = [line for line in lines if line.strip()]
     return "\n".join(non_empty_lines)
 
-# Function to get chatbot response
-def RealTimeSearchEngine(prompt: str) -> str:
-    global SystemChatBot, messages
-    try:
-        with open(r"Data/ChatLog.json", "r") as f:
-            messages = load(f)
+# Function to stream chatbot response
+def RealTimeSearchEngineStream(prompt: str, save_history: bool = True):
+    """
+    Streams the search-grounded answer as text deltas while it is being generated.
 
-        messages.append({"role": "user", "content": f"{prompt}"})
+    Args:
+        prompt (str): The user's query.
+        save_history (bool): Whether to append this turn to the chat log. Callers
+            that keep their own history (e.g. ChatBot's fallback) pass False.
+    """
+    try:
+        # Search answers are reused for a few minutes, keyed on the query and the time context,
+        # so a cache hit also skips the web searches
+        cache_key = make_key("llama3-8b-8192", [
+            {"role": "system", "content": System},
+            {"role": "system", "content": Information(prompt)},
+            {"role": "user", "content": prompt},
+        ], max_tokens=2048, temperature=0.7)
 
         # if "stock" in prompt.lower() or "price" in prompt.lower():
         #     # stock_symbol = extract_stock_name(prompt)
@@ -310,40 +278,44 @@ def RealTimeSearchEngine(prompt: str) -> str:
         #     return stockResult
             # else:
             #     return get_stock_real_time_info(prompt)
-        search_results = GoogleSearch(prompt)
-        search_resultsddg = perform_ddg_search(prompt)
-        completion_messages = [
-        {"role": "system", "content": System},
-        {"role": "system", "content": search_results + "\n" + search_resultsddg},
-        # {"role": "user", "content": stockResult},
-        {"role": "system", "content": Information()}  # Correctly call Information()
-        # {"role": "system", "content": stockResult}
-        ]
-
-        completion = client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=completion_messages,
-            temperature=0.7,
-            max_tokens=2048,
-            top_p=1,
-            stream=True,
-            stop=None
-        )
-
-        Answer = ""
-        for chunk in completion:
-            if chunk.choices[0].delta.content is not None:
-                Answer += chunk.choices[0].delta.content
-
-        messages.append({"role": "assistant", "content": Answer.strip()})
-
-        with open(r"Data/ChatLog.json", "w") as f:
-            dump(messages, f, indent=4)
-
-        return AnswerModifier(Answer)
+        def search_and_answer():
+            if offline_mode():
+                # No web searches offline; the local model answers from what it knows
+                search_results = "Offline mode: no web search results are available."
+            else:
+                # Google and DuckDuckGo are queried at the same time; their results are
+                # deduplicated and ranked into one list. The top pages are then fetched and
+                # only their passages most relevant to the prompt are passed on.
+                search_results = retriever.context(prompt, web_search.search(prompt, deadline=SEARCH_DEADLINE))
+            completion_messages = [
+            {"role": "system", "content": System},
+            {"role": "system", "content": search_results},
+            # {"role": "user", "content": stockResult},
+            {"role": "system", "content": Information(prompt)},  # Correctly call Information()
+            # {"role": "system", "content": stockResult}
+            {"role": "user", "content": prompt}
+            ]
+
+            # llama3-8b-8192, hedged to a faster model when slow
+            yield from search_cascade.stream(completion_messages, temperature=0.7, max_tokens=2048, top_p=1)
+
+        answer_parts = []
+        # Offline answers lack the search results, so they are not cached
+        cache_ttl = 0 if offline_mode() else REALTIME_CACHE_TTL
+        for delta in completion_cache.stream(cache_key, search_and_answer, cache_ttl):
+            answer_parts.append(delta)
+            yield delta
+        Answer = "".join(answer_parts)
+
+        if save_history:
+            chat_history.append_turn(f"{prompt}", Answer.strip())
 
     except Exception as e:
-        return f"An error occured: {e}"
+        yield f"An error occured: {e}"
+
+# Function to get chatbot response
+def RealTimeSearchEngine(prompt: str) -> str:
+    return AnswerModifier("".join(RealTimeSearchEngineStream(prompt)))
 # def perform_ddg_search(query: str, max_results: int = 10) -> None:
 #     """
 #     Performs a DuckDuckGo search and prints the results.
@@ -0,0 +1,155 @@
+# BRAIN/ai_chat_res/chat_history.py
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+# Append-only log, one {"role": ..., "content": ...} message per line
+CHAT_HISTORY_PATH = r"Data/ChatLog.jsonl"
+# Old whole-file JSON history, imported once into the log
+LEGACY_CHAT_LOG_PATH = r"Data/ChatLog.json"
+
+
+class ChatHistoryStore:
+    """
+    Chat history shared by ChatBot, RealTimeSearchEngine and get_stock_real_time_info.
+
+    Messages are kept in memory and every new message is appended as one JSON line,
+    so a turn costs O(1) instead of re-reading and rewriting the whole history.
+    All writes go through one lock-protected file handle (the single writer);
+    compact() rewrites the log atomically through a temporary file.
+    """
+
+    def __init__(self, path: str = CHAT_HISTORY_PATH, legacy_path: Optional[str] = LEGACY_CHAT_LOG_PATH,
+                 max_messages: Optional[int] = None) -> None:
+        """
+        Args:
+            path (str): The JSONL log file.
+            legacy_path (str): ChatLog.json to import when the log does not exist yet.
+            max_messages (int): If set, older messages are dropped by compaction once the
+                history grows past twice this size. None keeps everything.
+        """
+        self.path = path
+        self.legacy_path = legacy_path
+        self.max_messages = max_messages
+        self._messages: Optional[List[Dict[str, str]]] = None
+        self._file = None
+        self._lock = threading.RLock()
+
+    def _load(self) -> None:
+        """Reads the log into memory (once), importing the legacy JSON file if needed."""
+        if self._messages is not None:
+            return
+        messages = []
+        needs_compaction = False
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        messages.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Most likely a write torn by a crash; drop it and rewrite the log
+                        logging.warning(f"Skipping unreadable line {line_number} in {self.path}")
+                        needs_compaction = True
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            try:
+                with open(self.legacy_path, "r", encoding="utf-8") as f:
+                    messages = json.load(f)
+                needs_compaction = True
+                logging.info(f"Imported {len(messages)} messages from {self.legacy_path}")
+            except (json.JSONDecodeError, OSError) as e:
+                logging.error(f"Could not import {self.legacy_path}: {e}")
+        self._messages = messages
+        if needs_compaction:
+            self._rewrite(messages)
+
+    def _handle(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rewrite(self, messages: List[Dict[str, str]]) -> None:
+        """Atomically replaces the log with messages (write temp file, fsync, rename)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Returns a copy of the whole history, oldest first."""
+        with self._lock:
+            self._load()
+            return list(self._messages)
+
+    def recent(self, count: int) -> List[Dict[str, str]]:
+        """Returns the last `count` messages."""
+        with self._lock:
+            self._load()
+            return self._messages[-count:] if count > 0 else []
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._messages)
+
+    def append(self, *messages: Dict[str, str]) -> None:
+        """
+        Appends messages to the history. Messages passed together (e.g. a user message and
+        its answer) are written with a single write call.
+        """
+        if not messages:
+            return
+        messages = [{"role": message["role"], "content": message["content"]} for message in messages]
+        with self._lock:
+            self._load()
+            f = self._handle()
+            f.write("".join(json.dumps(message, ensure_ascii=False) + "\n" for message in messages))
+            f.flush()
+            self._messages.extend(messages)
+            if self.max_messages and len(self._messages) > 2 * self.max_messages:
+                self.compact(self.max_messages)
+
+    def append_turn(self, user_content: str, assistant_content: str) -> None:
+        """Appends a user message and the assistant's answer."""
+        self.append({"role": "user", "content": user_content},
+                    {"role": "assistant", "content": assistant_content})
+
+    def compact(self, keep_last: Optional[int] = None) -> None:
+        """
+        Rewrites the log atomically, optionally keeping only the last `keep_last` messages.
+        Readers never see a half-written file: the new log replaces the old one in one rename.
+        """
+        with self._lock:
+            self._load()
+            if keep_last is not None:
+                self._messages = self._messages[-keep_last:] if keep_last > 0 else []
+            self._rewrite(self._messages)
+
+    def clear(self) -> None:
+        """Deletes the whole history."""
+        self.compact(keep_last=0)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# Shared store: every module must use this one so there is a single writer
+chat_history = ChatHistoryStore()
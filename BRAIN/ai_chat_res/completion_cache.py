@@ -0,0 +1,253 @@
+# BRAIN/ai_chat_res/completion_cache.py
+"""
+Cache for LLM completions.
+
+Requests are keyed on the model, the request parameters and the normalized messages.
+For identical questions to produce identical requests, the real-time context in the
+system prompt is quantized by time_context(): date only, unless the query asks about
+the time.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Granularity of the time context: "day", "hour", "minute" or "second"
+TIME_GRANULARITY = "day"
+# Used instead when the query is about the time itself
+TIME_QUERY_GRANULARITY = "minute"
+TIME_QUERY_PATTERN = re.compile(r"\b(time|clock|hours?|minutes?|seconds?|baje|samay|waqt|timing)\b", re.IGNORECASE)
+
+COMPLETION_CACHE_PATH = r"Data/CompletionCache.json"
+
+# Queries that refer back to the conversation ("tell me more", "what about it") depend on
+# history that is not part of their cache key, so they are never answered from the cache
+FOLLOW_UP_PATTERN = re.compile(
+    r"\b(it|its|this|that|these|those|he|she|him|her|they|them|their|more|again|else|above|previous|"
+    r"last|also|iska|uska|iske|uske|ye|yeh|woh|aur)\b", re.IGNORECASE)
+
+
+def time_context(query: Optional[str] = None, granularity: Optional[str] = None) -> str:
+    """
+    Real-time information for the system prompt, quantized so it only changes once per
+    `granularity`. Without an explicit granularity: TIME_QUERY_GRANULARITY if the query
+    mentions the time, TIME_GRANULARITY otherwise.
+    """
+    if granularity is None:
+        granularity = TIME_QUERY_GRANULARITY if query and TIME_QUERY_PATTERN.search(query) else TIME_GRANULARITY
+    now = datetime.now()
+    data = f"User this Real-time information if needed:\n"
+    data += f"Day: {now.strftime('%A')}\nDate: {now.strftime('%d')}\nMonth: {now.strftime('%B')}\nYear: {now.strftime('%Y')}\n"
+    if granularity == "hour":
+        data += f"Time: {now.strftime('%H')} hours.\n"
+    elif granularity == "minute":
+        data += f"Time: {now.strftime('%H')} hours, {now.strftime('%M')} minutes.\n"
+    elif granularity == "second":
+        data += f"Time: {now.strftime('%H')} hours, {now.strftime('%M')} minutes, {now.strftime('%S')} seconds.\n"
+    return data
+
+
+def is_follow_up(query: str) -> bool:
+    return bool(FOLLOW_UP_PATTERN.search(query))
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def normalize_messages(messages: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Collapses whitespace in every message; user messages are also case-folded and lose
+    trailing punctuation, so "What is AI?" and "what is ai" share an entry.
+    """
+    normalized = []
+    for message in messages:
+        content = normalize_text(message.get("content") or "")
+        if message.get("role") == "user":
+            content = content.casefold().rstrip(".?!। ")
+        normalized.append({"role": message.get("role"), "content": content})
+    return normalized
+
+
+def make_key(model: str, messages: Iterable[Dict[str, str]], **params) -> str:
+    payload = json.dumps({"model": model, "messages": normalize_messages(messages), "params": params},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _size(value) -> int:
+    """Approximate bytes an entry takes in the JSON file."""
+    return len(value) if isinstance(value, str) else len(json.dumps(value, ensure_ascii=False))
+
+
+class CompletionCache:
+    """
+    LRU cache with per-entry TTL for completion texts (or other JSON values), optionally
+    persisted to a JSON file. Thread-safe; counts hits, misses, evictions and expirations.
+
+    Changes are written to disk by a background timer at most once per `save_interval`
+    and at interpreter exit, never on the request path.
+    """
+
+    def __init__(self, max_entries: int = 512, default_ttl: float = 6 * 3600, path: Optional[str] = None,
+                 save_interval: float = 30.0, max_bytes: Optional[int] = None) -> None:
+        """
+        Args:
+            max_entries (int): Least recently used entries are evicted beyond this size.
+            default_ttl (float): Seconds an entry stays valid unless put() says otherwise.
+            path (str): JSON file to load from and save to, or None for memory only.
+            save_interval (float): Seconds between a change and the write that persists it.
+            max_bytes (int): Least recently used entries are also evicted while the values
+                take more than this many bytes; None for no limit.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self.default_ttl = default_ttl
+        self.path = path
+        self.save_interval = save_interval
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        if path:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logging.warning(f"Ignoring unreadable completion cache {self.path}: {e}")
+            return
+        now = time.time()
+        for key, (expires_at, value) in entries.items():
+            if expires_at > now:
+                self._entries[key] = (expires_at, value)
+                self._bytes += _size(value)
+        self._evict()
+
+    def _over_limit(self) -> bool:
+        return len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1)
+
+    def _evict(self) -> int:
+        """Drops least recently used entries until the cache fits its limits. Called with the lock held."""
+        evicted = 0
+        while self._over_limit():
+            _, (_, value) = self._entries.popitem(last=False)
+            self._bytes -= _size(value)
+            evicted += 1
+        return evicted
+
+    def _schedule_save(self) -> None:
+        """Marks the cache as changed and starts the save timer if none is pending. Called with the lock held."""
+        if not self.path:
+            return
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_interval, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """Writes pending changes atomically (temp file + rename)."""
+        with self._lock:
+            self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            snapshot = dict(self._entries)
+        with self._save_lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logging.error(f"Could not save completion cache {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                self._bytes -= _size(entry[1])
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._bytes -= _size(previous[1])
+            self._entries[key] = (time.time() + ttl, value)
+            self._bytes += _size(value)
+            self._entries.move_to_end(key)
+            self.evictions += self._evict()
+            self._schedule_save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._schedule_save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def stream(self, key: str, produce: Callable[[], Iterator[str]], ttl: Optional[float] = None,
+               should_cache: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+        """
+        Yields the cached text for key, or streams produce() and caches the joined text once
+        the stream has finished (and should_cache(text) allows it).
+        """
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for delta in produce():
+            parts.append(delta)
+            yield delta
+        text = "".join(parts)
+        if text.strip() and (should_cache is None or should_cache(text)):
+            self.put(key, text, ttl)
+
+
+# Shared cache for all completion call sites
+completion_cache = CompletionCache(path=COMPLETION_CACHE_PATH)
@@ -0,0 +1,233 @@
+# BRAIN/ai_chat_res/context_window.py
+import hashlib
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+# Rolling summary of the turns that no longer fit verbatim, kept between runs
+SUMMARY_PATH = r"Data/ChatSummary.json"
+SUMMARY_MODEL = "llama-3.1-8b-instant"
+
+# Tokens added per message by the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+# Tokens of new messages summarized in one update; a long backlog catches up over several turns
+FOLD_TOKEN_BUDGET = 3000
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """Returns the tiktoken encoding, or None if tiktoken (or its encoding file) is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    # tiktoken missing, or its encoding file could not be downloaded
+                    logging.warning(f"tiktoken unavailable, estimating tokens from length: {e}")
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken when available, otherwise estimates ~4 characters per token."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def _fingerprint(message: Dict[str, str]) -> str:
+    return hashlib.sha1(json.dumps(message, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _groq_summarize(prompt: str) -> str:
+    from BRAIN.ai_chat_res.llm_client import get_groq_client
+    from BRAIN.ai_chat_res.model_cascade import local_stream, offline_mode
+
+    if offline_mode():
+        # Summarize with the resident local model instead of Groq
+        messages = [{"role": "user", "content": prompt}]
+        return "".join(local_stream(messages, max_tokens=512, temperature=0.2)).strip()
+
+    completion = get_groq_client().chat.completions.create(
+        model=SUMMARY_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.2,
+        max_tokens=512,
+        stream=False,
+    )
+    return completion.choices[0].message.content.strip()
+
+
+class ContextWindow:
+    """
+    Builds the messages for a chat request within a hard token budget.
+
+    The last `keep_turns` turns are sent verbatim. Older turns are folded into a rolling
+    summary that is updated incrementally on a background thread: each update summarizes
+    the previous summary plus the next aged-out messages (up to fold_tokens of them), never
+    the whole history, so an old backlog is caught up over several turns.
+    Aged-out messages that are not summarized yet are still sent verbatim if they fit.
+    """
+
+    def __init__(self, keep_turns: int = 6, fold_size: int = 8, summary_words: int = 200,
+                 fold_tokens: int = FOLD_TOKEN_BUDGET, summary_path: Optional[str] = SUMMARY_PATH,
+                 summarize: Optional[Callable[[str], str]] = None) -> None:
+        """
+        Args:
+            keep_turns (int): Turns (user + assistant message pairs) always sent verbatim.
+            fold_size (int): Unsummarized old messages needed before the summary is updated.
+            summary_words (int): Target length of the rolling summary.
+            fold_tokens (int): Tokens of new messages summarized in one update at most.
+            summary_path (str): JSON file caching the summary between runs, or None.
+            summarize (Callable): prompt -> summary text. Defaults to a Groq completion
+                (the local model in offline mode).
+        """
+        self.keep_turns = keep_turns
+        self.fold_size = fold_size
+        self.summary_words = summary_words
+        self.fold_tokens = fold_tokens
+        self.summary_path = summary_path
+        self.summarize = summarize or _groq_summarize
+        self._state = None
+        self._lock = threading.Lock()
+        self._folding = False
+
+    # --- Summary state: {"covered": n, "fingerprint": hash of message n-1, "summary": text} ---
+
+    def _load_state(self) -> dict:
+        if self._state is None:
+            self._state = {"covered": 0, "fingerprint": None, "summary": ""}
+            if self.summary_path and os.path.exists(self.summary_path):
+                try:
+                    with open(self.summary_path, "r", encoding="utf-8") as f:
+                        self._state = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    logging.warning(f"Ignoring unreadable {self.summary_path}: {e}")
+        return self._state
+
+    def _save_state(self) -> None:
+        if not self.summary_path:
+            return
+        temp_path = f"{self.summary_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, indent=4, ensure_ascii=False)
+        os.replace(temp_path, self.summary_path)
+
+    def _valid_state(self, history: List[Dict[str, str]]) -> dict:
+        """Returns the summary state, reset if the history it covered has changed (e.g. compaction)."""
+        state = self._load_state()
+        covered = state["covered"]
+        if covered and (covered > len(history) or _fingerprint(history[covered - 1]) != state["fingerprint"]):
+            logging.info("Chat history changed under the rolling summary; starting a new summary.")
+            state = self._state = {"covered": 0, "fingerprint": None, "summary": ""}
+        return state
+
+    def _fold(self, history: List[Dict[str, str]], start: int, end: int, previous_summary: str) -> None:
+        """Summarizes history[start:end] into the previous summary (runs on a background thread)."""
+        try:
+            transcript = "\n".join(f"{message['role']}: {message['content']}" for message in history[start:end])
+            prompt = (
+                f"Update the running summary of a conversation between a user and their voice assistant.\n"
+                f"Keep facts, names, preferences, decisions and open tasks; drop greetings and filler.\n"
+                f"Answer with the updated summary only, at most {self.summary_words} words.\n\n"
+                f"Current summary:\n{previous_summary or '(none)'}\n\n"
+                f"New messages:\n{transcript}"
+            )
+            summary = self.summarize(prompt)
+            with self._lock:
+                self._state = {"covered": end, "fingerprint": _fingerprint(history[end - 1]), "summary": summary}
+                self._save_state()
+            logging.info(f"Rolling summary now covers {end} messages ({count_tokens(summary)} tokens).")
+        except Exception as e:
+            logging.error(f"Could not update the rolling chat summary: {e}")
+        finally:
+            self._folding = False
+
+    def _fold_end(self, history: List[Dict[str, str]], start: int, split: int) -> int:
+        """End of the next fold: the messages from `start` that fit fold_tokens (at least one), up to `split`."""
+        end, used = start, 0
+        while end < split:
+            used += count_tokens(history[end]["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if used > self.fold_tokens and end > start:
+                break
+            end += 1
+        return end
+
+    def _schedule_fold(self, history: List[Dict[str, str]], start: int, end: int, summary: str) -> None:
+        if self._folding:
+            return
+        self._folding = True
+        threading.Thread(target=self._fold, args=(history, start, end, summary),
+                         name="context-summary", daemon=True).start()
+
+    def build(self, system_messages: List[Dict[str, str]], history: List[Dict[str, str]],
+              new_messages: List[Dict[str, str]], budget_tokens: int) -> List[Dict[str, str]]:
+        """
+        Returns system_messages + [summary] + fitting history + new_messages within budget_tokens.
+
+        System and new messages are always sent. Then, newest first: the verbatim recent
+        turns, the rolling summary, and any not-yet-summarized older messages.
+        """
+        fixed_tokens = count_message_tokens(system_messages) + count_message_tokens(new_messages)
+        remaining = budget_tokens - fixed_tokens
+        if remaining < 0:
+            logging.warning(f"System prompt and query alone use {fixed_tokens} tokens, over the {budget_tokens} budget.")
+            return system_messages + new_messages
+
+        split = max(0, len(history) - 2 * self.keep_turns)
+        with self._lock:
+            state = self._valid_state(history)
+            covered = min(state["covered"], split)
+            summary = state["summary"] if covered else ""
+        if split - covered >= self.fold_size:
+            self._schedule_fold(list(history), covered, self._fold_end(history, covered, split), summary)
+
+        # Recent turns, newest first, until the budget runs out
+        selected = []
+        for message in reversed(history[split:]):
+            cost = count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if cost > remaining:
+                break
+            selected.append(message)
+            remaining -= cost
+        all_recent = len(selected) == len(history) - split
+
+        summary_messages = []
+        if summary and all_recent:
+            summary_message = {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
+            cost = count_tokens(summary_message["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if cost <= remaining:
+                summary_messages.append(summary_message)
+                remaining -= cost
+
+        # Older messages the summary does not cover yet
+        if all_recent:
+            for message in reversed(history[covered:split]):
+                cost = count_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+                if cost > remaining:
+                    break
+                selected.append(message)
+                remaining -= cost
+
+        selected.reverse()
+        return system_messages + summary_messages + selected + new_messages
+
+
+# Shared context window for the chat history
+context_window = ContextWindow()
@@ -0,0 +1,255 @@
+# BRAIN/ai_chat_res/function_call_parser.py
+"""
+Local extraction, repair and validation of the router's function-call answers.
+
+The router is asked for {"function": ..., "query": ...} (or a JSON array of them for several
+actions, or native tool calls, which the providers pass on as {"tool_calls": [...]}), but
+small models often wrap it in
+a code fence or a <tool_call> block, use Python-style single quotes or slightly misspell
+a function name. Each of these used to be treated as "not JSON" and answered by a second,
+more expensive ChatBot request. FunctionCallParser repairs them locally and validates the
+function name against the registry, so only genuine conversational answers fall back.
+JSON quoted inside prose ("you could send {"function": ...} next time") is an answer, not
+a call: a call must be the whole reply, or the whole content of a fence or call block.
+"""
+import ast
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from difflib import get_close_matches
+from typing import Dict, Iterable, List, Optional, Union
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*(.*?)```", re.DOTALL)
+# <tool_call>...</tool_call>, <function_call>...</function_call> as some models emit them
+_CALL_BLOCK = re.compile(r"<(tool_call|function_call|functioncall)>\s*(.*?)\s*</\1>", re.DOTALL | re.IGNORECASE)
+_UNQUOTED_KEY = re.compile(r"([{,]\s*)([A-Za-z_]\w*)\s*:")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+# get_battery_status() / open_website("youtube.com") written as a call
+_CALL_SYNTAX = re.compile(r"^`*\s*([A-Za-z_]\w*)\s*\(\s*(?:(['\"])(.*?)\2)?\s*\)\s*`*$", re.DOTALL)
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+# Keys some models use instead of "function" / "query"
+_FUNCTION_KEYS = ("function", "function_name", "name", "tool")
+_QUERY_KEYS = ("query", "arguments", "args", "input", "prompt")
+
+
+@dataclass
+class FunctionCall:
+    function: str
+    query: str
+    repairs: List[str] = field(default_factory=list)  # what had to be fixed, empty if the JSON was valid
+
+    def to_dict(self) -> dict:
+        return {"function": self.function, "query": self.query}
+
+    def to_json(self) -> str:
+        """Canonical form, e.g. for caching the router answer."""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+def calls_to_json(calls: List[FunctionCall]) -> str:
+    """Canonical form of one or several calls; parses back to the same calls."""
+    if len(calls) == 1:
+        return calls[0].to_json()
+    return json.dumps([call.to_dict() for call in calls], ensure_ascii=False)
+
+
+def _first_balanced(text: str, opener: str = "{") -> Optional[str]:
+    """The first balanced {...} (or [...]) in text (quotes respected), or None."""
+    closer = "}" if opener == "{" else "]"
+    start = text.find(opener)
+    while start != -1:
+        depth = 0
+        quote = None
+        escaped = False
+        for index in range(start, len(text)):
+            char = text[index]
+            if quote:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == quote:
+                    quote = None
+            elif char in "\"'":
+                quote = char
+            elif char == opener:
+                depth += 1
+            elif char == closer:
+                depth -= 1
+                if depth == 0:
+                    return text[start:index + 1]
+        start = text.find(opener, start + 1)
+    return None
+
+
+def _loads_lenient(candidate: str, repairs: List[str]) -> Union[dict, list, None]:
+    """json.loads, then the same with common near-JSON mistakes fixed."""
+    try:
+        value = json.loads(candidate)
+        return value if isinstance(value, (dict, list)) else None
+    except json.JSONDecodeError:
+        pass
+    fixed = _TRAILING_COMMA.sub(r"\1", _UNQUOTED_KEY.sub(r'\1"\2":', candidate))
+    try:
+        value = json.loads(fixed)
+        repairs.append("syntax")
+        return value if isinstance(value, (dict, list)) else None
+    except json.JSONDecodeError:
+        pass
+    try:
+        # Python literal syntax: single quotes, True/None
+        value = ast.literal_eval(fixed)
+        repairs.append("single_quotes")
+        return value if isinstance(value, (dict, list)) else None
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+class FunctionCallParser:
+    """Turns a router answer into a validated FunctionCall, repairing near-JSON locally."""
+
+    def __init__(self, functions: Iterable[str], fuzzy_cutoff: float = 0.8) -> None:
+        """
+        Args:
+            functions (Iterable[str]): Valid function names (functions_call.available_functions).
+            fuzzy_cutoff (float): Minimum similarity for correcting a misspelled function name.
+        """
+        self.functions = set(functions)
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._normalized = {self._normalize_name(name): name for name in self.functions}
+        self._lock = threading.Lock()
+        self.valid = 0       # strict JSON, known function
+        self.repaired = 0    # needed a repair: each one is a ChatBot fallback avoided
+        self.rejected = 0    # looked like a function call but could not be validated
+        self.direct = 0      # plain answers with no function call in them
+        self.repairs_by_kind: Dict[str, int] = {}
+
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        return re.sub(r"[\s\-]+", "_", name.strip().strip("`'\"").rstrip("()").strip()).lower()
+
+    def _resolve_function(self, name: str, repairs: List[str]) -> Optional[str]:
+        if name in self.functions:
+            return name
+        normalized = self._normalize_name(name)
+        if normalized in self._normalized:
+            repairs.append("function_name_format")
+            return self._normalized[normalized]
+        matches = get_close_matches(normalized, list(self._normalized), n=1, cutoff=self.fuzzy_cutoff)
+        if matches:
+            repairs.append("function_name_fuzzy")
+            return self._normalized[matches[0]]
+        return None
+
+    def _extract(self, text: str, repairs: List[str]) -> Optional[List[dict]]:
+        """The call objects in text, or None if it contains none."""
+        stripped = text.strip().translate(_SMART_QUOTES)
+        if stripped != text.strip():
+            repairs.append("smart_quotes")
+        fence = _FENCE.search(stripped)
+        block = _CALL_BLOCK.search(stripped)
+        if fence:
+            stripped = fence.group(1).strip()
+            repairs.append("code_fence")
+        elif block:
+            stripped = block.group(2).strip()
+            repairs.append("call_block")
+        call = _CALL_SYNTAX.match(stripped)
+        if call:
+            repairs.append("call_syntax")
+            return [{"function": call.group(1), "query": call.group(3) or ""}]
+        object_start, array_start = stripped.find("{"), stripped.find("[")
+        opener = "[" if array_start != -1 and (object_start == -1 or array_start < object_start) else "{"
+        candidate = _first_balanced(stripped, opener)
+        if candidate is None or candidate != stripped:
+            return None  # No JSON, or JSON quoted inside prose
+        data = _loads_lenient(candidate, repairs)
+        if isinstance(data, dict) and isinstance(data.get("tool_calls"), list):
+            data = data["tool_calls"]
+        if isinstance(data, dict):
+            return [data]
+        if isinstance(data, list):
+            items = [item for item in data if isinstance(item, dict)]
+            return items or None
+        return None
+
+    def _validate(self, data: dict, repairs: List[str]) -> Optional[FunctionCall]:
+        name = next((data[key] for key in _FUNCTION_KEYS if isinstance(data.get(key), str)), None)
+        if name is None and isinstance(data.get("function"), dict):
+            # OpenAI tool-call shape: {"function": {"name": ..., "arguments": ...}}
+            data = data["function"]
+            name = data.get("name") if isinstance(data.get("name"), str) else None
+        function = self._resolve_function(name, repairs) if name else None
+        if not function:
+            return None
+        query_key = next((key for key in _QUERY_KEYS if key in data), None)
+        query = data[query_key] if query_key else ""
+        if isinstance(query, str) and query.lstrip().startswith("{"):
+            # Native tool-call arguments arrive as a JSON string
+            try:
+                query = json.loads(query)
+            except json.JSONDecodeError:
+                pass
+        if query is None:
+            query = ""
+        elif isinstance(query, dict):
+            # {"query": "Mom"} from a tool schema, or {"contact_query": "Mom"}: the first argument is the query
+            if query_key == "query":
+                repairs.append("query_type")
+            query = query.get("query", next(iter(query.values()), ""))
+            query = "" if query is None else str(query)
+        elif not isinstance(query, str):
+            query = str(query)
+            repairs.append("query_type")
+        return FunctionCall(function, query, repairs)
+
+    def parse_all(self, text: str) -> List[FunctionCall]:
+        """
+        Returns every validated function call in the router's answer, in order. Empty if the
+        answer is a direct reply or names no known function.
+        """
+        repairs: List[str] = []
+        items = self._extract(text or "", repairs)
+        calls = []
+        for item in items or []:
+            call = self._validate(item, repairs)
+            if call is not None:
+                calls.append(call)
+        for call in calls:
+            call.repairs = repairs
+
+        with self._lock:
+            if not calls:
+                if items is None and (text or "").strip()[:1] not in ("{", "[", "`", "<"):
+                    self.direct += 1
+                else:
+                    self.rejected += 1
+                    logging.info(f"Router answer names no known function: {text!r}")
+            elif repairs:
+                self.repaired += 1
+                for kind in repairs:
+                    self.repairs_by_kind[kind] = self.repairs_by_kind.get(kind, 0) + 1
+                logging.info(f"Repaired router answer ({', '.join(repairs)}): {text!r}")
+            else:
+                self.valid += 1
+        return calls
+
+    def parse(self, text: str) -> Optional[FunctionCall]:
+        """The first validated function call in the router's answer, or None."""
+        calls = self.parse_all(text)
+        return calls[0] if calls else None
+
+    def stats(self) -> dict:
+        """Counts since startup; fallbacks_avoided is the number of ChatBot requests saved."""
+        with self._lock:
+            return {
+                "valid": self.valid,
+                "repaired": self.repaired,
+                "fallbacks_avoided": self.repaired,
+                "rejected": self.rejected,
+                "direct": self.direct,
+                "repairs_by_kind": dict(self.repairs_by_kind),
+            }
@@ -6,19 +6,25 @@ import logging
 import subprocess
 import time
 
-import scipy as sp
-
 from ENGINE.STT.apple_stt import speech_to_text # <-- Use Apple STT
 from ENGINE.TTS.eSpeakNG_fast50ms import speak
-import wave
-
-import tkinter as tk
-from tkinter import simpledialog
-
-from BRAIN.ai_chat_res.stock.stockRealtime import get_stock_price, plot_stock_chart, extract_stock_symbol_groq
-from BRAIN.ai_chat_res.RealtimeSearchEngine_groq import perform_ddg_search, GoogleSearch, RealTimeSearchEngine
-from BRAIN.ai_chat_res.Chatbot import ChatBot
-from BRAIN.ai_chat_res.image_gen.img_gen import generate_and_save_image as generate_image_from_hf_api
+from BRAIN.ai_chat_res.lazy_loader import lazy_module, lazy_function
+from BRAIN.ai_chat_res.tool_cache import cached_tool
+
+# Heavy modules (Groq clients, yfinance/matplotlib, the image client, pyautogui...) are imported
+# on first use instead of at startup; main.py pre-warms the common ones in the background.
+get_stock_price = lazy_function("BRAIN.ai_chat_res.stock.stockRealtime", "get_stock_price")
+plot_stock_chart = lazy_function("BRAIN.ai_chat_res.stock.stockRealtime", "plot_stock_chart")
+extract_stock_symbol_groq = lazy_function("BRAIN.ai_chat_res.stock.stockRealtime", "extract_stock_symbol_groq")
+get_watchlist_prices = lazy_function("BRAIN.ai_chat_res.stock.stockRealtime", "get_watchlist_prices")
+extract_stock_symbols = lazy_function("BRAIN.ai_chat_res.stock.stockRealtime", "extract_stock_symbols")
+perform_ddg_search = lazy_function("BRAIN.ai_chat_res.RealtimeSearchEngine_groq", "perform_ddg_search")
+GoogleSearch = lazy_function("BRAIN.ai_chat_res.RealtimeSearchEngine_groq", "GoogleSearch")
+RealTimeSearchEngine = lazy_function("BRAIN.ai_chat_res.RealtimeSearchEngine_groq", "RealTimeSearchEngine")
+RealTimeSearchEngineStream = lazy_function("BRAIN.ai_chat_res.RealtimeSearchEngine_groq", "RealTimeSearchEngineStream")
+ChatBot = lazy_function("BRAIN.ai_chat_res.Chatbot", "ChatBot")
+ChatBotStream = lazy_function("BRAIN.ai_chat_res.Chatbot", "ChatBotStream")
+generate_image_from_hf_api = lazy_function("BRAIN.ai_chat_res.image_gen.img_gen", "generate_and_save_image")
 
 # --- Tkinter Input Helper ---
 _tk_root = None
@@ -62,6 +68,11 @@ def _get_tkinter_root():
             finally:
                 _tk_tried_appkit_init = True 
 
+        try:
+            import tkinter as tk # Imported here so startup does not pay for Tk
+        except ImportError as e:
+            logging.error(f"Tkinter is not available: {e}")
+            return None
         try:
             _tk_root = tk.Tk()
             _tk_root.withdraw() # Hide the main Tkinter window
@@ -99,18 +110,15 @@ def get_input_from_popup(prompt_message: str, title: str = "Input") -> str:
 
 # --- Add File Reading Imports ---
 # Assuming file_reader.py is in the same directory or accessible via path
-try:
-    from Automation.textRead import presentation_read, pdf_read, ms_word, get_file_path
-    from Automation.search_in_google import search_google
-    from Automation.battery_alert import battery_alert1
-    from Automation.check_battery_persentage import get_battery_percentage_advice as get_battery_advice_func
-except ImportError:
-    # print("Warning: Could not import file reader functions.")
-    def presentation_read(query: str) -> str: return "File reading function (presentation) not available."
-    def pdf_read(query: str) -> str: return "File reading function (PDF) not available."
-    def ms_word(query: str) -> str: return "File reading function (Word) not available."
+presentation_read = lazy_function("Automation.textRead", "presentation_read",
+                                  lambda query: "File reading function (presentation) not available.")
+pdf_read = lazy_function("Automation.textRead", "pdf_read", lambda query: "File reading function (PDF) not available.")
+ms_word = lazy_function("Automation.textRead", "ms_word", lambda query: "File reading function (Word) not available.")
+get_file_path = lazy_function("Automation.textRead", "get_file_path", lambda location: location)
+search_google = lazy_function("Automation.search_in_google", "search_google")
+battery_alert1 = lazy_function("Automation.battery_alert", "battery_alert1")
+get_battery_advice_func = lazy_function("Automation.check_battery_persentage", "get_battery_percentage_advice")
 # --- End Add File Reading Imports ---
-# --- Add WhatsApp Imports ---
 
 # --- NEW: Import functions from open_closeWebApp.py ---
 # Adjust path to go up two levels from BRAIN/ai_chat_res to the project root, then into Automation
@@ -118,150 +126,103 @@ automation_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 if automation_path not in sys.path:
     sys.path.insert(0, automation_path)
 
-try:
-    from Automation.open_closeWebApp import (
-        open_website,
-        open_application,
-        close_application,
-        # close_current_tab_or_window # Import the new function
-    )
-    from Automation.adb_call import (
-        # get_contact_number_google, 
-        make_phone_call_adb, 
-        end_call_adb, 
-        check_adb_connection, 
-        toggle_speaker_adb, 
-        take_screenshot_adb, 
-        get_battery_percentage_adb,
-        get_contact_number_from_file,
-        ensure_adb_connection,
-        get_sim_slot_choice,
-        run_adb_command
-        )
-    # print("Successfully imported functions from open_closeWebApp.")
-    adb_available = True
-
-    from Automation.caption_in_video import (
-        volume_up, volume_down, mute_volume, unmute_volume,
-        seek_forward, seek_backward, seek_forward_10s, seek_backward_10s,
-        seek_backward_frame, seek_forward_frame, seek_to_beginning, seek_to_end,
-        seek_to_previous_chapter, seek_to_next_chapter, move_to_next_video,
-        move_to_previous_video, decrease_playback_speed, increase_playback_speed,
-        toggle_subtitles, increase_font_size, decrease_font_size,
-        rotate_text_opacity, rotate_window_opacity
-    )
-    video_control_available = True
-
-    from Automation.pen_drive_plug_check import is_pen_drive_present
-    pen_drive_check_available = True
-
-    from Automation.Another_Automation_in_youtube import (
-        pan_up, pan_down, pan_left, pan_right,
-        zoom_in, zoom_out, go_to_search_box,
-        toggle_play_pause, toggle_mute_unmute, toggle_full_screen,
-        toggle_theater_mode, toggle_miniplayer_mode, exit_full_screen,
-        toggle_party_mode, navigate_forward, navigate_backward
-    )
-    youtube_extra_control_available = True
-
-    from Automation.tab_automation import (
-        open_new_tab,
-        close_tab, # Use close_current_tab_or_window instead
-        open_browser_menu,
-        zoom_in as browser_zoom_in, # Rename to avoid clash
-        zoom_out as browser_zoom_out, # Rename to avoid clash
-        refresh_page,
-        switch_to_next_tab,
-        switch_to_previous_tab,
-        open_history,
-        open_bookmarks,
-        go_back,
-        go_forward,
-        open_dev_tools,
-        toggle_full_screen as browser_toggle_fullscreen, # Rename to avoid clash
-        open_private_window
-    )
-    tab_automation_available = True
-
-except ImportError as e:
-    # print(f"ERROR: Could not import from open_closeWebApp.py: {e}")
-    # Define dummy functions if import fails, so the script doesn't crash
-    def open_website(query: str) -> str: return "Error: open_website function not available."
-    def open_application(query: str) -> str: return "Error: open_application function not available."
-    def close_application(query: str) -> str: return "Error: close_application function not available."
-    def close_current_tab_or_window() -> str: return "Error: close_current_tab_or_window function not available."
-    def get_contact_number_google(name_query: str): return None, f"Error: Google contact search function not available: {e}"
-    def check_adb_connection(): return False, [], f"ADB check unavailable: {e}"
-    def make_phone_call_adb(recipient_number: str, sim_slot: int = None, target_device_id: str = None): return f"ADB call unavailable: {e}"
-    def get_contact_number_from_file(name_query: str): return None, f"Local contact search unavailable: {e}"
-    def end_call_adb(device_id: str = None): return False, f"ADB end call unavailable: {e}"
-    def toggle_speaker_adb(device_id: str = None, speaker_on: bool = None): return False, f"ADB speaker toggle unavailable: {e}"
-    def take_screenshot_adb(device_id: str = None): return False, f"ADB screenshot unavailable: {e}"
-    def get_battery_percentage_adb(device_id: str = None): return False, f"ADB battery check unavailable: {e}"
-    adb_available = False
-
-    # Dummy functions for video control
-    def volume_up(): pass
-    def volume_down(): pass
-    def mute_volume(): pass
-    def unmute_volume(): pass
-    def seek_forward(): pass
-    def seek_backward(): pass
-    def seek_forward_10s(): pass
-    def seek_backward_10s(): pass
-    def seek_backward_frame(): pass
-    def seek_forward_frame(): pass
-    def seek_to_beginning(): pass
-    def seek_to_end(): pass
-    def seek_to_previous_chapter(): pass
-    def seek_to_next_chapter(): pass
-    def move_to_next_video(): pass
-    def move_to_previous_video(): pass
-    def decrease_playback_speed(): pass
-    def increase_playback_speed(): pass
-    def toggle_subtitles(): pass
-    def increase_font_size(): pass
-    def decrease_font_size(): pass
-    def rotate_text_opacity(): pass
-    def rotate_window_opacity(): pass
-    video_control_available = False
-
-    def is_pen_drive_present(): return f"Pen drive check unavailable: {e}"
-    pen_drive_check_available = False
-
-    def pan_up(): pass
-    def pan_down(): pass
-    def pan_left(): pass
-    def pan_right(): pass
-    def zoom_in(): pass
-    def zoom_out(): pass
-    def go_to_search_box(): pass
-    def toggle_play_pause(): pass
-    def toggle_mute_unmute(): pass
-    def toggle_full_screen(): pass
-    def toggle_theater_mode(): pass
-    def toggle_miniplayer_mode(): pass
-    def exit_full_screen(): pass
-    def toggle_party_mode(): pass
-    def navigate_forward(): pass
-    def navigate_backward(): pass
-    youtube_extra_control_available = False
-
-    def open_new_tab(): pass
-    def open_browser_menu(): pass
-    def browser_zoom_in(): pass
-    def browser_zoom_out(): pass
-    def refresh_page(): pass
-    def switch_to_next_tab(): pass
-    def switch_to_previous_tab(): pass
-    def open_history(): pass
-    def open_bookmarks(): pass
-    def go_back(): pass
-    def go_forward(): pass
-    def open_dev_tools(): pass
-    def browser_toggle_fullscreen(): pass
-    def open_private_window(): pass
-    tab_automation_available = False
+# Each Automation module is imported the first time one of its functions runs. The *_available()
+# checks replace the old flags that were set by a single try/except around all of these imports.
+_open_close_module = lazy_module("Automation.open_closeWebApp")
+open_website = _open_close_module.function("open_website", lambda query: "Error: open_website function not available.")
+open_application = _open_close_module.function("open_application", lambda query: "Error: open_application function not available.")
+close_application = _open_close_module.function("close_application", lambda query: "Error: close_application function not available.")
+
+_adb_module = lazy_module("Automation.adb_call")
+make_phone_call_adb = _adb_module.function("make_phone_call_adb")
+end_call_adb = _adb_module.function("end_call_adb")
+check_adb_connection = _adb_module.function("check_adb_connection")
+toggle_speaker_adb = _adb_module.function("toggle_speaker_adb")
+take_screenshot_adb = _adb_module.function("take_screenshot_adb")
+get_battery_percentage_adb = _adb_module.function("get_battery_percentage_adb")
+get_contact_number_from_file = _adb_module.function("get_contact_number_from_file")
+ensure_adb_connection = _adb_module.function("ensure_adb_connection")
+get_sim_slot_choice = _adb_module.function("get_sim_slot_choice")
+run_adb_command = _adb_module.function("run_adb_command")
+
+_video_module = lazy_module("Automation.caption_in_video")
+volume_up = _video_module.function("volume_up")
+volume_down = _video_module.function("volume_down")
+mute_volume = _video_module.function("mute_volume")
+unmute_volume = _video_module.function("unmute_volume")
+seek_forward = _video_module.function("seek_forward")
+seek_backward = _video_module.function("seek_backward")
+seek_forward_10s = _video_module.function("seek_forward_10s")
+seek_backward_10s = _video_module.function("seek_backward_10s")
+seek_backward_frame = _video_module.function("seek_backward_frame")
+seek_forward_frame = _video_module.function("seek_forward_frame")
+seek_to_beginning = _video_module.function("seek_to_beginning")
+seek_to_end = _video_module.function("seek_to_end")
+seek_to_previous_chapter = _video_module.function("seek_to_previous_chapter")
+seek_to_next_chapter = _video_module.function("seek_to_next_chapter")
+move_to_next_video = _video_module.function("move_to_next_video")
+move_to_previous_video = _video_module.function("move_to_previous_video")
+decrease_playback_speed = _video_module.function("decrease_playback_speed")
+increase_playback_speed = _video_module.function("increase_playback_speed")
+toggle_subtitles = _video_module.function("toggle_subtitles")
+increase_font_size = _video_module.function("increase_font_size")
+decrease_font_size = _video_module.function("decrease_font_size")
+rotate_text_opacity = _video_module.function("rotate_text_opacity")
+rotate_window_opacity = _video_module.function("rotate_window_opacity")
+
+_pen_drive_module = lazy_module("Automation.pen_drive_plug_check")
+is_pen_drive_present = _pen_drive_module.function("is_pen_drive_present")
+
+_youtube_module = lazy_module("Automation.Another_Automation_in_youtube")
+pan_up = _youtube_module.function("pan_up")
+pan_down = _youtube_module.function("pan_down")
+pan_left = _youtube_module.function("pan_left")
+pan_right = _youtube_module.function("pan_right")
+zoom_in = _youtube_module.function("zoom_in")
+zoom_out = _youtube_module.function("zoom_out")
+go_to_search_box = _youtube_module.function("go_to_search_box")
+toggle_play_pause = _youtube_module.function("toggle_play_pause")
+toggle_mute_unmute = _youtube_module.function("toggle_mute_unmute")
+toggle_full_screen = _youtube_module.function("toggle_full_screen")
+toggle_theater_mode = _youtube_module.function("toggle_theater_mode")
+toggle_miniplayer_mode = _youtube_module.function("toggle_miniplayer_mode")
+exit_full_screen = _youtube_module.function("exit_full_screen")
+toggle_party_mode = _youtube_module.function("toggle_party_mode")
+navigate_forward = _youtube_module.function("navigate_forward")
+navigate_backward = _youtube_module.function("navigate_backward")
+
+_tab_module = lazy_module("Automation.tab_automation")
+open_new_tab = _tab_module.function("open_new_tab")
+close_tab = _tab_module.function("close_tab")
+open_browser_menu = _tab_module.function("open_browser_menu")
+browser_zoom_in = _tab_module.function("zoom_in") # Renamed to avoid clash
+browser_zoom_out = _tab_module.function("zoom_out") # Renamed to avoid clash
+refresh_page = _tab_module.function("refresh_page")
+switch_to_next_tab = _tab_module.function("switch_to_next_tab")
+switch_to_previous_tab = _tab_module.function("switch_to_previous_tab")
+open_history = _tab_module.function("open_history")
+open_bookmarks = _tab_module.function("open_bookmarks")
+go_back = _tab_module.function("go_back")
+go_forward = _tab_module.function("go_forward")
+open_dev_tools = _tab_module.function("open_dev_tools")
+browser_toggle_fullscreen = _tab_module.function("toggle_full_screen") # Renamed to avoid clash
+open_private_window = _tab_module.function("open_private_window")
+
+
+def adb_available() -> bool:
+    return _adb_module.available()
+
+def video_control_available() -> bool:
+    return _video_module.available()
+
+def pen_drive_check_available() -> bool:
+    return _pen_drive_module.available()
+
+def youtube_extra_control_available() -> bool:
+    return _youtube_module.available()
+
+def tab_automation_available() -> bool:
+    return _tab_module.available()
 
 # --- End NEW Import ---
 
@@ -279,6 +240,11 @@ def chat_with_chatbot(query: str) -> str:
     """
     return ChatBot(query)
 
+def chat_with_chatbot_stream(query: str):
+    """Streaming variant of chat_with_chatbot: yields the answer as text deltas."""
+    return ChatBotStream(query)
+
+# Not cached here: quote_service caches quotes as long as the market allows
 def get_stock_price_info(query: str) -> str:
     """
     Get the current stock price for a given stock symbol.
@@ -292,6 +258,19 @@ def get_stock_price_info(query: str) -> str:
     speak("Fetching the stock price for you.")
     return get_stock_price(extract_stock_symbol_groq(query))
 
+def get_watchlist_prices_info(query: str) -> str:
+    """
+    Get the current prices of several stocks at once, e.g. "tcs, infosys and wipro".
+    
+    Args:
+        query (str): The user's query, naming the stocks.
+    
+    Returns:
+        str: One line per stock with its current price.
+    """
+    speak("Fetching the stock prices for you.")
+    return get_watchlist_prices(extract_stock_symbols(query))
+
 def get_stock_chart(query: str) -> str:
     """
     Generate and display a stock chart for a given stock symbol.
@@ -318,6 +297,12 @@ def Real_Time_Search_Engine(query: str) -> str:
     speak("Searching the web for you.")
     return RealTimeSearchEngine(query)
 
+def Real_Time_Search_Engine_stream(query: str):
+    """Streaming variant of Real_Time_Search_Engine: yields the answer as text deltas."""
+    speak("Searching the web for you.")
+    return RealTimeSearchEngineStream(query)
+
+@cached_tool(ttl=600)
 def perform_duckduckgo_search(query: str) -> str:
     """
     Perform a search using DuckDuckGo and return the results.
@@ -331,6 +316,7 @@ def perform_duckduckgo_search(query: str) -> str:
     speak("Searching DuckDuckGo for you.")
     return perform_ddg_search(query)
 
+@cached_tool(ttl=600)
 def perform_google_search(query: str) -> str:
     """
     Perform a search using Google and return the results.
@@ -361,6 +347,8 @@ def search_google_via_pywhatkit(query: str) -> str:
         # logging.error(f"Error during search_google_via_pywhatkit: {e}")
         return f"Sorry, failed to perform Google search for '{query}'. Error: {e}"
     
+# Cached answers are dropped when the charger is plugged in or out (Automation/battery_plug_check.py)
+@cached_tool(ttl=30, ignore_query=True, invalidate_on=("power",))
 def get_battery_status(query: str = None) -> str:
     """
     Checks the current battery level and status.
@@ -373,6 +361,7 @@ def get_battery_status(query: str = None) -> str:
         print(f"Error getting battery status: {e}")
         return "Sorry, I encountered an error while checking the battery status."
 
+@cached_tool(ttl=60, ignore_query=True, invalidate_on=("power",))
 def get_battery_advice(query: str = None) -> str:
     """Checks the current battery percentage and provides advice based on the level."""
     try:
@@ -388,7 +377,7 @@ def _get_adb_device_id():
     """Checks for a single, authorized ADB device and returns its ID."""
     # global last_known_wifi_adb_address # Access the global variable
 
-    if not adb_available:
+    if not adb_available():
         # logging.error("ADB functionality is not available.")
         return None, "ADB functionality is not available."
 
@@ -510,6 +499,7 @@ def take_adb_screenshot(query: str = None): # Query ignored
     success, message = take_screenshot_adb(device_id=device_id)
     return message # Return status message
 
+@cached_tool(ttl=60, ignore_query=True, cache_if=lambda result: str(result).startswith("The phone battery"))
 def get_adb_battery_percentage(query: str = None): # Query ignored
     """Gets the battery percentage via ADB."""
     logging.info("ADB Battery Check Request")
@@ -590,7 +580,7 @@ def generate_image(query: str) -> str:
 # --- NEW: Wrapper functions for Video Control ---
 def _video_control_wrapper(func, action_name: str, query: str = None):
     """Generic wrapper for simple video control actions."""
-    if not video_control_available:
+    if not func.available(): # Checks the module the action comes from (video, YouTube or tab automation)
         return f"Video control function ({action_name}) unavailable due to import error."
     try:
         func() # Call the imported function
@@ -693,10 +683,12 @@ def video_rotate_window_opacity(query: str = None):
     return _video_control_wrapper(rotate_window_opacity, "rotating window opacity")
 # --- END NEW Video Control Wrappers ---
 
+# Dropped when a drive is connected or removed (Automation/pen_drive_plug_check.py)
+@cached_tool(ttl=60, ignore_query=True, invalidate_on=("usb",))
 def check_pen_drive_status(query: str = None): # Query is ignored
     """Checks if a pen drive (USB drive) is currently connected."""
     logging.info("Pen Drive Check Request")
-    if not pen_drive_check_available:
+    if not pen_drive_check_available():
         return "Pen drive check function is unavailable due to an import error."
     try:
         # Call the function from pen_drive_plug_check.py
@@ -708,157 +700,160 @@ def check_pen_drive_status(query: str = None): # Query is ignored
     
 def youtube_pan_up(query: str = None):
     """Pans the view up in YouTube 360/VR videos."""
-    if not youtube_extra_control_available: return "YouTube pan control unavailable."
+    if not youtube_extra_control_available(): return "YouTube pan control unavailable."
     return _video_control_wrapper(pan_up, "panning up")
 
 def youtube_pan_down(query: str = None):
     """Pans the view down in YouTube 360/VR videos."""
-    if not youtube_extra_control_available: return "YouTube pan control unavailable."
+    if not youtube_extra_control_available(): return "YouTube pan control unavailable."
     return _video_control_wrapper(pan_down, "panning down")
 
 def youtube_pan_left(query: str = None):
     """Pans the view left in YouTube 360/VR videos."""
-    if not youtube_extra_control_available: return "YouTube pan control unavailable."
+    if not youtube_extra_control_available(): return "YouTube pan control unavailable."
     return _video_control_wrapper(pan_left, "panning left")
 
 def youtube_pan_right(query: str = None):
     """Pans the view right in YouTube 360/VR videos."""
-    if not youtube_extra_control_available: return "YouTube pan control unavailable."
+    if not youtube_extra_control_available(): return "YouTube pan control unavailable."
     return _video_control_wrapper(pan_right, "panning right")
 
 def youtube_zoom_in(query: str = None):
     """Zooms in the view in YouTube 360/VR videos."""
-    if not youtube_extra_control_available: return "YouTube zoom control unavailable."
+    if not youtube_extra_control_available(): return "YouTube zoom control unavailable."
     return _video_control_wrapper(zoom_in, "zooming in")
 
 def youtube_zoom_out(query: str = None):
     """Zooms out the view in YouTube 360/VR videos."""
-    if not youtube_extra_control_available: return "YouTube zoom control unavailable."
+    if not youtube_extra_control_available(): return "YouTube zoom control unavailable."
     return _video_control_wrapper(zoom_out, "zooming out")
 
 def youtube_go_to_search(query: str = None):
     """Activates the search box within the YouTube page."""
-    if not youtube_extra_control_available: return "YouTube search box control unavailable."
+    if not youtube_extra_control_available(): return "YouTube search box control unavailable."
     return _video_control_wrapper(go_to_search_box, "activating search box")
 
 def youtube_toggle_play_pause(query: str = None):
     """Toggles play/pause for the YouTube video."""
-    if not youtube_extra_control_available: return "YouTube play/pause control unavailable."
+    if not youtube_extra_control_available(): return "YouTube play/pause control unavailable."
     return _video_control_wrapper(toggle_play_pause, "toggling play/pause")
 
 def youtube_toggle_mute(query: str = None):
     """Toggles mute/unmute for the YouTube video."""
-    if not youtube_extra_control_available: return "YouTube mute control unavailable."
+    if not youtube_extra_control_available(): return "YouTube mute control unavailable."
     return _video_control_wrapper(toggle_mute_unmute, "toggling mute")
 
 def youtube_toggle_fullscreen(query: str = None):
     """Toggles fullscreen mode for the YouTube video."""
-    if not youtube_extra_control_available: return "YouTube fullscreen control unavailable."
+    if not youtube_extra_control_available(): return "YouTube fullscreen control unavailable."
     return _video_control_wrapper(toggle_full_screen, "toggling fullscreen")
 
 def youtube_toggle_theater_mode(query: str = None):
     """Toggles theater mode for the YouTube video."""
-    if not youtube_extra_control_available: return "YouTube theater mode control unavailable."
+    if not youtube_extra_control_available(): return "YouTube theater mode control unavailable."
     return _video_control_wrapper(toggle_theater_mode, "toggling theater mode")
 
 def youtube_toggle_miniplayer(query: str = None):
     """Toggles miniplayer mode for the YouTube video."""
-    if not youtube_extra_control_available: return "YouTube miniplayer control unavailable."
+    if not youtube_extra_control_available(): return "YouTube miniplayer control unavailable."
     return _video_control_wrapper(toggle_miniplayer_mode, "toggling miniplayer")
 
 def youtube_exit_fullscreen(query: str = None):
     """Exits fullscreen or miniplayer mode."""
-    if not youtube_extra_control_available: return "YouTube exit fullscreen control unavailable."
+    if not youtube_extra_control_available(): return "YouTube exit fullscreen control unavailable."
     return _video_control_wrapper(exit_full_screen, "exiting fullscreen/miniplayer")
 
 def youtube_toggle_party_mode(query: str = None):
     """Toggles the 'awesome' party mode effect (YouTube Easter egg)."""
-    if not youtube_extra_control_available: return "YouTube party mode control unavailable."
+    if not youtube_extra_control_available(): return "YouTube party mode control unavailable."
     return _video_control_wrapper(toggle_party_mode, "toggling party mode")
 
 # Note: navigate_forward/backward might be too generic. Let's omit them for now
 # to avoid conflicts with general browser tab navigation unless specifically requested.
 # def youtube_navigate_forward(query: str = None):
 #     """Navigates forward within YouTube page elements (like Tab key)."""
-#     if not youtube_extra_control_available: return "YouTube navigation control unavailable."
+#     if not youtube_extra_control_available(): return "YouTube navigation control unavailable."
 #     return _video_control_wrapper(navigate_forward, "navigating forward")
 
 # def youtube_navigate_backward(query: str = None):
 #     """Navigates backward within YouTube page elements (like Shift+Tab key)."""
-#     if not youtube_extra_control_available: return "YouTube navigation control unavailable."
+#     if not youtube_extra_control_available(): return "YouTube navigation control unavailable."
 #     return _video_control_wrapper(navigate_backward, "navigating backward")
 # --- END NEW YouTube Extra Control Wrappers ---
 
 def browser_open_new_tab(query: str = None):
     """Opens a new tab in the current browser window."""
-    if not tab_automation_available: return "Browser tab control unavailable."
+    if not tab_automation_available(): return "Browser tab control unavailable."
     return _video_control_wrapper(open_new_tab, "opening new tab")
 
-# Note: Closing tab is handled by close_current_tab_or_window
+def browser_close_tab(query: str = None):
+    """Closes the current browser tab."""
+    if not tab_automation_available(): return "Browser tab control unavailable."
+    return _video_control_wrapper(close_tab, "closing tab")
 
 def browser_open_menu(query: str = None):
     """Opens the browser's main menu (e.g., Settings/Preferences)."""
-    if not tab_automation_available: return "Browser menu control unavailable."
+    if not tab_automation_available(): return "Browser menu control unavailable."
     return _video_control_wrapper(open_browser_menu, "opening browser menu")
 
 def browser_zoom_in_page(query: str = None): # Renamed slightly for clarity
     """Zooms in on the current browser page content."""
-    if not tab_automation_available: return "Browser zoom control unavailable."
+    if not tab_automation_available(): return "Browser zoom control unavailable."
     return _video_control_wrapper(browser_zoom_in, "zooming in page") # Use renamed import
 
 def browser_zoom_out_page(query: str = None): # Renamed slightly for clarity
     """Zooms out on the current browser page content."""
-    if not tab_automation_available: return "Browser zoom control unavailable."
+    if not tab_automation_available(): return "Browser zoom control unavailable."
     return _video_control_wrapper(browser_zoom_out, "zooming out page") # Use renamed import
 
 def browser_refresh_page(query: str = None):
     """Refreshes the current browser page."""
-    if not tab_automation_available: return "Browser refresh control unavailable."
+    if not tab_automation_available(): return "Browser refresh control unavailable."
     return _video_control_wrapper(refresh_page, "refreshing page")
 
 def browser_switch_next_tab(query: str = None):
     """Switches to the next tab in the browser window."""
-    if not tab_automation_available: return "Browser tab switching unavailable."
+    if not tab_automation_available(): return "Browser tab switching unavailable."
     return _video_control_wrapper(switch_to_next_tab, "switching to next tab")
 
 def browser_switch_previous_tab(query: str = None):
     """Switches to the previous tab in the browser window."""
-    if not tab_automation_available: return "Browser tab switching unavailable."
+    if not tab_automation_available(): return "Browser tab switching unavailable."
     return _video_control_wrapper(switch_to_previous_tab, "switching to previous tab")
 
 def browser_open_history(query: str = None):
     """Opens the browser history panel/tab."""
-    if not tab_automation_available: return "Browser history control unavailable."
+    if not tab_automation_available(): return "Browser history control unavailable."
     return _video_control_wrapper(open_history, "opening history")
 
 def browser_open_bookmarks(query: str = None):
     """Opens the browser bookmarks panel/manager."""
-    if not tab_automation_available: return "Browser bookmarks control unavailable."
+    if not tab_automation_available(): return "Browser bookmarks control unavailable."
     return _video_control_wrapper(open_bookmarks, "opening bookmarks")
 
 def browser_go_back(query: str = None):
     """Navigates back in the browser history for the current tab."""
-    if not tab_automation_available: return "Browser navigation control unavailable."
+    if not tab_automation_available(): return "Browser navigation control unavailable."
     return _video_control_wrapper(go_back, "going back")
 
 def browser_go_forward(query: str = None):
     """Navigates forward in the browser history for the current tab."""
-    if not tab_automation_available: return "Browser navigation control unavailable."
+    if not tab_automation_available(): return "Browser navigation control unavailable."
     return _video_control_wrapper(go_forward, "going forward")
 
 def browser_open_dev_tools(query: str = None):
     """Opens the browser's developer tools panel."""
-    if not tab_automation_available: return "Browser dev tools control unavailable."
+    if not tab_automation_available(): return "Browser dev tools control unavailable."
     return _video_control_wrapper(open_dev_tools, "opening developer tools")
 
 def browser_toggle_fullscreen_window(query: str = None): # Renamed slightly for clarity
     """Toggles fullscreen mode for the entire browser window."""
-    if not tab_automation_available: return "Browser fullscreen control unavailable."
+    if not tab_automation_available(): return "Browser fullscreen control unavailable."
     return _video_control_wrapper(browser_toggle_fullscreen, "toggling browser fullscreen") # Use renamed import
 
 def browser_open_private_window(query: str = None):
     """Opens a new private/incognito browser window."""
-    if not tab_automation_available: return "Browser private window control unavailable."
+    if not tab_automation_available(): return "Browser private window control unavailable."
     return _video_control_wrapper(open_private_window, "opening private window")
 # --- End Browser Tab Automation Wrappers ---
 
@@ -912,6 +907,7 @@ def read_word(query: str = None): # Accept optional query, but ignore it
 available_functions = {
     "chat_with_chatbot": chat_with_chatbot,
     "get_stock_price_info": get_stock_price_info,
+    "get_watchlist_prices_info": get_watchlist_prices_info,
     "get_stock_chart": get_stock_chart,
     "Real_Time_Search_Engine": Real_Time_Search_Engine,
     "perform_duckduckgo_search": perform_duckduckgo_search,
@@ -926,7 +922,7 @@ available_functions = {
     "open_application": open_application,
     "close_application": close_application,
     # "close_current_tab": close_current_tab_or_window, # Use a clear name for the AI
-    "close_current_tab": close_tab, # Use a clear name for the AI
+    "close_current_tab": browser_close_tab, # Use a clear name for the AI
 
     # --- End NEW ---
     "search_google_pywhatkit": search_google_via_pywhatkit, # Use this for browser-opening search
@@ -1004,3 +1000,10 @@ available_functions = {
 
     # Add more functions here...
 }
+
+# Tools whose answers are long enough to be worth speaking while they are generated.
+# main.py prefers these over the blocking entries in available_functions.
+streaming_functions = {
+    "chat_with_chatbot": chat_with_chatbot_stream,
+    "Real_Time_Search_Engine": Real_Time_Search_Engine_stream,
+}
@@ -23,26 +23,25 @@ IMAGE_OUTPUT_DIR = "generated_images_api"
 # API Token Environment Variable Name
 API_TOKEN_ENV_VAR = "HUGGING_FACE_TOKEN" # Changed to match previous successful run
 
-# --- Get API Token from Environment ---
-hugginapikey = os.getenv(API_TOKEN_ENV_VAR)
-if not hugginapikey:
-    error_msg = (
-        f"Error: HF API token not found in '{API_TOKEN_ENV_VAR}'. "
-        "Please set it in .env or your environment."
-    )
-    logging.error(error_msg)
-    print(error_msg)
-    exit(1)
-logging.info("Hugging Face API token loaded.")
-
-# --- Initialize the InferenceClient ---
-try:
-    client = InferenceClient(token=hugginapikey)
-    logging.info("InferenceClient initialized.")
-except Exception as e:
-    logging.error(f"Error initializing InferenceClient: {e}")
-    print(f"Error initializing client: {e}")
-    exit(1)
+# --- InferenceClient, created on first use ---
+# Creating it (and checking the token) at import time made every importer pay for it,
+# and a missing token used to exit() the whole assistant.
+client = None
+
+def get_client() -> InferenceClient:
+    """Returns the shared InferenceClient, creating it on first use. Raises RuntimeError if no token is set."""
+    global client
+    if client is None:
+        hugginapikey = os.getenv(API_TOKEN_ENV_VAR)
+        if not hugginapikey:
+            raise RuntimeError(
+                f"HF API token not found in '{API_TOKEN_ENV_VAR}'. "
+                "Please set it in .env or your environment."
+            )
+        logging.info("Hugging Face API token loaded.")
+        client = InferenceClient(token=hugginapikey)
+        logging.info("InferenceClient initialized.")
+    return client
 
 # --- Helper function for filenames ---
 def sanitize_filename(text):
@@ -69,11 +68,18 @@ def generate_and_save_image(
         str: Full path to the saved image file on success, or an error message string on failure.
     """
     print(f"[1/4] Prompt received: '{prompt}'")
+    try:
+        inference_client = get_client()
+    except Exception as e:
+        error_msg = f"Error: {e}"
+        logging.error(error_msg)
+        print(error_msg)
+        return error_msg
     start_req = time.time()
     print("[2/4] Sending request to Hugging Face Inference API...")
     try:
         # Inference
-        image: Image.Image = client.text_to_image(prompt, model=model)
+        image: Image.Image = inference_client.text_to_image(prompt, model=model)
         duration_req = time.time() - start_req
         logging.info(f"Inference completed in {duration_req:.2f} seconds.")
         print(f"[3/4] API response received in {duration_req:.2f}s. Preparing to save...")
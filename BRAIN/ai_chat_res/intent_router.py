@@ -0,0 +1,280 @@
+# BRAIN/ai_chat_res/intent_router.py
+import re
+import time
+import logging
+import threading
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from Data.Open_website_D_set import websites as common_sites_dict
+except ImportError:
+    common_sites_dict = {}
+
+# --- Phrase index ---
+# Fixed commands that map one-to-one onto a tool in functions_call.available_functions.
+# These tools ignore their query, so a confident match can be dispatched without the LLM.
+INTENT_PHRASES: Dict[str, List[str]] = {
+    # --- Video player control ---
+    "video_volume_up": ["volume up", "increase volume", "increase the volume", "turn up the volume", "louder"],
+    "video_volume_down": ["volume down", "decrease volume", "decrease the volume", "turn down the volume", "lower the volume"],
+    "video_mute": ["mute", "video mute", "mute video", "mute volume", "mute the volume"],
+    "video_unmute": ["unmute", "video unmute", "unmute video", "unmute volume"],
+    "video_seek_forward": ["seek forward", "video seek forward", "skip forward"],
+    "video_seek_backward": ["seek backward", "video seek backward", "skip backward"],
+    "video_seek_forward_10s": ["seek forward 10 seconds", "forward 10 seconds", "skip 10 seconds", "skip forward 10 seconds"],
+    "video_seek_backward_10s": ["seek backward 10 seconds", "back 10 seconds", "rewind 10 seconds", "go back 10 seconds"],
+    "video_seek_forward_frame": ["next frame", "seek forward one frame", "forward one frame"],
+    "video_seek_backward_frame": ["previous frame", "seek backward one frame", "back one frame"],
+    "video_seek_to_beginning": ["go to beginning", "seek to beginning", "start from beginning", "restart video"],
+    "video_seek_to_end": ["go to end", "seek to end", "skip to end"],
+    "video_next_chapter": ["next chapter"],
+    "video_previous_chapter": ["previous chapter"],
+    "video_next_video": ["next video", "play next video"],
+    "video_previous_video": ["previous video", "play previous video"],
+    "video_increase_speed": ["increase speed", "increase playback speed", "speed up video", "play faster"],
+    "video_decrease_speed": ["decrease speed", "decrease playback speed", "slow down video", "play slower"],
+    "video_toggle_subtitles": ["toggle subtitles", "subtitles on", "subtitles off", "toggle captions", "captions on", "captions off"],
+    "video_increase_font_size": ["increase font size", "increase subtitle size", "bigger subtitles"],
+    "video_decrease_font_size": ["decrease font size", "decrease subtitle size", "smaller subtitles"],
+    "video_rotate_text_opacity": ["rotate text opacity", "change text opacity"],
+    "video_rotate_window_opacity": ["rotate window opacity", "change window opacity"],
+
+    # --- YouTube specific control ---
+    "youtube_pan_up": ["youtube pan up", "pan up"],
+    "youtube_pan_down": ["youtube pan down", "pan down"],
+    "youtube_pan_left": ["youtube pan left", "pan left"],
+    "youtube_pan_right": ["youtube pan right", "pan right"],
+    "youtube_zoom_in": ["youtube zoom in"],
+    "youtube_zoom_out": ["youtube zoom out"],
+    "youtube_go_to_search": ["youtube search box", "go to youtube search", "activate youtube search"],
+    "youtube_toggle_play_pause": ["youtube toggle play pause", "play pause", "pause video", "play video", "resume video", "pause", "resume"],
+    "youtube_toggle_mute": ["youtube toggle mute", "youtube mute", "youtube unmute"],
+    "youtube_toggle_fullscreen": ["youtube toggle fullscreen", "youtube fullscreen", "video fullscreen", "fullscreen video"],
+    "youtube_toggle_theater_mode": ["youtube toggle theater mode", "theater mode", "theatre mode"],
+    "youtube_toggle_miniplayer": ["youtube toggle miniplayer", "miniplayer", "mini player"],
+    "youtube_exit_fullscreen": ["youtube exit fullscreen", "exit fullscreen", "exit full screen", "exit miniplayer"],
+    "youtube_toggle_party_mode": ["youtube toggle party mode", "party mode"],
+
+    # --- Browser control ---
+    "browser_open_new_tab": ["open new tab", "new tab", "open a new tab"],
+    "close_current_tab": ["close tab", "close current tab", "close this tab"],
+    "browser_open_menu": ["open browser menu", "browser menu", "open browser settings"],
+    "browser_zoom_in_page": ["zoom in", "zoom in page", "browser zoom in"],
+    "browser_zoom_out_page": ["zoom out", "zoom out page", "browser zoom out"],
+    "browser_refresh_page": ["refresh", "refresh page", "reload page", "refresh the page", "reload the page"],
+    "browser_switch_next_tab": ["next tab", "switch to next tab", "switch tab"],
+    "browser_switch_previous_tab": ["previous tab", "switch to previous tab", "last tab"],
+    "browser_open_history": ["open history", "show history", "browser history"],
+    "browser_open_bookmarks": ["open bookmarks", "show bookmarks", "bookmarks"],
+    "browser_go_back": ["go back", "browser back", "previous page"],
+    "browser_go_forward": ["go forward", "browser forward", "next page"],
+    "browser_open_dev_tools": ["open dev tools", "open developer tools", "developer tools", "inspect element"],
+    "browser_toggle_fullscreen_window": ["browser fullscreen", "toggle browser fullscreen", "fullscreen browser"],
+    "browser_open_private_window": ["open private window", "open incognito", "incognito mode", "open incognito window", "private window"],
+
+    # --- System status ---
+    "get_battery_status": ["battery", "battery status", "check battery", "battery level", "battery percentage",
+                           "what is my battery", "whats my battery", "what is my battery level",
+                           "what is the battery percentage", "how much battery"],
+    "get_battery_advice": ["should i charge my laptop", "battery advice", "is my battery okay", "do i need to charge"],
+    "check_pen_drive_status": ["pen drive", "is pen drive connected", "check pen drive", "check usb drive", "is usb connected", "pen drive status"],
+
+    # --- Android device (ADB) ---
+    "end_adb_call": ["end call", "end the call", "cut the call", "hang up", "disconnect call"],
+    "take_adb_screenshot": ["take phone screenshot", "phone screenshot", "take screenshot on my phone", "screenshot my phone"],
+    "get_adb_battery_percentage": ["phone battery", "phone battery level", "check phone battery", "mobile battery"],
+
+    # --- File reading ---
+    "presentation_read": ["read ppt", "read presentation", "read powerpoint"],
+    "pdf_read": ["read pdf", "read pdf file", "read a pdf"],
+    "ms_word": ["read doc", "read word file", "read word document"],
+}
+
+# Commands with an argument: (pattern, function name). The first capture group is
+# passed on as the tool's query.
+INTENT_TEMPLATES: List[Tuple[str, str]] = [
+    (r"^(?:open|launch|go to|visit) (?:the )?website (.+)$", "open_website"),
+    (r"^(?:open|launch|start) (?:the )?(?:app|application) (.+)$", "open_application"),
+    (r"^(?:close|quit|kill) (?:the )?(?:app|application) (.+)$", "close_application"),
+    (r"^(?:open|go to|visit) ((?:https?://)?[\w-]+(?:\.[\w-]+)+)$", "open_website"),
+    (r"^(?:google search|search google for|search on google for) (.+)$", "perform_google_search"),
+    (r"^(?:duckduckgo search|search duckduckgo for) (.+)$", "perform_duckduckgo_search"),
+    (r"^(?:call|phone|dial) (.+?)(?: on (?:my )?phone| using (?:my )?phone)$", "initiate_adb_call"),
+]
+
+# Words that carry no intent of their own ("please mute the video, jarvis").
+FILLER_WORDS = {
+    "please", "jarvis", "hey", "ok", "okay", "can", "could", "would", "you", "will",
+    "the", "a", "an", "now", "for", "me", "just", "kindly", "sir", "to", "this", "my",
+}
+
+# Utterances starting with these are questions ("what is incognito mode"), not commands.
+# They are only routed when they match a phrase exactly ("what is my battery").
+QUESTION_WORDS = {"what", "whats", "who", "whos", "why", "how", "when", "where", "which"}
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.85
+
+
+def normalize_command(text: str) -> str:
+    """Lowercases, drops punctuation and collapses whitespace."""
+    text = text.lower().replace("'", "")
+    text = re.sub(r"[^\w\s./:-]", " ", text)
+    text = re.sub(r"[.]+(\s|$)", r"\1", text)  # sentence full stops, not dots inside domains
+    return " ".join(text.split())
+
+
+def _content_tokens(text: str) -> frozenset:
+    return frozenset(word for word in text.split() if word not in FILLER_WORDS)
+
+
+def _covers(phrase_tokens: frozenset, word: str) -> bool:
+    """True if the phrase has the word, or a misspelling of it; numbers must match exactly."""
+    if word in phrase_tokens:
+        return True
+    if any(char.isdigit() for char in word):
+        return False
+    return any(SequenceMatcher(None, word, token).ratio() >= 0.8 for token in phrase_tokens)
+
+
+class IntentRouter:
+    """
+    Resolves fixed voice commands to a tool locally, before the function-calling LLM.
+
+    Phrases are indexed by their content words; a query is scored only against the
+    phrases that share a word with it, so routing stays well under a millisecond.
+    Anything below the confidence threshold falls through to the LLM.
+    """
+
+    def __init__(self,
+                 phrases: Dict[str, List[str]] = INTENT_PHRASES,
+                 templates: List[Tuple[str, str]] = INTENT_TEMPLATES,
+                 threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._exact: Dict[frozenset, str] = {}
+        self._entries: List[Tuple[str, str, frozenset]] = []
+        self._index: Dict[str, List[int]] = {}
+        self._templates = [(re.compile(pattern), function_name) for pattern, function_name in templates]
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._hits_by_function: Dict[str, int] = {}
+
+        for function_name, function_phrases in phrases.items():
+            for phrase in function_phrases:
+                normalized = normalize_command(phrase)
+                tokens = _content_tokens(normalized)
+                if not tokens:
+                    continue
+                self._exact.setdefault(tokens, function_name)
+                entry_id = len(self._entries)
+                self._entries.append((function_name, normalized, tokens))
+                for token in tokens:
+                    self._index.setdefault(token, []).append(entry_id)
+
+    def _match_template(self, normalized: str) -> Optional[Tuple[str, str, float]]:
+        for pattern, function_name in self._templates:
+            match = pattern.match(normalized)
+            if match:
+                return function_name, match.group(1).strip(), 1.0
+        # "open youtube": only route a bare "open X" when X is a known website name.
+        match = re.match(r"^(?:open|launch|go to|visit) (.+)$", normalized)
+        if match and match.group(1) in common_sites_dict:
+            return "open_website", match.group(1), 1.0
+        return None
+
+    def _match_phrase(self, normalized: str) -> Optional[Tuple[str, str, float]]:
+        tokens = _content_tokens(normalized)
+        if not tokens:
+            return None
+        function_name = self._exact.get(tokens)
+        if function_name:
+            return function_name, "", 1.0
+
+        candidate_ids = set()
+        for token in tokens:
+            candidate_ids.update(self._index.get(token, ()))
+
+        query_text = " ".join(sorted(tokens))
+        best = None
+        for entry_id in candidate_ids:
+            function_name, phrase, phrase_tokens = self._entries[entry_id]
+            # "skip 20 seconds" is not "skip 10 seconds": every word of the query must be in the phrase
+            if not all(_covers(phrase_tokens, word) for word in tokens):
+                continue
+            overlap = len(tokens & phrase_tokens)
+            dice = 2 * overlap / (len(tokens) + len(phrase_tokens))
+            ratio = SequenceMatcher(None, query_text, " ".join(sorted(phrase_tokens))).ratio()
+            confidence = max(dice, ratio)
+            if best is None or confidence > best[2]:
+                best = (function_name, "", confidence)
+        return best
+
+    def route(self, text: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Resolves a command to a tool if the match is confident enough.
+
+        Args:
+            text (str): The user's utterance.
+
+        Returns:
+            Optional[Tuple[str, str, float]]: (function name, query, confidence), or
+            None if the utterance should go to the LLM router.
+        """
+        if not text:
+            return None
+        start = time.perf_counter()
+        normalized = normalize_command(text)
+        if normalized.split(" ", 1)[0] in QUESTION_WORDS:
+            function_name = self._exact.get(_content_tokens(normalized))
+            result = (function_name, "", 1.0) if function_name else None
+        else:
+            result = self._match_template(normalized) or self._match_phrase(normalized)
+        if result and result[2] < self.threshold:
+            result = None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            if result:
+                self._hits += 1
+                self._hits_by_function[result[0]] = self._hits_by_function.get(result[0], 0) + 1
+            else:
+                self._misses += 1
+        if result:
+            logging.info(f"Intent router: '{text}' -> {result[0]} ({result[2]:.2f}) in {elapsed_ms:.3f} ms")
+        return result
+
+    def stats(self) -> dict:
+        """Returns hit/miss counts and the hit rate since startup."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "hits_by_function": dict(self._hits_by_function),
+            }
+
+
+# Shared router used by main.py
+intent_router = IntentRouter()
+
+
+def route_intent(text: str) -> Optional[Tuple[str, str, float]]:
+    """Routes an utterance with the shared router. See IntentRouter.route."""
+    return intent_router.route(text)
+
+
+def router_stats() -> dict:
+    """Returns the shared router's hit statistics. See IntentRouter.stats."""
+    return intent_router.stats()
+
+
+if __name__ == "__main__":
+    try:
+        while True:
+            command = input("Command: ")
+            print(route_intent(command))
+            print(router_stats())
+    except KeyboardInterrupt:
+        print("\nuser stopped the program")
@@ -0,0 +1,131 @@
+# BRAIN/ai_chat_res/lazy_loader.py
+import importlib
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+
+class LazyModule:
+    """
+    A module that is imported the first time one of its functions is called.
+
+    Import failures are remembered, so callers can check available() the same way
+    functions_call.py used to check its *_available flags after a try/except import.
+    """
+
+    def __init__(self, module_name: str) -> None:
+        self.module_name = module_name
+        self._module = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Imports the module (once) and returns it, or None if the import failed."""
+        if self._module is None and self._error is None:
+            with self._lock:
+                if self._module is None and self._error is None:
+                    start = time.perf_counter()
+                    try:
+                        self._module = importlib.import_module(self.module_name)
+                        logging.info(f"Lazy-loaded {self.module_name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+                    except (Exception, SystemExit) as e:
+                        # Not just ImportError: several modules exit or fail on missing keys/devices at import time
+                        self._error = e
+                        logging.error(f"Could not import {self.module_name}: {e}")
+        return self._module
+
+    def available(self) -> bool:
+        """True if the module imports successfully (importing it if needed)."""
+        return self.load() is not None
+
+    @property
+    def error(self) -> Optional[Exception]:
+        return self._error
+
+    def function(self, attr_name: str, fallback: Optional[Callable] = None) -> "LazyFunction":
+        """Returns a proxy for module.attr_name that resolves on first call."""
+        return LazyFunction(self, attr_name, fallback)
+
+
+class LazyFunction:
+    """
+    Callable proxy for a function in a LazyModule.
+
+    If the module cannot be imported, the fallback is called instead; without a
+    fallback the original import error is raised at call time.
+    """
+
+    def __init__(self, module: LazyModule, attr_name: str, fallback: Optional[Callable] = None) -> None:
+        self._lazy_module = module
+        self._attr_name = attr_name
+        self._fallback = fallback
+        self._target = None
+        self.__name__ = attr_name
+        self.__qualname__ = attr_name
+
+    def resolve(self) -> Callable:
+        if self._target is None:
+            module = self._lazy_module.load()
+            if module is not None:
+                self._target = getattr(module, self._attr_name)
+            elif self._fallback is not None:
+                self._target = self._fallback
+            else:
+                raise ImportError(f"{self._lazy_module.module_name}.{self._attr_name} is unavailable: "
+                                  f"{self._lazy_module.error}")
+        return self._target
+
+    def available(self) -> bool:
+        """True if the real function (not the fallback) can be used."""
+        return self._lazy_module.available()
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyFunction {self._lazy_module.module_name}.{self._attr_name} ({state})>"
+
+
+_lazy_modules = {}
+_registry_lock = threading.Lock()
+
+
+def lazy_module(module_name: str) -> LazyModule:
+    """Returns the shared LazyModule for module_name, so every caller sees one import."""
+    with _registry_lock:
+        if module_name not in _lazy_modules:
+            _lazy_modules[module_name] = LazyModule(module_name)
+        return _lazy_modules[module_name]
+
+
+def lazy_function(module_name: str, attr_name: str, fallback: Optional[Callable] = None) -> LazyFunction:
+    """Shorthand for lazy_module(module_name).function(attr_name, fallback)."""
+    return lazy_module(module_name).function(attr_name, fallback)
+
+
+def prewarm(module_names: Iterable[str], delay: float = 0.0) -> threading.Thread:
+    """
+    Imports modules on a background daemon thread so they are ready before first use.
+
+    Args:
+        module_names (Iterable[str]): Modules to import, most important first.
+        delay (float): Seconds to wait before starting, to keep the CPU free for startup.
+
+    Returns:
+        threading.Thread: The started pre-warm thread.
+    """
+    module_names = list(module_names)
+
+    def worker():
+        if delay:
+            time.sleep(delay)
+        start = time.perf_counter()
+        for module_name in module_names:
+            lazy_module(module_name).load()
+        logging.info(f"Pre-warmed {len(module_names)} modules in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    thread = threading.Thread(target=worker, name="prewarm", daemon=True)
+    thread.start()
+    return thread
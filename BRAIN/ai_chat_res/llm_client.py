@@ -0,0 +1,133 @@
+# BRAIN/ai_chat_res/llm_client.py
+"""
+One place that creates LLM provider clients.
+
+All clients share a single pooled httpx transport (keep-alive, HTTP/2 when the h2
+package is installed) and the same timeouts, so TLS connections opened by one module
+are reused by the next call from any other module. .env is parsed once.
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+import weakref
+from typing import Iterable, Optional
+
+ENV_PATH = ".env"
+GROQ_BASE_URL = "https://api.groq.com"
+
+# Shared timeouts (seconds): connecting should be quick, streamed answers may take a while
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 60.0
+WRITE_TIMEOUT = 10.0
+POOL_TIMEOUT = 5.0
+MAX_RETRIES = 2
+
+# Connection pool: idle connections are kept for a few minutes between voice turns
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 300.0
+
+_env = None
+_http_client = None
+_groq_client = None
+# httpx.AsyncClient pools are bound to an event loop, so there is one per loop
+_async_http_clients = weakref.WeakKeyDictionary()
+_lock = threading.RLock()
+
+
+def get_env() -> dict:
+    """Returns the values from .env, parsed on first use only."""
+    global _env
+    if _env is None:
+        from dotenv import dotenv_values
+        _env = dotenv_values(ENV_PATH)
+    return _env
+
+
+def env(key: str, default: Optional[str] = None) -> Optional[str]:
+    value = get_env().get(key)
+    return value if value is not None else default
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401 (httpx needs it for HTTP/2)
+        return True
+    except ImportError:
+        return False
+
+
+def get_timeout():
+    import httpx
+    return httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT)
+
+
+def get_limits():
+    import httpx
+    return httpx.Limits(max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY)
+
+
+def get_http_client():
+    """Returns the shared, pooled httpx.Client used by every provider client."""
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                import httpx
+                _http_client = httpx.Client(http2=http2_available(), limits=get_limits(),
+                                            timeout=get_timeout(), follow_redirects=True)
+    return _http_client
+
+
+def get_async_http_client():
+    """Returns the pooled httpx.AsyncClient for the running event loop (same settings as get_http_client)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_http_clients.get(loop)
+        if client is None:
+            import httpx
+            client = httpx.AsyncClient(http2=http2_available(), limits=get_limits(),
+                                       timeout=get_timeout(), follow_redirects=True)
+            _async_http_clients[loop] = client
+    return client
+
+
+def get_groq_client():
+    """Returns the shared Groq client (one per process, on the pooled transport)."""
+    global _groq_client
+    if _groq_client is None:
+        with _lock:
+            if _groq_client is None:
+                from groq import Groq
+                _groq_client = Groq(api_key=env("GroqAPIKey"), http_client=get_http_client(),
+                                    timeout=get_timeout(), max_retries=MAX_RETRIES)
+    return _groq_client
+
+
+def prewarm_connections(urls: Iterable[str] = (GROQ_BASE_URL,)) -> concurrent.futures.Future:
+    """
+    Opens the TLS connections to the provider hosts ahead of the first request, so it does
+    not pay for DNS, TCP and TLS set-up. The chat providers stream through the AsyncClient
+    of the providers' background event loop, so that is the pool that is warmed. Failures
+    are only logged.
+    """
+    from BRAIN.text.STREAM.providers import get_event_loop  # Imported here: providers imports this module
+
+    urls = list(urls)
+
+    async def warm():
+        client = get_async_http_client()
+        for url in urls:
+            start = time.perf_counter()
+            try:
+                response = await client.head(url)
+                logging.info(f"Connection to {url} warmed in {(time.perf_counter() - start) * 1000:.0f} ms "
+                             f"({response.http_version})")
+            except Exception as e:
+                logging.warning(f"Could not pre-warm connection to {url}: {e}")
+
+    return asyncio.run_coroutine_threadsafe(warm(), get_event_loop())
@@ -0,0 +1,327 @@
+# BRAIN/ai_chat_res/model_cascade.py
+"""
+Model fallback cascade: primary model, faster secondary model, then the local GGUF model.
+
+A request goes to the first tier whose circuit breaker is closed. If that tier has not
+produced its first token within its first-token SLO, the request is hedged to the next
+tier and whichever answers first wins; the loser is cancelled. Failures before the first
+token fall through to the next tier. Repeated failures open a tier's circuit breaker so
+no traffic is sent to it until its cool-down has passed.
+
+In offline mode (set_offline_mode(True), main.py --offline) only local tiers are used.
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from BRAIN.text.STREAM.providers import GroqProvider, LocalProvider, provider_stream
+
+_offline = False
+
+
+def set_offline_mode(enabled: bool) -> None:
+    """Sends every request to the local model only (no network)."""
+    global _offline
+    _offline = enabled
+
+
+def offline_mode() -> bool:
+    return _offline
+
+
+class CircuitBreaker:
+    """
+    Closed: traffic flows. Open (after `failure_threshold` consecutive failures): no traffic
+    for `reset_timeout` seconds. Half-open: one trial request decides whether to close again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Ends a half-open trial that was cancelled (e.g. lost a hedge) without a verdict."""
+        with self._lock:
+            self._trial_running = False
+
+
+@dataclass
+class ModelTier:
+    """
+    One model in the cascade.
+
+    stream(messages, **params) must yield text deltas. first_token_slo is how long (seconds)
+    the tier may take to produce its first token before the request is hedged to the next
+    tier; stall_timeout is the longest allowed gap between tokens.
+    """
+    name: str
+    stream: Callable[..., Iterator[str]]
+    first_token_slo: float
+    stall_timeout: float = 20.0
+    local: bool = False
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    requests: int = 0
+    wins: int = 0
+    failures: int = 0
+    slo_misses: int = 0
+    ttft: List[float] = field(default_factory=list)
+
+    def stats(self) -> dict:
+        ttft = sorted(self.ttft)
+        provider = getattr(self.stream, "provider", None)
+        return {
+            "requests": self.requests,
+            "wins": self.wins,
+            "failures": self.failures,
+            "slo_misses": self.slo_misses,
+            "breaker": self.breaker.state,
+            "ttft_p50_ms": round(ttft[len(ttft) // 2] * 1000) if ttft else None,
+            "ttft_p99_ms": round(ttft[int(0.99 * (len(ttft) - 1))] * 1000) if ttft else None,
+            "provider": provider.summary() if provider is not None else None,
+        }
+
+
+class _Attempt:
+    """A tier's request running on a worker thread, feeding events into the shared queue."""
+
+    def __init__(self, index: int, tier: ModelTier, messages, params, events: "queue.Queue") -> None:
+        self.index = index
+        self.tier = tier
+        self.started_at = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(messages, params, events),
+                                       name=f"cascade-{tier.name}", daemon=True)
+        self.thread.start()
+
+    def _run(self, messages, params, events) -> None:
+        stream = None
+        try:
+            stream = self.tier.stream(messages, **params)
+            for delta in stream:
+                if self.cancelled.is_set():
+                    return
+                events.put((self, "delta", delta))
+            if not self.cancelled.is_set():
+                events.put((self, "done", None))
+        except Exception as e:
+            if not self.cancelled.is_set():
+                events.put((self, "error", e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+
+class ModelCascade:
+    """Streams a chat completion through the tiers in order, with hedging and circuit breaking."""
+
+    def __init__(self, name: str, tiers: List[ModelTier], max_parallel: int = 2) -> None:
+        self.name = name
+        self.tiers = tiers
+        self.max_parallel = max_parallel
+
+    def _next_tier(self, after: int) -> Optional[int]:
+        for index in range(after + 1, len(self.tiers)):
+            if _offline and not self.tiers[index].local:
+                continue
+            if self.tiers[index].breaker.allow():
+                return index
+        return None
+
+    def stream(self, messages: List[Dict[str, str]], **params) -> Iterator[str]:
+        """
+        Yields the answer's text deltas from whichever tier answers first.
+        Raises RuntimeError if every tier failed or is switched off by its breaker.
+        """
+        events: "queue.Queue" = queue.Queue()
+        running: List[_Attempt] = []
+        last_started = -1
+        winner: Optional[_Attempt] = None
+        errors = []
+
+        def start_next() -> bool:
+            nonlocal last_started
+            index = self._next_tier(last_started)
+            if index is None:
+                return False
+            last_started = index
+            tier = self.tiers[index]
+            tier.requests += 1
+            running.append(_Attempt(index, tier, messages, params, events))
+            return True
+
+        def finish(attempt: _Attempt, ok: bool) -> None:
+            attempt.cancel()
+            if attempt in running:
+                running.remove(attempt)
+            if ok:
+                attempt.tier.breaker.record_success()
+            else:
+                attempt.tier.failures += 1
+                attempt.tier.breaker.record_failure()
+
+        if not start_next():
+            raise RuntimeError(f"{self.name}: no model available (all circuit breakers open)")
+        try:
+            while True:
+                if winner is None:
+                    if not running:
+                        raise RuntimeError(f"{self.name}: all models failed: {'; '.join(errors)}")
+                    # Wait for the first token, but only until the newest attempt's SLO runs out
+                    newest = running[-1]
+                    deadline = newest.started_at + newest.tier.first_token_slo
+                    timeout = max(0.0, deadline - time.monotonic())
+                    can_hedge = len(running) < self.max_parallel and last_started < len(self.tiers) - 1
+                    if not can_hedge:
+                        timeout = max(attempt.started_at + attempt.tier.stall_timeout for attempt in running) - time.monotonic()
+                else:
+                    timeout = winner.tier.stall_timeout
+
+                try:
+                    attempt, kind, payload = events.get(timeout=max(0.0, timeout))
+                except queue.Empty:
+                    if winner is not None:
+                        finish(winner, ok=False)
+                        raise RuntimeError(f"{self.name}: {winner.tier.name} stalled mid-answer")
+                    if can_hedge:
+                        newest.tier.slo_misses += 1
+                        logging.info(f"{self.name}: {newest.tier.name} missed its {newest.tier.first_token_slo}s "
+                                     f"first-token SLO, hedging")
+                        if not start_next():
+                            can_hedge = False
+                        continue
+                    # Every running attempt stalled before its first token
+                    for stalled in list(running):
+                        errors.append(f"{stalled.tier.name}: no first token")
+                        finish(stalled, ok=False)
+                    if not start_next():
+                        raise RuntimeError(f"{self.name}: all models failed: {'; '.join(errors)}")
+                    continue
+
+                if attempt.cancelled.is_set():
+                    continue  # Late event from a cancelled loser
+                if kind == "error":
+                    logging.warning(f"{self.name}: {attempt.tier.name} failed: {payload}")
+                    errors.append(f"{attempt.tier.name}: {payload}")
+                    finish(attempt, ok=False)
+                    if attempt is winner:
+                        raise RuntimeError(f"{self.name}: {attempt.tier.name} failed mid-answer: {payload}")
+                    if not running:
+                        start_next()
+                    continue
+                if winner is None:
+                    # First token: this attempt wins, every other one is cancelled
+                    winner = attempt
+                    attempt.first_token_at = time.monotonic()
+                    attempt.tier.ttft.append(attempt.first_token_at - attempt.started_at)
+                    del attempt.tier.ttft[:-500]
+                    attempt.tier.wins += 1
+                    for loser in list(running):
+                        if loser is not winner:
+                            loser.cancel()
+                            loser.tier.breaker.release()
+                            running.remove(loser)
+                if kind == "delta":
+                    yield payload
+                else:
+                    finish(attempt, ok=True)
+                    return
+        finally:
+            for attempt in running:
+                attempt.cancel()
+                attempt.tier.breaker.release()
+
+    def complete(self, messages: List[Dict[str, str]], **params) -> str:
+        """Non-streaming variant: the joined answer."""
+        return "".join(self.stream(messages, **params))
+
+    def stats(self) -> dict:
+        return {tier.name: tier.stats() for tier in self.tiers}
+
+
+def groq_stream(model: str) -> Callable[..., Iterator[str]]:
+    """Stream function for a Groq model, through the shared streaming provider interface."""
+    stream = provider_stream(GroqProvider(model))
+
+    def groq(messages, max_tokens: int = 1024, temperature: float = 0.7, top_p: float = 1, tools=None, **_):
+        # tools: native tool calling; the calls arrive as one {"tool_calls": [...]} delta
+        for delta in stream(messages, max_tokens=max_tokens, temperature=temperature, top_p=top_p, tools=tools):
+            delta = delta.replace("</s>", "")
+            if delta:
+                yield delta
+
+    groq.provider = stream.provider
+    return groq
+
+
+# Last resort: the resident local GGUF model (loaded once, system prompt KV reused)
+local_stream = provider_stream(LocalProvider())
+
+
+# Fast secondary used when the primary is slow or failing
+SECONDARY_MODEL = "llama-3.1-8b-instant"
+
+# Per-tier first-token SLOs in seconds; the local model is slow to start, so it is only
+# reached when both cloud tiers failed or are switched off
+chat_cascade = ModelCascade("chat", [
+    ModelTier("groq:llama3-70b-8192", groq_stream("llama3-70b-8192"), first_token_slo=1.5),
+    ModelTier(f"groq:{SECONDARY_MODEL}", groq_stream(SECONDARY_MODEL), first_token_slo=1.0),
+    ModelTier("local:gguf", local_stream, first_token_slo=60.0, stall_timeout=120.0, local=True),
+])
+
+search_cascade = ModelCascade("search", [
+    ModelTier("groq:llama3-8b-8192", groq_stream("llama3-8b-8192"), first_token_slo=1.0),
+    ModelTier(f"groq:{SECONDARY_MODEL}", groq_stream(SECONDARY_MODEL), first_token_slo=1.0),
+    ModelTier("local:gguf", local_stream, first_token_slo=60.0, stall_timeout=120.0, local=True),
+])
+
+router_cascade = ModelCascade("router", [
+    ModelTier(f"groq:{SECONDARY_MODEL}", groq_stream(SECONDARY_MODEL), first_token_slo=0.8),
+    ModelTier("groq:llama3-8b-8192", groq_stream("llama3-8b-8192"), first_token_slo=1.0),
+    ModelTier("local:gguf", local_stream, first_token_slo=60.0, stall_timeout=120.0, local=True),
+])
@@ -0,0 +1,311 @@
+# BRAIN/ai_chat_res/retrieval.py
+"""
+Retrieval stage for the realtime answers: search results -> page text -> best passages.
+
+Search snippets alone give the model little evidence. The top result pages are fetched
+concurrently on the providers' background event loop with the pooled httpx.AsyncClient,
+each capped in bytes and time, so one slow or huge page costs nothing extra. The main
+text of every page is extracted with BeautifulSoup (lxml), split into passages of about
+PASSAGE_WORDS words, and the passages are ranked with BM25 against the query. Only the
+best passages that fit the token budget go into the prompt, so its size stays bounded
+however long the pages are.
+
+    results = web_search.search(query)
+    prompt_text = retriever.context(query, results)
+"""
+import asyncio
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from BRAIN.ai_chat_res.context_window import count_tokens
+from BRAIN.ai_chat_res.web_search import SearchResult, format_results
+
+# Pages fetched per query, and the caps for each of them
+TOP_PAGES = 4
+MAX_PAGE_BYTES = 512 * 1024
+PAGE_TIMEOUT = 3.0
+# Tokens of passages put into the prompt
+TOKEN_BUDGET = 1500
+PASSAGE_WORDS = 120
+# Passages taken from one page; the main text of a page comes first
+MAX_PAGE_PASSAGES = 40
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+}
+# Page parts that are never main text
+_BOILERPLATE_TAGS = ["script", "style", "noscript", "svg", "nav", "header", "footer", "aside", "form",
+                     "iframe", "button", "template"]
+_TEXT_TAGS = ["p", "li", "h1", "h2", "h3", "h4", "blockquote", "pre", "td", "dd"]
+_WORD = re.compile(r"\w+")
+_STOP_WORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "for", "by", "with", "is", "are", "was",
+    "were", "be", "it", "this", "that", "what", "who", "how", "when", "where", "which", "do", "does", "did",
+    "me", "tell", "please", "about", "from", "as", "i", "you", "kya", "hai", "ka", "ki", "ke",
+}
+
+
+@dataclass
+class Page:
+    result: SearchResult
+    html: str = ""
+    error: Optional[str] = None
+    truncated: bool = False
+    seconds: float = 0.0
+
+
+@dataclass
+class Passage:
+    text: str
+    page: int             # index of the page (search rank after merging)
+    score: float = 0.0
+
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.casefold()) if word not in _STOP_WORDS]
+
+
+# --- Fetching ---
+async def _fetch_page(result: SearchResult, max_bytes: int, timeout: float) -> Page:
+    import httpx
+
+    from BRAIN.ai_chat_res.llm_client import get_async_http_client
+
+    page = Page(result)
+    start = time.perf_counter()
+    try:
+        async def read() -> None:
+            client = get_async_http_client()
+            async with client.stream("GET", result.url, headers=_HEADERS, timeout=httpx.Timeout(timeout)) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "")
+                if "html" not in content_type and "text" not in content_type:
+                    raise ValueError(f"not a text page ({content_type or 'no content type'})")
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= max_bytes:
+                        page.truncated = True
+                        break
+                page.html = b"".join(chunks)[:max_bytes].decode(response.encoding or "utf-8", errors="replace")
+
+        await asyncio.wait_for(read(), timeout)
+    except asyncio.TimeoutError:
+        page.error = "timeout"
+    except Exception as e:
+        page.error = str(e) or type(e).__name__
+    page.seconds = time.perf_counter() - start
+    return page
+
+
+def fetch_pages(results: List[SearchResult], max_bytes: int = MAX_PAGE_BYTES,
+                timeout: float = PAGE_TIMEOUT) -> List[Page]:
+    """Fetches the result pages concurrently; each takes at most `timeout` seconds and `max_bytes` bytes."""
+    from BRAIN.text.STREAM.providers import get_event_loop
+
+    async def fetch_all() -> List[Page]:
+        return list(await asyncio.gather(*(_fetch_page(result, max_bytes, timeout) for result in results)))
+
+    future = asyncio.run_coroutine_threadsafe(fetch_all(), get_event_loop())
+    return future.result(timeout + 1.0)
+
+
+# --- Extraction ---
+def extract_blocks(html: str) -> List[str]:
+    """The main text of a page as a list of paragraphs (boilerplate, scripts and menus removed)."""
+    from bs4 import BeautifulSoup
+
+    try:
+        soup = BeautifulSoup(html, "lxml")
+    except Exception:
+        soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+    # Articles mark their main text; otherwise take the whole body
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+    blocks = []
+    for element in root.find_all(_TEXT_TAGS):
+        if element.find(_TEXT_TAGS):
+            continue  # A container (e.g. a table cell holding paragraphs); its children are taken instead
+        text = " ".join(element.get_text(" ", strip=True).split())
+        # Short lines outside headings are mostly menus, buttons and captions
+        if len(text) >= 40 or (element.name.startswith("h") and len(text) >= 10):
+            blocks.append(text)
+    if not blocks:
+        text = " ".join(root.get_text(" ", strip=True).split())
+        blocks = [text] if text else []
+    return blocks
+
+
+def split_passages(blocks: List[str], max_words: int = PASSAGE_WORDS) -> List[str]:
+    """Joins consecutive paragraphs into passages of up to max_words words; longer ones are cut."""
+    passages, current = [], []
+    for block in blocks:
+        words = block.split()
+        if current and len(current) + len(words) > max_words:
+            passages.append(" ".join(current))
+            current = []
+        while len(words) > max_words:
+            passages.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        current.extend(words)
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+# --- Ranking ---
+class BM25:
+    """Okapi BM25 over a small in-memory collection of passages."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.average_length = (sum(self.lengths) / len(documents)) if documents else 0.0
+        frequencies = Counter(term for counts in self.term_counts for term in counts)
+        count = len(documents)
+        self.idf = {term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+                    for term, frequency in frequencies.items()}
+
+    def scores(self, query: List[str]) -> List[float]:
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length) if self.average_length else self.k1
+            score = 0.0
+            for term in set(query):
+                frequency = counts.get(term)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+
+def rank_passages(query: str, passages: List[Passage]) -> List[Passage]:
+    """Scores the passages with BM25 against the query; best first, ties broken by search rank."""
+    terms = tokenize(query)
+    if not passages or not terms:
+        return list(passages)
+    for passage, score in zip(passages, BM25([tokenize(passage.text) for passage in passages]).scores(terms)):
+        passage.score = score
+    return sorted(passages, key=lambda passage: (-passage.score, passage.page))
+
+
+def select_passages(ranked: List[Passage], token_budget: int = TOKEN_BUDGET) -> List[Passage]:
+    """The best passages that together fit the token budget (duplicates and zero scores left out)."""
+    selected, seen, used = [], set(), 0
+    for passage in ranked:
+        if passage.score <= 0:
+            break
+        key = " ".join(passage.text.casefold().split()[:20])
+        if key in seen:
+            continue  # The same text on another page (syndicated news, mirrors)
+        tokens = count_tokens(passage.text)
+        if used + tokens > token_budget:
+            continue
+        seen.add(key)
+        selected.append(passage)
+        used += tokens
+    return selected
+
+
+def format_passages(query: str, results: List[SearchResult], passages: List[Passage]) -> str:
+    """The passages as prompt text, grouped by source, in the [start] ... [end] format the prompts expect."""
+    lines = [f"The search results for '{query}' are:", "[start]"]
+    for page in sorted({passage.page for passage in passages}):
+        result = results[page]
+        lines.append(f"{page + 1}. {result.title or result.url}")
+        lines.append(f"URL: {result.url}")
+        lines.extend(passage.text for passage in passages if passage.page == page)
+        lines.append("")
+    lines.append("[end]")
+    return "\n".join(lines)
+
+
+class Retriever:
+    """Turns ranked search results into a bounded prompt context, counting what each stage did."""
+
+    def __init__(self, top_pages: int = TOP_PAGES, max_page_bytes: int = MAX_PAGE_BYTES,
+                 page_timeout: float = PAGE_TIMEOUT, token_budget: int = TOKEN_BUDGET) -> None:
+        """
+        Args:
+            top_pages (int): How many of the top results are fetched.
+            max_page_bytes (int): Bytes read from a page at most; the rest is not downloaded.
+            page_timeout (float): Seconds a page may take, connecting included.
+            token_budget (int): Tokens of passages the context may contain.
+        """
+        self.top_pages = top_pages
+        self.max_page_bytes = max_page_bytes
+        self.page_timeout = page_timeout
+        self.token_budget = token_budget
+        self._lock = threading.Lock()
+        self._stats: Dict[str, float] = Counter()
+
+    def context(self, query: str, results: List[SearchResult], token_budget: Optional[int] = None) -> str:
+        """
+        Prompt text for the query: the best passages of the top pages within the token
+        budget, or the search snippets if no page could be used.
+        """
+        token_budget = self.token_budget if token_budget is None else token_budget
+        top = results[:self.top_pages]
+        if not top:
+            return format_results(query, results)
+        start = time.perf_counter()
+        try:
+            pages = fetch_pages(top, self.max_page_bytes, self.page_timeout)
+        except Exception as e:
+            logging.warning(f"Fetching result pages failed: {e}")
+            pages = [Page(result, error=str(e)) for result in top]
+        fetched = time.perf_counter()
+
+        passages = []
+        for index, page in enumerate(pages):
+            if page.error is not None or not page.html:
+                continue
+            texts = split_passages(extract_blocks(page.html))[:MAX_PAGE_PASSAGES]
+            passages.extend(Passage(text, index) for text in texts)
+        extracted = time.perf_counter()
+        selected = select_passages(rank_passages(query, passages), token_budget)
+        ranked = time.perf_counter()
+
+        with self._lock:
+            stats = self._stats
+            stats["queries"] += 1
+            stats["pages"] += len(pages)
+            stats["page_errors"] += sum(1 for page in pages if page.error not in (None, "timeout"))
+            stats["page_timeouts"] += sum(1 for page in pages if page.error == "timeout")
+            stats["pages_truncated"] += sum(1 for page in pages if page.truncated)
+            stats["passages"] += len(passages)
+            stats["passages_used"] += len(selected)
+            stats["fetch_s"] += fetched - start
+            stats["extract_s"] += extracted - fetched
+            stats["rank_s"] += ranked - extracted
+            if not selected:
+                stats["snippet_fallbacks"] += 1
+        if not selected:
+            return format_results(query, results)
+        return format_passages(query, top, selected)
+
+    def stats(self) -> dict:
+        """Counts per stage, and average seconds per query spent fetching, extracting and ranking."""
+        with self._lock:
+            stats = dict(self._stats)
+        queries = stats.get("queries", 0)
+        for stage in ("fetch_s", "extract_s", "rank_s"):
+            total = stats.pop(stage, 0.0)
+            stats[f"avg_{stage}"] = round(total / queries, 3) if queries else None
+        return stats
+
+
+# Shared retriever used by RealtimeSearchEngine_groq.py
+retriever = Retriever()
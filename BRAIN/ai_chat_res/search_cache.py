@@ -0,0 +1,95 @@
+# BRAIN/ai_chat_res/search_cache.py
+"""
+Persistent cache for web search results, in front of every search source.
+
+"Who is the CEO of Tata?" and "tata ceo who is" hit the same entry: queries are
+case-folded, stripped of punctuation and filler words and their words sorted. How long
+an entry stays fresh depends on what the query is about (FRESHNESS_RULES): live scores
+and weather for minutes, news for a quarter of an hour, definitions and biographies for
+days. Entries are kept in Data/SearchCache.json, so they survive restarts, and the least
+recently used ones are evicted once the file would exceed its size limit.
+"""
+import re
+from typing import Callable, List, Optional, Tuple
+
+from BRAIN.ai_chat_res.completion_cache import CompletionCache
+
+SEARCH_CACHE_PATH = r"Data/SearchCache.json"
+
+# Words that do not change what a search returns
+_FILLER_WORDS = {
+    "a", "an", "the", "please", "tell", "me", "can", "could", "you", "search", "find", "look", "up",
+    "for", "about", "on", "of", "google", "internet", "web", "online", "batao", "bataiye", "kya", "hai",
+}
+_NON_WORD = re.compile(r"[^\w\s]")
+
+# (category, pattern, seconds fresh); the first rule whose pattern matches the query wins
+FRESHNESS_RULES: List[Tuple[str, "re.Pattern", float]] = [
+    ("live", re.compile(r"\b(live|score|scores|match|weather|temperature|traffic|now|right now|abhi)\b"), 5 * 60),
+    ("news", re.compile(r"\b(news|latest|today|tonight|yesterday|breaking|update|updates|current|price|"
+                        r"stock|stocks|share|rate|election|result|results|aaj)\b"), 15 * 60),
+    ("reference", re.compile(r"\b(who is|who was|what is|what are|define|definition|meaning|history|biography|"
+                             r"capital|founder|founded|invented|born|how to|how does|kaun|kya hota)\b"),
+     7 * 24 * 3600),
+]
+DEFAULT_CATEGORY = ("general", 6 * 3600)
+
+
+def normalize_search_query(query: str) -> str:
+    """Cache key for a query: case, punctuation, filler words and word order do not matter."""
+    words = _NON_WORD.sub(" ", (query or "").casefold()).split()
+    kept = [word for word in words if word not in _FILLER_WORDS]
+    return " ".join(sorted(set(kept or words)))
+
+
+def categorize(query: str) -> Tuple[str, float]:
+    """(category, seconds an answer stays fresh) for a query."""
+    text = " ".join(_NON_WORD.sub(" ", (query or "").casefold()).split())
+    for category, pattern, ttl in FRESHNESS_RULES:
+        if pattern.search(text):
+            return category, ttl
+    return DEFAULT_CATEGORY
+
+
+class SearchCache:
+    """Search results per (source, normalized query, result count), with per-category TTLs."""
+
+    def __init__(self, path: Optional[str] = SEARCH_CACHE_PATH, max_entries: int = 2000,
+                 max_bytes: int = 8 * 1024 * 1024) -> None:
+        self._store = CompletionCache(max_entries=max_entries, path=path, max_bytes=max_bytes)
+        self._category_hits = {}
+
+    @staticmethod
+    def key(source: str, query: str, max_results: int) -> str:
+        return f"{source}|{max_results}|{normalize_search_query(query)}"
+
+    def get_or_search(self, source: str, query: str, max_results: int, search: Callable[[], list]) -> list:
+        """
+        The cached results (JSON-compatible list) for the query, or search()'s results,
+        which are cached when non-empty.
+        """
+        key = self.key(source, query, max_results)
+        cached = self._store.get(key)
+        category, ttl = categorize(query)
+        if cached is not None:
+            self._category_hits[category] = self._category_hits.get(category, 0) + 1
+            return cached
+        results = search()
+        if results:
+            self._store.put(key, results, ttl)
+        return results
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def flush(self) -> None:
+        self._store.flush()
+
+    def stats(self) -> dict:
+        stats = self._store.stats()
+        stats["hits_by_category"] = dict(self._category_hits)
+        return stats
+
+
+# Shared cache used by the search sources in web_search.py
+search_cache = SearchCache()
@@ -0,0 +1,186 @@
+# BRAIN/ai_chat_res/stock/history_store.py
+"""
+Incremental on-disk store of daily OHLC history, per symbol.
+
+Each symbol's bars live in Data/StockHistory/<symbol>.npy as a NumPy structured array
+(time, open, high, low, close, volume), sorted by time. A chart request reads the file
+through a memory map and only asks Yahoo Finance for the bars after the last stored one
+(the last bar is fetched again, since it may have been stored mid-session). While the
+data is fresh for the symbol's market (quote_service.quote_ttl: seconds while the market
+is open, until it reopens while it is closed) nothing is downloaded at all, so repeat
+charts, indicators and forecasts are served at disk speed.
+
+Bars are stored as traded (auto_adjust=False): a dividend does not rewrite the past, so
+appending new bars keeps the file consistent. Yahoo does adjust all bars for a stock
+split, so a tail containing a split replaces the whole history.
+
+    frame = history_store.frame("TATAMOTORS.NS", days=31)   # pandas DataFrame, like Ticker.history
+"""
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import numpy as np
+
+from BRAIN.ai_chat_res.stock.quote_service import quote_ttl
+
+HISTORY_DIR = r"Data/StockHistory"
+# History fetched the first time a symbol is seen, enough for indicators and forecasts
+INITIAL_PERIOD = "2y"
+
+BAR_DTYPE = np.dtype([("time", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"),
+                      ("volume", "f8")])
+
+
+def _bar_times(frame) -> np.ndarray:
+    """The frame's dates as seconds since the epoch (UTC midnight)."""
+    index = frame.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    return index.normalize().values.astype("datetime64[s]").astype("i8")
+
+
+def bars_from_frame(frame) -> np.ndarray:
+    """Ticker.history()'s DataFrame as bars; time is the bar's date as seconds since the epoch (UTC midnight)."""
+    if frame is None or len(frame) == 0:
+        return np.empty(0, dtype=BAR_DTYPE)
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    bars["time"] = _bar_times(frame)
+    for field, column in (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", "Close"), ("volume", "Volume")):
+        bars[field] = frame[column].to_numpy(dtype="f8")
+    return bars[~np.isnan(bars["close"])]
+
+
+def merge_bars(stored: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """Stored bars up to the first new one, then the new bars (which replace any with the same date)."""
+    if not len(new):
+        return stored
+    new = np.sort(new, order="time")
+    return np.concatenate([stored[stored["time"] < new["time"][0]], new])
+
+
+def fetch_history(symbol: str, start: Optional[datetime] = None):
+    """Unadjusted daily bars from Yahoo Finance: from `start`, or INITIAL_PERIOD when None."""
+    import yfinance as yf
+
+    ticker = yf.Ticker(symbol)
+    if start is None:
+        return ticker.history(period=INITIAL_PERIOD, interval="1d", auto_adjust=False)
+    return ticker.history(start=start.strftime("%Y-%m-%d"), interval="1d", auto_adjust=False)
+
+
+def has_split(frame, after: int) -> bool:
+    """Whether a bar dated after `after` has a stock split (after which Yahoo rescales all earlier prices)."""
+    if frame is None or len(frame) == 0 or "Stock Splits" not in getattr(frame, "columns", ()):
+        return False
+    splits = frame["Stock Splits"].fillna(0).to_numpy(dtype="f8")
+    return bool(((splits != 0) & (_bar_times(frame) > after)).any())
+
+
+class HistoryStore:
+    """Per-symbol daily bars on disk, topped up with only the missing tail."""
+
+    def __init__(self, directory: str = HISTORY_DIR, fetch=fetch_history) -> None:
+        self.directory = directory
+        self.fetch = fetch
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self.reads = self.fresh_hits = self.tail_fetches = self.full_fetches = self.bars_fetched = 0
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9._-]", "_", symbol.upper()) + ".npy")
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+    def _fresh(self, symbol: str, path: str) -> bool:
+        """True if the file was written recently enough that the market cannot have moved since."""
+        written = os.path.getmtime(path)
+        _, ttl = quote_ttl(symbol, datetime.fromtimestamp(written).astimezone())
+        return time.time() - written < ttl
+
+    def _save(self, path: str, bars: np.ndarray) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, bars)
+        os.replace(temp_path, path)
+
+    def update(self, symbol: str) -> None:
+        """Downloads the bars missing since the last stored one (all of INITIAL_PERIOD for a new symbol)."""
+        path = self.path(symbol)
+        with self._lock(symbol):
+            if os.path.exists(path) and self._fresh(symbol, path):
+                return  # Another request updated it meanwhile
+            stored = np.load(path) if os.path.exists(path) else np.empty(0, dtype=BAR_DTYPE)
+            if len(stored):
+                # The last stored bar may be from an unfinished session, so it is fetched again
+                start = datetime.fromtimestamp(int(stored["time"][-1]), tz=timezone.utc)
+                frame = self.fetch(symbol, start)
+                self.tail_fetches += 1
+                if has_split(frame, after=int(stored["time"][-1])):
+                    # The stored prices are from before the split: replace them all
+                    logging.info(f"{symbol} split since its history was stored; fetching it again")
+                    stored = np.empty(0, dtype=BAR_DTYPE)
+                    frame = self.fetch(symbol, None)
+                    self.full_fetches += 1
+                new = bars_from_frame(frame)
+            else:
+                new = bars_from_frame(self.fetch(symbol, None))
+                self.full_fetches += 1
+            self.bars_fetched += len(new)
+            if not len(new) and not len(stored):
+                raise LookupError(f"No price history for {symbol}")
+            self._save(path, merge_bars(stored, new))
+
+    def bars(self, symbol: str, days: Optional[int] = None) -> np.ndarray:
+        """The symbol's daily bars (the last `days` days, or all), updated first unless still fresh."""
+        path = self.path(symbol)
+        self.reads += 1
+        if os.path.exists(path) and self._fresh(symbol, path):
+            self.fresh_hits += 1
+        else:
+            try:
+                self.update(symbol)
+            except Exception as e:
+                if not os.path.exists(path):
+                    raise
+                logging.warning(f"Could not update history of {symbol}, using stored bars: {e}")
+        with self._lock(symbol):
+            stored = np.load(path, mmap_mode="r")
+            if days is not None:
+                cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
+                start = int(np.searchsorted(stored["time"], cutoff))
+            else:
+                start = 0
+            # Copied out of the memory map, so the file can be replaced by the next update
+            bars = np.array(stored[start:])
+            del stored
+        return bars
+
+    def frame(self, symbol: str, days: Optional[int] = None):
+        """The bars as a DataFrame with a DatetimeIndex and Open/High/Low/Close/Volume columns."""
+        import pandas as pd
+
+        bars = self.bars(symbol, days)
+        return pd.DataFrame({"Open": bars["open"], "High": bars["high"], "Low": bars["low"],
+                             "Close": bars["close"], "Volume": bars["volume"]},
+                            index=pd.to_datetime(bars["time"], unit="s"))
+
+    def stats(self) -> dict:
+        return {
+            "reads": self.reads,
+            "fresh_hits": self.fresh_hits,
+            "tail_fetches": self.tail_fetches,
+            "full_fetches": self.full_fetches,
+            "bars_fetched": self.bars_fetched,
+        }
+
+
+# Shared store used by stockRealtime.plot_stock_chart
+history_store = HistoryStore()
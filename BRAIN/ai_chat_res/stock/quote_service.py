@@ -0,0 +1,203 @@
+# BRAIN/ai_chat_res/stock/quote_service.py
+"""
+Batched, cached stock quotes for stockRealtime.py.
+
+Quote requests that arrive within `window` seconds of each other (a watchlist, a price
+and a chart asked together, parallel tool calls) are coalesced into one yf.download of
+all their symbols. A symbol that is already being fetched is not fetched again: later
+requests wait for the same result. Quotes are cached for a few seconds while the
+symbol's market is open and until shortly before it opens again while it is closed.
+
+    quote = quote_service.get("TATAMOTORS.NS")
+    quotes = quote_service.get_many(["AAPL", "MSFT", "INFY.NS"])
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# Market -> (time zone, opens, closes), weekdays only; exchange holidays are not known
+MARKET_HOURS = {
+    "IN": (ZoneInfo("Asia/Kolkata"), (9, 15), (15, 30)),
+    "US": (ZoneInfo("America/New_York"), (9, 30), (16, 0)),
+}
+# Seconds a quote is reused while its market is open, and at most while it is closed
+OPEN_MARKET_TTL = 15.0
+CLOSED_MARKET_TTL = 6 * 3600.0
+
+
+@dataclass
+class Quote:
+    symbol: str
+    price: float
+    previous_close: Optional[float]
+    fetched_at: float
+    market_open: bool
+
+    @property
+    def change_percent(self) -> Optional[float]:
+        if not self.previous_close:
+            return None
+        return (self.price - self.previous_close) / self.previous_close * 100
+
+
+def market_of(symbol: str) -> str:
+    symbol = symbol.upper()
+    if symbol.endswith((".NS", ".BO")) or symbol in ("^NSEI", "^BSESN", "^NSEBANK"):
+        return "IN"
+    return "US"
+
+
+def _session(symbol: str, now: datetime) -> Tuple[bool, float]:
+    """(market open, seconds until it next opens) for the symbol's market at `now`."""
+    zone, (open_hour, open_minute), (close_hour, close_minute) = MARKET_HOURS[market_of(symbol)]
+    local = now.astimezone(zone)
+    opens = local.replace(hour=open_hour, minute=open_minute, second=0, microsecond=0)
+    closes = local.replace(hour=close_hour, minute=close_minute, second=0, microsecond=0)
+    if local.weekday() < 5 and opens <= local < closes:
+        return True, 0.0
+    next_open = opens if local < opens else opens + timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    return False, (next_open - local).total_seconds()
+
+
+def quote_ttl(symbol: str, now: Optional[datetime] = None) -> Tuple[bool, float]:
+    """(market open, seconds a fresh quote for the symbol may be reused)."""
+    is_open, until_open = _session(symbol, now or datetime.now().astimezone())
+    if is_open:
+        return True, OPEN_MARKET_TTL
+    return False, max(OPEN_MARKET_TTL, min(CLOSED_MARKET_TTL, until_open - 60))
+
+
+def download_quotes(symbols: List[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+    """Last price and previous close of every symbol, in one yf.download call."""
+    import yfinance as yf
+
+    frame = yf.download(symbols, period="5d", interval="1d", group_by="ticker", progress=False,
+                        auto_adjust=False, threads=True)
+    quotes = {}
+    for symbol in symbols:
+        try:
+            columns = frame[symbol] if symbol in frame.columns.get_level_values(0) else frame
+            closes = columns["Close"].dropna()
+        except (KeyError, AttributeError):
+            continue
+        if len(closes):
+            quotes[symbol] = (float(closes.iloc[-1]), float(closes.iloc[-2]) if len(closes) > 1 else None)
+    return quotes
+
+
+class QuoteService:
+    """Coalesces quote requests into batched downloads, with in-flight dedupe and a market-aware cache."""
+
+    def __init__(self, fetch: Callable[[List[str]], Dict[str, Tuple[float, Optional[float]]]] = download_quotes,
+                 window: float = 0.05, timeout: float = 20.0) -> None:
+        """
+        Args:
+            fetch (callable): symbols -> {symbol: (price, previous close)} in one request.
+            window (float): Seconds to wait for more requests before a batch is fetched.
+            timeout (float): Seconds a caller waits for its batch.
+        """
+        self.fetch = fetch
+        self.window = window
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, Quote]] = {}   # symbol -> (expires_at, quote)
+        self._inflight: Dict[str, Future] = {}
+        self._pending: List[str] = []
+        self._timer: Optional[threading.Timer] = None
+        self.requests = self.hits = self.coalesced = self.batches = self.fetched = self.errors = 0
+
+    def _flush(self) -> None:
+        with self._lock:
+            symbols, self._pending, self._timer = self._pending, [], None
+            futures = {symbol: self._inflight[symbol] for symbol in symbols}
+            self.batches += 1
+            self.fetched += len(symbols)
+        try:
+            results = self.fetch(symbols)
+        except Exception as e:
+            logging.warning(f"Quote batch {symbols} failed: {e}")
+            results, error = {}, e
+        else:
+            error = None
+        now = time.time()
+        with self._lock:
+            for symbol, future in futures.items():
+                del self._inflight[symbol]
+                if symbol in results:
+                    price, previous_close = results[symbol]
+                    is_open, ttl = quote_ttl(symbol)
+                    quote = Quote(symbol, price, previous_close, now, is_open)
+                    self._cache[symbol] = (time.monotonic() + ttl, quote)
+                    future.set_result(quote)
+                else:
+                    self.errors += 1
+                    future.set_exception(error or LookupError(f"No quote for {symbol}"))
+
+    def _request(self, symbol: str) -> Future:
+        """A future for the symbol's quote: cached, already being fetched, or queued for the next batch."""
+        symbol = symbol.strip().upper()
+        with self._lock:
+            self.requests += 1
+            entry = self._cache.get(symbol)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                future = Future()
+                future.set_result(entry[1])
+                return future
+            if symbol in self._inflight:
+                self.coalesced += 1
+                return self._inflight[symbol]
+            future = self._inflight[symbol] = Future()
+            self._pending.append(symbol)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+            else:
+                self.coalesced += 1
+            return future
+
+    def get(self, symbol: str) -> Quote:
+        """The symbol's quote. Raises LookupError if it has none, or the download's error."""
+        return self._request(symbol).result(self.timeout)
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, Optional[Quote]]:
+        """Quotes for several symbols (a watchlist), fetched together; None for a symbol without one."""
+        futures = {symbol: self._request(symbol) for symbol in symbols}
+        quotes = {}
+        for symbol, future in futures.items():
+            try:
+                quotes[symbol] = future.result(self.timeout)
+            except Exception:
+                quotes[symbol] = None
+        return quotes
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(symbol.upper(), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.requests, 3) if self.requests else None,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "avg_batch_size": round(self.fetched / self.batches, 2) if self.batches else None,
+                "errors": self.errors,
+            }
+
+
+# Shared service used by stockRealtime.py (price, chart and watchlist requests)
+quote_service = QuoteService()
@@ -1,34 +1,33 @@
 import os
 # from tkinter import XView
-from googlesearch import search
 # from googleapiclient.discovery import build
-from groq import Groq
-from json import load, dump
 import requests
-from dotenv import dotenv_values
-import yfinance as yf
-import plotly.graph_objects as go
+from BRAIN.ai_chat_res.llm_client import get_env, get_groq_client
+# yfinance and plotly are imported by the functions that need them, so the search
+# helpers can be used (and benchmarked) without them
 # import pandas as pd
 # from prophet import Prophet
 import re  # Import regular expression module
-from duckduckgo_search import DDGS
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
+from BRAIN.ai_chat_res.chat_history import chat_history
+from BRAIN.ai_chat_res.completion_cache import time_context
+from BRAIN.ai_chat_res.web_search import ddg_results, google_results
+from BRAIN.ai_chat_res.stock.history_store import history_store
+from BRAIN.ai_chat_res.stock.quote_service import quote_service
+from BRAIN.ai_chat_res.stock.ticker_index import ticker_index
 # import datetime  # Ensure the datetime module is imported
 
 
 
 # Load environment variables
-env_vars = dotenv_values(".env")
+env_vars = get_env()
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize Groq client
-client = Groq(api_key=GroqAPIKey)
-
-# Initialize Groq client
-groq_client = Groq(api_key=GroqAPIKey)
+# The shared Groq client (pooled connections, see llm_client.py) is fetched with
+# get_groq_client() when a completion is made, not at import
 
 # System prompt
 System = f"""You are {Assistantname}, an AI assistant with real-time capabilities. Follow these rules:
@@ -50,25 +49,16 @@ SYSTEM_PROMPT = f"""You are {Assistantname}, an AI assistant with real-time capa
 4. Always reference latest information from search results
 5. Handle stock prices with .NS suffix for Indian companies"""
 
-# Load chat history
-try:
-    with open(r"Data/ChatLog.json", "r") as f:
-        ChatLog = load(f)
-except FileNotFoundError:
-    with open(r"Data/ChatLog.json", "w") as f:
-        ChatLog = []
-        dump(ChatLog, f)
-
 # Function to get real-time information from the internet using Google
+# (results are cached by search_cache.py)
 def GoogleSearch(query):
     try:
-        results = list(search(query, num_results=5))
+        results = google_results(query, max_results=5)
         Answer = f"The search results for '{query}' are:\n[start]\n"
         for result in results:
-            Answer += f"Title: {result}\n"
-            Answer += f"URL: {result}\n\n"
-            Answer += f"Description: {result}\n\n"
-            Answer += f"Snippet: {result}\n\n"
+            Answer += f"Title: {result.title}\n"
+            Answer += f"URL: {result.url}\n\n"
+            Answer += f"Description: {result.snippet}\n\n"
         Answer += "[end]"
         return Answer
     except Exception as e:
@@ -78,9 +68,8 @@ def GoogleSearch(query):
 def perform_ddg_search(query: str, max_results: int = 10) -> str:
     """Get search results from DuckDuckGo"""
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=max_results))
-            return "\n".join([f"Title: {res['title']}\nURL: {res['href']}" for res in results])
+        results = ddg_results(query, max_results=max_results)
+        return "\n".join([f"Title: {res.title}\nURL: {res.url}" for res in results])
     except Exception as e:
         return f"Search error: {str(e)}"
 
@@ -143,7 +132,7 @@ def handle_stock_query(user_query: str) -> str:
     """End-to-end stock price handling"""
     try:
         symbol = extract_stock_symbol_groq(user_query)
-        if not validate_stock_symbol(symbol):
+        if symbol not in ticker_index and not validate_stock_symbol(symbol):
             return "Please provide a valid stock name. For Indian stocks, try adding 'India' or 'NSE'."
         return get_stock_price(symbol)
     except Exception as e:
@@ -152,16 +141,16 @@ def handle_stock_query(user_query: str) -> str:
 def get_web_results(query: str) -> str:
     """Combine multiple search sources"""
     try:
-        google_results = "\n".join(list(search(query, num_results=3)))
-        ddg_results = perform_ddg_search(query)
-        return f"Google Results:\n{google_results}\n\nDuckDuckGo Results:\n{ddg_results}"
+        google_urls = "\n".join(result.url for result in google_results(query, max_results=3))
+        ddg_text = perform_ddg_search(query)
+        return f"Google Results:\n{google_urls}\n\nDuckDuckGo Results:\n{ddg_text}"
     except Exception as e:
         return f"Search error: {str(e)}"
 
 def generate_ai_response(query: str, context: str) -> str:
     """Generate response using Groq AI"""
     try:
-        response = groq_client.chat.completions.create(
+        response = get_groq_client().chat.completions.create(
             model="llama-3.1-8b-instant",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -197,26 +186,19 @@ def generate_ai_response(query: str, context: str) -> str:
 #         return symbol
 #     return None
 
-def Information():
-    current_date_time = datetime.datetime.now()
-    day = current_date_time.strftime("%A")
-    date = current_date_time.strftime("%d")
-    month = current_date_time.strftime("%B")
-    year = current_date_time.strftime("%Y")
-    hour = current_date_time.strftime("%H")
-    minute = current_date_time.strftime("%M")
-    second = current_date_time.strftime("%S")
-    data = f"User this Real-time information if needed:\n"
-    data += f"Day: {day}\nDate: {date}\nMonth: {month}\nYear: {year}\n"
-    data += f"Time: {hour} hours, {minute} minutes, {second} seconds.\n"
-    return data
+def Information(prompt=None):
+    return time_context(prompt)
 
 # Function to extract stock symbol using Groq AI
 def extract_stock_symbol_groq(user_query: str) -> str:
-    """Find accurate stock symbol using AI and web search"""
+    """Find accurate stock symbol: local ticker index first, then AI and web search"""
+    # Listed companies resolve locally, without any network round trip
+    match = ticker_index.resolve(user_query)
+    if match is not None:
+        return match.symbol
     try:
-        # First try to extract symbol using Groq AI
-        response = client.chat.completions.create(
+        # Unknown to the index: let Groq AI extract the symbol
+        response = get_groq_client().chat.completions.create(
             model="llama-3.1-8b-instant",
             messages=[{
                 "role": "user",
@@ -260,15 +242,17 @@ def extract_stock_symbol_groq(user_query: str) -> str:
 def validate_stock_symbol(symbol: str) -> bool:
     """Improved symbol validation"""
     try:
-        return yf.Ticker(symbol).history(period="1d").shape[0] > 0
+        # A symbol is valid if it has a quote; the quote is then cached for get_stock_price
+        quote_service.get(symbol)
+        return True
     except:
         return False
     
 def get_stock_price(symbol: str) -> str:
     """Get current stock price with proper formatting"""
     try:
-        stock = yf.Ticker(symbol)
-        price = stock.fast_info["last_price"]
+        # Batched with other requests and cached while the price cannot have changed
+        price = quote_service.get(symbol).price
         
         # Formatting for Indian stocks
         # if ".NS" in symbol:
@@ -277,15 +261,51 @@ def get_stock_price(symbol: str) -> str:
     except Exception as e:
         return f"Price check failed: {str(e)}"
 
+# Separators between the companies of a watchlist question ("tcs, infosys and wipro")
+_WATCHLIST_SEPARATORS = re.compile(r"\s*(?:,|;|\band\b|\baur\b|\bvs\.?|\bversus\b|&)\s*", re.IGNORECASE)
+
+def extract_stock_symbols(user_query: str) -> list:
+    """Symbols of every company named in the query, in order (each part resolved like extract_stock_symbol_groq)"""
+    # "Mahindra and Mahindra" is one company: only split if the whole query is not one
+    match = ticker_index.resolve(user_query)
+    if match is not None:
+        return [match.symbol]
+    symbols = []
+    for part in _WATCHLIST_SEPARATORS.split(user_query):
+        if not re.search(r"\w", part):
+            continue
+        try:
+            symbol = extract_stock_symbol_groq(part)
+        except ValueError as e:
+            print(f"Skipping '{part}': {e}")
+            continue
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+def get_watchlist_prices(symbols) -> str:
+    """Current prices of several symbols, fetched in one batch"""
+    if not symbols:
+        return "Please name the stocks you want prices for."
+    lines = []
+    for symbol, quote in quote_service.get_many(symbols).items():
+        lines.append(f"{symbol}: ${quote.price:,.2f}" if quote is not None else f"{symbol}: price unavailable")
+    return "\n".join(lines)
+
 # # Function to plot stock chart
 def plot_stock_chart(stock_name):
     try:
-        stock = yf.Ticker(stock_name)
-        df = stock.history(period="1mo")
+        import plotly.graph_objects as go
+        # Last month of daily bars from the local store; only new bars are downloaded
+        df = history_store.frame(stock_name, days=31)
 
         # Extract the latest date and price and time
         latest_date = df.index[-1].strftime("%Y-%m-%d")
         latest_price = df["Close"].iloc[-1]
+        try:
+            latest_price = quote_service.get(stock_name).price  # Same quote as get_stock_price
+        except Exception:
+            pass
         # Get the current system time in 12-hour format
         current_time = datetime.now().strftime("%I:%M:%S %p")
         # latest_time = df.index[-1].strftime("%H:%M:%S")
@@ -350,13 +370,6 @@ def AnswerModifier(Answer):
 
 # Function to get chatbot response
 def get_stock_real_time_info(prompt):
-    global messages
-
-    with open(r"Data/ChatLog.json", "r") as f:
-        messages = load(f)
-
-    messages.append({"role": "user", "content": f"{prompt}"})
-
     # if "stock" in prompt.lower() or "price" in prompt.lower():
     #     # stock_symbol = extract_stock_name(prompt)
     #     stock_Name = prompt
@@ -410,10 +423,10 @@ def get_stock_real_time_info(prompt):
 
     # stock results respones
     completion_messages = [{"role": "system", "content": System},
-                           {"role:": "system", "content": Information()}
+                           {"role:": "system", "content": Information(prompt)}
                            ]
 
-    completion = client.chat.completions.create(
+    completion = get_groq_client().chat.completions.create(
         model="llama3-70b-8192",
         messages=completion_messages,
         temperature=0.7,
@@ -428,10 +441,7 @@ def get_stock_real_time_info(prompt):
         if chunk.choices[0].delta.content is not None:
             Answer += chunk.choices[0].delta.content
 
-    messages.append({"role": "assistant", "content": Answer.strip()})
-
-    with open(r"Data/ChatLog.json", "w") as f:
-        dump(messages, f, indent=4)
+    chat_history.append_turn(f"{prompt}", Answer.strip())
 
     return AnswerModifier(Answer)
 
@@ -0,0 +1,326 @@
+# BRAIN/ai_chat_res/stock/ticker_index.py
+"""
+Local index of stock symbols, so "tata motor ka share price" resolves to TATAMOTORS.NS
+without an LLM call or a network round trip.
+
+The index is built once, on first use, from the exchange listing files in
+Data/listings/ plus a built-in list of commonly asked companies:
+
+    NSE     EQUITY_L.csv             SYMBOL, NAME OF COMPANY           -> SYMBOL.NS
+    BSE     Equity.csv               Security Id, Security Name        -> SYMBOL.BO
+    NASDAQ  nasdaqlisted.txt         Symbol|Security Name              -> SYMBOL
+    NYSE    otherlisted.txt          ACT Symbol|Security Name          -> SYMBOL
+    any     *.csv                    symbol/ticker, name/company       (exchange from the file name)
+    aliases aliases.csv              alias, symbol                     (nicknames: "ril", "hul")
+
+The NSE, NASDAQ and NYSE files are downloaded with `python -m TOOLS.fetch_listings`.
+
+Company names lose their legal suffixes ("Limited", "Inc.") and are matched against
+every span of the query: exactly, then by a phonetic key that forgives speech-to-text
+spellings ("infosis", "tata motor"), then by a fuzzy string match. A listing in several
+places resolves to the preferred exchange (NSE unless the query names another one).
+A match must account for every word of the query (besides exchange names); anything
+more ("tata motors vs tata steel") is left to the LLM.
+"""
+import csv
+import difflib
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+LISTINGS_DIR = r"Data/listings"
+
+# Commonly asked companies, available without any listing file: symbol -> names and nicknames
+BUILTIN_TICKERS: Dict[str, Tuple[str, ...]] = {
+    "RELIANCE.NS": ("Reliance Industries", "reliance", "ril"),
+    "TCS.NS": ("Tata Consultancy Services", "tcs"),
+    "INFY.NS": ("Infosys", "infy"),
+    "HDFCBANK.NS": ("HDFC Bank",),
+    "ICICIBANK.NS": ("ICICI Bank",),
+    "SBIN.NS": ("State Bank of India", "sbi"),
+    "TATAMOTORS.NS": ("Tata Motors",),
+    "TATASTEEL.NS": ("Tata Steel",),
+    "TATAPOWER.NS": ("Tata Power",),
+    "TITAN.NS": ("Titan Company", "titan"),
+    "WIPRO.NS": ("Wipro",),
+    "HCLTECH.NS": ("HCL Technologies", "hcl tech", "hcl"),
+    "TECHM.NS": ("Tech Mahindra",),
+    "M&M.NS": ("Mahindra & Mahindra", "mahindra and mahindra", "mahindra"),
+    "MARUTI.NS": ("Maruti Suzuki India", "maruti suzuki", "maruti"),
+    "BAJFINANCE.NS": ("Bajaj Finance",),
+    "BAJAJ-AUTO.NS": ("Bajaj Auto",),
+    "HINDUNILVR.NS": ("Hindustan Unilever", "hul"),
+    "ITC.NS": ("ITC",),
+    "LT.NS": ("Larsen & Toubro", "larsen and toubro", "l&t"),
+    "ASIANPAINT.NS": ("Asian Paints",),
+    "SUNPHARMA.NS": ("Sun Pharmaceutical Industries", "sun pharma"),
+    "BHARTIARTL.NS": ("Bharti Airtel", "airtel"),
+    "KOTAKBANK.NS": ("Kotak Mahindra Bank", "kotak bank", "kotak"),
+    "AXISBANK.NS": ("Axis Bank",),
+    "ADANIENT.NS": ("Adani Enterprises", "adani"),
+    "ADANIPORTS.NS": ("Adani Ports and Special Economic Zone", "adani ports"),
+    "ONGC.NS": ("Oil and Natural Gas Corporation", "ongc"),
+    "NTPC.NS": ("NTPC",),
+    "POWERGRID.NS": ("Power Grid Corporation of India", "power grid"),
+    "COALINDIA.NS": ("Coal India",),
+    "ZOMATO.NS": ("Zomato",),
+    "PAYTM.NS": ("One 97 Communications", "paytm"),
+    "NYKAA.NS": ("FSN E-Commerce Ventures", "nykaa"),
+    "IRCTC.NS": ("Indian Railway Catering and Tourism Corporation", "irctc"),
+    "YESBANK.NS": ("Yes Bank",),
+    "^NSEI": ("Nifty 50", "nifty"),
+    "^BSESN": ("BSE Sensex", "sensex"),
+    "AAPL": ("Apple",),
+    "MSFT": ("Microsoft",),
+    "GOOGL": ("Alphabet", "google"),
+    "AMZN": ("Amazon",),
+    "META": ("Meta Platforms", "facebook", "meta"),
+    "TSLA": ("Tesla",),
+    "NVDA": ("Nvidia",),
+    "NFLX": ("Netflix",),
+    "AMD": ("Advanced Micro Devices", "amd"),
+    "INTC": ("Intel",),
+    "IBM": ("International Business Machines", "ibm"),
+    "ORCL": ("Oracle",),
+    "UBER": ("Uber Technologies", "uber"),
+    "DIS": ("Walt Disney", "disney"),
+    "KO": ("Coca-Cola", "coca cola", "coke"),
+    "PEP": ("PepsiCo", "pepsi"),
+    "JPM": ("JPMorgan Chase", "jp morgan"),
+    "BRK-B": ("Berkshire Hathaway",),
+}
+
+# Exchange -> Yahoo Finance suffix, in order of preference when a company is listed on several
+EXCHANGE_SUFFIXES = {"NSE": ".NS", "US": "", "BSE": ".BO"}
+
+# Legal suffixes, and words of a stock question that are not part of a company name. Both
+# names and queries lose them, so "State Bank of India Ltd" matches "state bank india share"
+_STOP_WORDS = {
+    "ltd", "limited", "inc", "incorporated", "corp", "corporation", "co", "company", "plc", "llc", "sa", "nv", "ag",
+    "class", "common", "ordinary", "equity", "stock", "stocks", "share", "shares", "price", "prices", "chart",
+    "graph", "value", "rate", "today", "current", "currently", "live", "latest", "now", "of", "the", "what",
+    "whats", "is", "was", "show", "me", "tell", "give", "check", "get", "find", "please", "how", "much", "for",
+    "about", "on", "in", "a", "an", "its", "cap", "ka", "ki", "ke", "kya", "hai", "batao", "bataiye", "dikhao",
+    "kitna", "kitne", "aaj", "abhi", "symbol", "ticker", "quote", "chal", "raha", "rahi", "rahe", "hain", "mein",
+    "market", "trading", "right", "at",
+}
+_EXCHANGE_HINTS = {"nse": "NSE", "india": "NSE", "indian": "NSE", "bse": "BSE", "nasdaq": "US", "nyse": "US",
+                   "us": "US", "american": "US"}
+_NON_WORD = re.compile(r"[^\w&]+")
+_TICKER_TOKEN = re.compile(r"\b[A-Z][A-Z0-9&\-]{0,14}(?:\.(?:NS|BO))?\b")
+
+
+def match_words(text: str) -> List[str]:
+    """The words of a name or query that identify a company."""
+    return [word for word in _NON_WORD.sub(" ", text.casefold().replace("&", " and ")).split()
+            if word not in _STOP_WORDS]
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(match_words(name)) or " ".join(_NON_WORD.sub(" ", name.casefold()).split())
+
+
+def phonetic_word(word: str) -> str:
+    """
+    Sound-alike key for one word: spellings that are pronounced alike (infosys / infosis,
+    motor / motors, kotak / kotack) get the same key.
+    """
+    word = re.sub(r"[^a-z]", "", word.casefold())
+    if not word:
+        return ""
+    for pattern, replacement in (("ph", "f"), ("ck", "k"), ("q", "k"), ("x", "ks"), ("z", "s"), ("y", "i"),
+                                 ("w", "v"), ("c(?=[eiy])", "s"), ("c", "k"), ("(?<=.)h", "")):
+        word = re.sub(pattern, replacement, word)
+    if len(word) > 3 and word.endswith("s"):
+        word = word[:-1]  # Plural, or a trailing s the recognizer added or dropped
+    first, rest = word[0], re.sub(r"[aeiou]", "", word[1:])
+    return first + re.sub(r"(.)\1+", r"\1", rest)
+
+
+def phonetic_key(name: str) -> str:
+    return " ".join(filter(None, (phonetic_word(word) for word in name.split())))
+
+
+@dataclass
+class TickerMatch:
+    symbol: str
+    name: str
+    method: str      # "ticker", "exact", "phonetic" or "fuzzy"
+    score: float = 1.0
+
+
+class TickerIndex:
+    """Company names, aliases and phonetic keys -> symbols, built from the listing files on first use."""
+
+    def __init__(self, listings_dir: str = LISTINGS_DIR, fuzzy_cutoff: float = 0.85) -> None:
+        self.listings_dir = listings_dir
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._names: Dict[str, List[Tuple[str, str]]] = {}     # normalized name -> [(symbol, exchange)]
+        self._phonetic: Dict[str, List[str]] = {}              # phonetic key -> normalized names
+        self._by_initial: Dict[str, List[str]] = {}            # first letter -> normalized names (fuzzy)
+        self._symbols: Dict[str, str] = {}                     # symbol -> display name
+        self.stats_counts: Dict[str, int] = {}
+
+    # --- Building ---
+    def add(self, symbol: str, name: str, exchange: str = "US", alias: bool = False) -> None:
+        symbol = symbol.strip().upper()
+        normalized = normalize_name(name)
+        if not symbol or not normalized:
+            return
+        if not alias:
+            self._symbols.setdefault(symbol, name.strip())
+        entries = self._names.setdefault(normalized, [])
+        if all(existing != symbol for existing, _ in entries):
+            entries.append((symbol, exchange))
+            key = phonetic_key(normalized)
+            if key:
+                self._phonetic.setdefault(key, [])
+                if normalized not in self._phonetic[key]:
+                    self._phonetic[key].append(normalized)
+            if len(entries) == 1:
+                self._by_initial.setdefault(normalized[0], []).append(normalized)
+
+    def _load_file(self, path: str) -> int:
+        file_name = os.path.basename(path).casefold()
+        with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            delimiter = "|" if sample.count("|") > sample.count(",") else ","
+            rows = csv.DictReader(f, delimiter=delimiter)
+            columns = {column.strip().casefold(): column for column in rows.fieldnames or []}
+
+            def column(*names):
+                return next((columns[name] for name in names if name in columns), None)
+
+            if file_name.startswith("aliases"):
+                alias_column, symbol_column = column("alias", "name"), column("symbol", "ticker")
+                count = 0
+                for row in rows:
+                    if row.get(alias_column) and row.get(symbol_column):
+                        self.add(row[symbol_column], row[alias_column], "ALIAS", alias=True)
+                        count += 1
+                return count
+
+            symbol_column = column("symbol", "act symbol", "security id", "ticker", "nasdaq symbol")
+            name_column = column("name of company", "security name", "company name", "company", "name", "issuer name")
+            if symbol_column is None or name_column is None:
+                logging.warning(f"Skipping listing {path}: no symbol/name columns in {list(columns)}")
+                return 0
+            if "bse" in file_name or "security id" in columns:
+                exchange = "BSE"
+            elif "nse" in file_name or "equity_l" in file_name or "name of company" in columns:
+                exchange = "NSE"
+            else:
+                exchange = "US"
+            count = 0
+            for row in rows:
+                symbol, name = (row.get(symbol_column) or "").strip(), (row.get(name_column) or "").strip()
+                if not symbol or not name or symbol.lower().startswith("file creation"):
+                    continue
+                if (row.get(column("test issue") or "") or "").strip() == "Y":
+                    continue
+                self.add(symbol + EXCHANGE_SUFFIXES.get(exchange, ""), name, exchange)
+                count += 1
+            return count
+
+    def load(self) -> None:
+        """Builds the index (once): built-in companies first, then every listing file."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for symbol, names in BUILTIN_TICKERS.items():
+                exchange = "NSE" if symbol.endswith(".NS") else "US"
+                self.add(symbol, names[0], exchange)
+                for alias in names[1:]:
+                    self.add(symbol, alias, exchange, alias=True)
+            if os.path.isdir(self.listings_dir):
+                for file_name in sorted(os.listdir(self.listings_dir)):
+                    if not file_name.lower().endswith((".csv", ".txt")):
+                        continue
+                    path = os.path.join(self.listings_dir, file_name)
+                    try:
+                        count = self._load_file(path)
+                        logging.info(f"Loaded {count} listings from {path}")
+                    except (OSError, csv.Error) as e:
+                        logging.warning(f"Could not read listing {path}: {e}")
+            self._loaded = True
+
+    # --- Lookup ---
+    def __contains__(self, symbol: str) -> bool:
+        self.load()
+        return (symbol or "").upper() in self._symbols
+
+    def _pick(self, normalized: str, exchange: Optional[str]) -> str:
+        entries = self._names[normalized]
+        order = list(EXCHANGE_SUFFIXES)
+        if exchange in order:
+            order.remove(exchange)
+            order.insert(0, exchange)
+
+        def preference(entry):
+            _, listed_on = entry
+            return order.index(listed_on) if listed_on in order else len(order)
+
+        return min(entries, key=preference)[0]
+
+    def _count(self, method: str) -> None:
+        self.stats_counts[method] = self.stats_counts.get(method, 0) + 1
+
+    def resolve(self, query: str) -> Optional[TickerMatch]:
+        """The symbol the query is about, or None if no listed company matches it well enough."""
+        self.load()
+        # An explicit ticker ("AAPL", "TCS.NS") wins if it is listed
+        for token in _TICKER_TOKEN.findall(query or ""):
+            if len(token) > 1 and token in self._symbols:
+                self._count("ticker")
+                return TickerMatch(token, self._symbols[token], "ticker")
+
+        words = match_words(query or "")
+        exchange = next((_EXCHANGE_HINTS[word] for word in words if word in _EXCHANGE_HINTS), None)
+        if not words:
+            self._count("miss")
+            return None
+
+        # Longest spans first, so "tata motors" is preferred over "tata"; exchange names are
+        # kept in the words (they can be part of a name) and simply fall out of shorter spans.
+        # A span must leave no other word of the query unexplained: "tata motors vs tata steel"
+        # or "infosys results date" are not a plain quote request, so they go to the LLM.
+        spans = [" ".join(words[start:start + size]) for size in range(min(len(words), 6), 0, -1)
+                 for start in range(len(words) - size + 1)
+                 if all(word in _EXCHANGE_HINTS for word in words[:start] + words[start + size:])]
+        for span in spans:
+            if span in self._names:
+                symbol = self._pick(span, exchange)
+                self._count("exact")
+                return TickerMatch(symbol, self._symbols.get(symbol, span), "exact")
+        for span in spans:
+            for normalized in self._phonetic.get(phonetic_key(span), ()):
+                symbol = self._pick(normalized, exchange)
+                self._count("phonetic")
+                return TickerMatch(symbol, self._symbols.get(symbol, normalized), "phonetic", 0.9)
+        for span in spans:
+            if len(span) < 4:
+                continue  # Short words fuzzily match far too many names
+            close = difflib.get_close_matches(span, self._by_initial.get(span[0], ()), n=1, cutoff=self.fuzzy_cutoff)
+            if close:
+                symbol = self._pick(close[0], exchange)
+                self._count("fuzzy")
+                score = difflib.SequenceMatcher(None, span, close[0]).ratio()
+                return TickerMatch(symbol, self._symbols.get(symbol, close[0]), "fuzzy", round(score, 3))
+        self._count("miss")
+        return None
+
+    def stats(self) -> dict:
+        """Resolutions per method (ticker, exact, phonetic, fuzzy) and misses."""
+        return dict(self.stats_counts, symbols=len(self._symbols), names=len(self._names))
+
+
+# Shared index used by stockRealtime.py
+ticker_index = TickerIndex()
@@ -1,17 +1,15 @@
 # In BRAIN/ai_chat_res/system_prompts.py (modified)
 import os
 from dotenv import load_dotenv
+from BRAIN.ai_chat_res.tool_registry import tool_registry
 
 load_dotenv()
 
 # Load environment variables
 Assistantname = os.getenv('Assistantname')
 
-def get_function_calling_system_prompt():
-    """
-    Generates the system prompt for function calling.
-    """
-    function_descriptions = f"""
+# --- Prompt around the tool list; the tool descriptions themselves come from tool_registry ---
+_PROMPT_HEADER = f"""
     You are {Assistantname}, an AI assistant. Your task is to analyze the user's query and determine if a function call is needed.
     You have access to a variety of functions to assist the user.
     
@@ -21,99 +19,48 @@ def get_function_calling_system_prompt():
     - The `function_name` must be one of the functions listed below.
     - The `query` field should contain the primary input string for the function. For functions that take specific arguments (e.g., a contact name for a call, a prompt for image generation), this `query` field should hold that specific piece of information.
     - If a function takes no arguments, the `query` field can be an empty string or the original user query.
+    - If the query asks for several independent actions (e.g. "open youtube and check battery"), call every function needed, or respond with a JSON array of such objects: [{{"function": "open_website", "query": "youtube"}}, {{"function": "get_battery_status", "query": ""}}]
     - If no function call is needed, or if the query is conversational, respond directly to the user's query without using the JSON format.
     **Language:**
     - Respond in English if the user asks in English.
     - Respond in Hinglish (Hindi using English script) if the user asks in Hindi.
 
     **Available Functions:**
-    **General:**
-    1. chat_with_chatbot(query: str) -> str
-       - Description: Engage in a general conversation with the chatbot.
-       - Args:
-         - query (str): The user's query or statement.
-       - Returns:
-         - str: The chatbot's response.
-    **Search & Information:**
-    1.  `perform_google_search(query: str)`: Search Google for information and return results directly. Use for general info requests.
-    2.  `perform_duckduckgo_search(query: str)`: Search DuckDuckGo for information and return results directly. Alternative to Google search.
-    3.  `Real_Time_Search_Engine(query: str)`: Provides real-time information or performs searches. (Consider if this overlaps too much with 1 & 2).
-    4.  `search_google_pywhatkit(query: str)`: **Interactive** Google search. Prompts user via voice for search term and opens browser. Use *only* for "manual search", "interactive search". `query` arg is ignored.
-    5.  `get_stock_price_info(query: str)`: Get current stock price for a symbol.
-    6.  `get_stock_chart(query: str)`: Display a stock chart for a symbol.
-
-    **File Reading:**
-    7.  `presentation_read()`: Reads content from a PowerPoint presentation. Call for "read ppt", "read presentation". No arguments needed in the JSON `query`.
-    8.  `pdf_read()`: Reads content from a PDF file. Call for "read PDF", "read pdf file". No arguments needed in the JSON `query`.
-    9.  `ms_word()`: Reads content from a Word document. Call for "read doc", "read word file". No arguments needed in the JSON `query`.
-
-    **Application & Website Control:**
-    10. `open_website(query: str)`: Open a website URL or common name (e.g., "google.com", "youtube").
-    11. `open_application(query: str)`: Open a local application (e.g., "Notepad", "Chrome").
-    12. `close_application(query: str)`: Close/terminate a running application (e.g., "close Notepad"). Use with caution.
-    13. `close_current_tab()`: Close the currently active tab or window (browser, explorer). No args.
-
-    **System Status & Advice:**
-    14. `get_battery_status()`: Check computer's battery level and charging status. No args.
-    15. `get_battery_advice()`: Provide advice based on computer's battery level. No args.
-    16. `check_pen_drive_status()`: Check if a USB/pen/flash drive is connected. No args.
-
-    **Image Generation:**
-    17. `generate_image(prompt: str)`: Generate an image from a text description. Use for "generate image of...", "create picture...".
-
-    **Android Device Control (ADB):** (Use only when user mentions phone/ADB)
-    18. `initiate_adb_call(contact_query: str, sim_slot_choice: str = None)`: Call contact/number via connected phone. `sim_slot_choice` can be '1' or '2'.
-    19. `end_adb_call()`: End the current phone call. No args.
-    20. `toggle_adb_speaker(speaker_on_str: str = None)`: Toggle phone speakerphone. Pass "true" for ON, "false" for OFF.
-    21. `take_adb_screenshot()`: Take screenshot on connected phone. No args.
-    22. `get_adb_battery_percentage()`: Check connected phone's battery level. No args.
-
-    **Video Player Control:** (Controls the active video player like VLC, YouTube)
-    23. `video_volume_up()` / `video_volume_down()`: Adjust volume.
-    24. `video_mute()` / `video_unmute()`: Toggle mute.
-    25. `video_seek_forward()` / `video_seek_backward()`: Seek small amount (arrow keys).
-    26. `video_seek_forward_10s()` / `video_seek_backward_10s()`: Seek 10 seconds (J/L keys).
-    27. `video_seek_to_beginning()` / `video_seek_to_end()`: Jump to start/end (Home/End keys).
-    28. `video_next_video()` / `video_previous_video()`: Go to next/previous in playlist (N/P keys).
-    29. `video_increase_speed()` / `video_decrease_speed()`: Change playback speed (]/[ keys).
-    30. `video_toggle_subtitles()`: Toggle captions (C key).
-    31. `video_increase_font_size()` / `video_decrease_font_size()`: Adjust subtitle size (+/- keys).
-    32. `video_rotate_text_opacity()` / `video_rotate_window_opacity()`: Change subtitle opacity (O/W keys).
-
-    **Browser Control:**
-    33. `browser_open_new_tab()`: Open a new browser tab.
-    34. `browser_open_menu()`: Open browser settings/menu.
-    35. `browser_zoom_in_page()` / `browser_zoom_out_page()`: Zoom current page content.
-    36. `browser_refresh_page()`: Reload current page.
-    37. `browser_switch_next_tab()` / `browser_switch_previous_tab()`: Change active tab.
-    38. `browser_open_history()` / `browser_open_bookmarks()`: Show history/bookmarks.
-    39. `browser_go_back()` / `browser_go_forward()`: Navigate page history.
-    40. `browser_open_dev_tools()`: Open developer tools.
-    41. `browser_toggle_fullscreen_window()`: Toggle fullscreen for the browser window.
-    42. `browser_open_private_window()`: Open new incognito/private window.
-
-    **YouTube Specific Control:** (Use when controlling YouTube player specifically)
-    43. `youtube_pan_up()` / `youtube_pan_down()` / `youtube_pan_left()` / `youtube_pan_right()`: Pan in 360/VR videos (WASD keys).
-    44. `youtube_go_to_search()`: Activate YouTube search box (/).
-    45. `youtube_toggle_play_pause()`: Play/pause video (K/Space).
-    46. `youtube_toggle_mute()`: Mute/unmute video (M).
-    47. `youtube_toggle_fullscreen()`: Toggle video fullscreen (F).
-    48. `youtube_toggle_theater_mode()`: Toggle theater mode (T).
-    49. `youtube_toggle_miniplayer()`: Toggle miniplayer (I).
-    50. `youtube_exit_fullscreen()`: Exit fullscreen/miniplayer (Esc).
-    51. `youtube_toggle_party_mode()`: Toggle 'awesome' Easter egg.
+"""
 
+_PROMPT_INSTRUCTIONS = """
     **General Instructions:**
     1.  **Function Use:** Analyze the user's query. If it matches a capability described above, decide on the appropriate function.
     2.  **JSON or Direct Response:** If a function is chosen, use the specified JSON format. Otherwise, respond naturally.
     3.  **Search Preference:** For direct information requests, prefer `perform_google_search`, `perform_duckduckgo_search`, or `Real_Time_Search_Engine`. Use `search_google_pywhatkit` only for explicit requests for an interactive browser search.
     4.  **Clarity and Conciseness:** Keep responses clear, precise, and relevant. Use correct punctuation.
     5.  **No Unsolicited Info:** Do not add conversational filler, mention your training data, discuss your creation, or offer unsolicited information (like the current time, unless asked).
-    6.  **ADB Usage:** Only use ADB functions (section 6) if the user explicitly mentions controlling their phone, Android device, or ADB.
+    6.  **ADB Usage:** Only use the Android Device Control (ADB) functions if the user explicitly mentions controlling their phone, Android device, or ADB.
     7.  **Battery Info:** Use `get_battery_status` for computer battery level/status. Use `get_battery_advice` for advice on computer battery. Use `get_adb_battery_percentage` for a connected phone's battery.
     8.  **Contextual Understanding:** Pay attention to the context of the conversation to choose the best function and formulate the `query` field appropriately.
+"""
+
+def get_function_calling_system_prompt(query: str = None, top_k: int = 8):
+    """
+    Generates the system prompt for function calling.
+
+    Args:
+        query (str, optional): The user's utterance. When given, only the core tools
+            and the top_k tools relevant to it are described, which keeps the prompt
+            a fraction of the size of the full tool list. Without it, every tool is described.
+        top_k (int): How many query-relevant tools to include besides the core set.
+    """
+    tools = tool_registry.select(query, top_k) if query else None
+    return _PROMPT_HEADER + tool_registry.describe(tools) + _PROMPT_INSTRUCTIONS
+
+
+def get_function_calling_tools(query: str = None, top_k: int = 8):
+    """
+    Tool definitions (JSON schemas) for the chat API's native tool calling: the same
+    tools get_function_calling_system_prompt describes for this query.
     """
-    return function_descriptions
+    tools = tool_registry.select(query, top_k) if query else None
+    return tool_registry.schemas(tools)
 
 
     # Add more function descriptions here...
@@ -0,0 +1,145 @@
+# BRAIN/ai_chat_res/tool_cache.py
+"""
+Short-lived result cache for idempotent tools in functions_call.available_functions.
+
+Battery, pen drive, ADB, stock and search tools go to psutil, subprocesses, the phone or
+the network on every call, although the answer rarely changes within seconds. Decorate
+such a tool to reuse its answer:
+
+    @cached_tool(ttl=30, ignore_query=True, invalidate_on=("power",))
+    def get_battery_status(query: str = None) -> str: ...
+
+Tools with side effects (calls, key presses, opening apps) are simply not decorated, so
+they always run. Entries expire after their TTL, and invalidate_tools("power") drops the
+entries of every tool that declared that event, e.g. when the charger is plugged in.
+"""
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_FAILURE_PREFIXES = ("sorry", "error", "failed", "could not", "unable")
+
+
+def normalize_query(query) -> str:
+    """Cache key for a query: case, punctuation and extra whitespace do not matter."""
+    if query is None:
+        return ""
+    return " ".join(_PUNCTUATION.sub(" ", str(query).lower()).split())
+
+
+def cacheable_result(result) -> bool:
+    """Default rule: keep non-empty answers that do not report a failure."""
+    if result is None:
+        return False
+    if isinstance(result, str):
+        text = result.strip().lower()
+        return bool(text) and not text.startswith(_FAILURE_PREFIXES)
+    return True
+
+
+@dataclass
+class _ToolStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+            "invalidations": self.invalidations,
+        }
+
+
+class ToolCache:
+    """Per-tool TTL cache with event-based invalidation and per-tool hit rates."""
+
+    def __init__(self, max_entries_per_tool: int = 128) -> None:
+        self.max_entries_per_tool = max_entries_per_tool
+        self._entries: Dict[str, Dict[str, Tuple[float, object]]] = {}
+        self._events: Dict[str, set] = {}
+        self._stats: Dict[str, _ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, ttl: float, key: Callable[[object], str] = normalize_query, ignore_query: bool = False,
+               invalidate_on: Iterable[str] = (), cache_if: Callable[[object], bool] = cacheable_result,
+               name: Optional[str] = None):
+        """
+        Decorator for a tool taking one query argument.
+
+        Args:
+            ttl (float): Seconds an answer is reused.
+            key (callable): Maps the query to the cache key (normalize_query by default).
+            ignore_query (bool): The tool ignores its query, so every call shares one entry.
+            invalidate_on (Iterable[str]): Events (see invalidate) that make the answer stale.
+            cache_if (callable): Whether a result may be cached; failures are not by default.
+            name (str): Name in the stats; defaults to the function's name.
+        """
+        def decorator(function):
+            tool = name or function.__name__
+            with self._lock:
+                self._entries.setdefault(tool, {})
+                self._stats.setdefault(tool, _ToolStats())
+                for event in invalidate_on:
+                    self._events.setdefault(event, set()).add(tool)
+
+            @wraps(function)
+            def wrapper(query=None, *args, **kwargs):
+                if args or kwargs:
+                    return function(query, *args, **kwargs)  # Not the registry's one-query call
+                cache_key = "" if ignore_query else key(query)
+                now = time.monotonic()
+                with self._lock:
+                    entry = self._entries[tool].get(cache_key)
+                    if entry is not None and entry[0] > now:
+                        self._stats[tool].hits += 1
+                        return entry[1]
+                    self._stats[tool].misses += 1
+                result = function(query)
+                if cache_if(result):
+                    with self._lock:
+                        entries = self._entries[tool]
+                        entries.pop(cache_key, None)
+                        entries[cache_key] = (time.monotonic() + ttl, result)
+                        while len(entries) > self.max_entries_per_tool:
+                            del entries[next(iter(entries))]  # Oldest first (insertion order)
+                return result
+
+            wrapper.cache_tool_name = tool
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, event: Optional[str] = None, tool: Optional[str] = None) -> None:
+        """Drops the entries of the tools that declared `event`, of one `tool`, or (neither) of all."""
+        with self._lock:
+            if event is not None:
+                tools = self._events.get(event, set())
+            elif tool is not None:
+                tools = {tool} if tool in self._entries else set()
+            else:
+                tools = set(self._entries)
+            for name in tools:
+                if self._entries[name]:
+                    self._entries[name].clear()
+                    self._stats[name].invalidations += 1
+        if tools:
+            logging.debug(f"Tool cache invalidated ({event or tool or 'all'}): {sorted(tools)}")
+
+    def stats(self) -> dict:
+        """Hits, misses, hit rate and invalidations per cached tool."""
+        with self._lock:
+            return {tool: stats.as_dict() for tool, stats in self._stats.items()}
+
+
+# Shared cache used by functions_call.py; the plug watchers in Automation/ invalidate it
+tool_cache = ToolCache()
+cached_tool = tool_cache.cached
+invalidate_tools = tool_cache.invalidate
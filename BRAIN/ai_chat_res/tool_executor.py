@@ -0,0 +1,287 @@
+# BRAIN/ai_chat_res/tool_executor.py
+"""
+Runs the function calls of one router answer, concurrently where they are independent,
+and never longer than each tool's deadline.
+
+"Open youtube and check battery" comes back from the router as two calls. Calls that
+only read state or hit the network (battery, search, stocks, ADB) run in parallel on a
+shared worker pool. Calls that drive the foreground window with keystrokes or popups
+(browser, video, YouTube, apps, file dialogs) would interfere with each other, so they
+run one after another, in the order the model gave them, on a single "foreground" lane.
+The results are merged into one reply.
+
+Every tool has a soft and a hard deadline (ToolDeadline). Past the soft deadline the
+user hears that it is still working; tools marked `background` instead finish on their
+own and announce their result when it arrives, so the assistant can listen again. At the
+hard deadline the executor stops waiting and sets the call's cancel token. Python threads
+cannot be killed, so tools cooperate by checking cancelled() or sleeping with
+cancellable_sleep() (see Automation/adb_call.py).
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from BRAIN.ai_chat_res.function_call_parser import FunctionCall
+from BRAIN.ai_chat_res.tool_registry import tool_registry
+
+# Sections of tool_registry whose tools act on whatever window has the focus
+FOREGROUND_SECTIONS = {
+    "File Reading", "Application & Website Control", "Video Player Control",
+    "Browser Control", "YouTube Specific Control",
+}
+
+_NO_LIMIT = float("inf")
+
+
+@dataclass(frozen=True)
+class ToolDeadline:
+    soft: float                # seconds until the user hears "still working"
+    hard: float                # seconds until the executor gives up and cancels the call
+    background: bool = False   # past the soft deadline, finish in the background and announce the result
+
+
+DEFAULT_DEADLINE = ToolDeadline(soft=8.0, hard=45.0)
+
+SECTION_DEADLINES = {
+    # Key presses return at once; a hang means the window or driver is stuck
+    "Video Player Control": ToolDeadline(soft=3.0, hard=15.0),
+    "Browser Control": ToolDeadline(soft=3.0, hard=15.0),
+    "YouTube Specific Control": ToolDeadline(soft=3.0, hard=15.0),
+    # ensure_adb_connection may switch the phone to Wi-Fi ADB, which takes 10+ seconds
+    "Android Device Control (ADB)": ToolDeadline(soft=5.0, hard=60.0),
+    # These wait for the user to type a file path into a popup
+    "File Reading": ToolDeadline(soft=_NO_LIMIT, hard=_NO_LIMIT),
+}
+
+TOOL_DEADLINES = {
+    "generate_image": ToolDeadline(soft=6.0, hard=300.0, background=True),
+    "get_stock_chart": ToolDeadline(soft=6.0, hard=90.0, background=True),
+    "Real_Time_Search_Engine": ToolDeadline(soft=8.0, hard=60.0, background=True),
+    "chat_with_chatbot": ToolDeadline(soft=8.0, hard=60.0, background=True),
+    "perform_google_search": ToolDeadline(soft=6.0, hard=30.0),
+    "perform_duckduckgo_search": ToolDeadline(soft=6.0, hard=30.0),
+    "search_google_pywhatkit": ToolDeadline(soft=_NO_LIMIT, hard=_NO_LIMIT),  # asks the user by voice
+}
+
+
+def deadline_for(function_name: str) -> ToolDeadline:
+    if function_name in TOOL_DEADLINES:
+        return TOOL_DEADLINES[function_name]
+    tool = tool_registry.tools.get(function_name)
+    return SECTION_DEADLINES.get(tool.section, DEFAULT_DEADLINE) if tool is not None else DEFAULT_DEADLINE
+
+
+def lane(function_name: str) -> Optional[str]:
+    """Calls in the same lane run sequentially; None means the call is independent."""
+    tool = tool_registry.tools.get(function_name)
+    if tool is not None and tool.section in FOREGROUND_SECTIONS:
+        return "foreground"
+    return None
+
+
+# --- Cooperative cancellation, for tools running on the executor's threads ---
+_local = threading.local()
+
+
+def cancelled() -> bool:
+    """True if the tool call running on this thread has passed its hard deadline."""
+    token = getattr(_local, "token", None)
+    return token is not None and token.is_set()
+
+
+def cancellable_sleep(seconds: float) -> bool:
+    """time.sleep that ends early when the current tool call is cancelled. False if it was."""
+    token = getattr(_local, "token", None)
+    if token is None:
+        time.sleep(seconds)
+        return True
+    return not token.wait(seconds)
+
+
+def _label(function_name: str) -> str:
+    return function_name.replace("_", " ").strip().lower()
+
+
+@dataclass
+class _Pending:
+    call: FunctionCall
+    deadline: ToolDeadline
+    token: threading.Event = field(default_factory=threading.Event)
+    future: Future = field(default_factory=Future)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    status_sent: bool = False
+
+
+class ToolExecutor:
+    """Executes FunctionCalls against a function table on a bounded worker pool."""
+
+    def __init__(self, functions: Dict[str, Callable[[str], object]], max_workers: int = 8,
+                 poll_interval: float = 0.25) -> None:
+        """
+        Args:
+            functions (dict): Name -> callable taking the query string (available_functions).
+            max_workers (int): Calls that may run at the same time (abandoned calls keep a worker
+                until they return).
+            poll_interval (float): Longest wait between deadline checks.
+        """
+        self.functions = functions
+        self.poll_interval = poll_interval
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.multi_call_batches = 0
+        self.calls = 0
+        self.errors = 0
+        self.soft_deadline_misses = 0
+        self.timeouts = 0
+        self.background = 0
+        self.time_saved = 0.0  # sum of the calls' durations minus the batches' wall time
+
+    def _invoke(self, call: FunctionCall):
+        try:
+            return self.functions[call.function](call.query)
+        except Exception as e:
+            logging.error(f"Tool {call.function}({call.query!r}) failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return f"Sorry, {_label(call.function)} failed."
+
+    def _run_lane(self, items: List[_Pending]) -> None:
+        for item in items:
+            if item.token.is_set():
+                # An earlier call in this lane was abandoned; the window is not in a known state
+                item.future.set_result(None)
+                continue
+            item.started = time.monotonic()
+            _local.token = item.token
+            try:
+                result = self._invoke(item.call)
+            finally:
+                _local.token = None
+                item.finished = time.monotonic()
+            item.future.set_result(result)
+
+    def _detach(self, item: _Pending, on_result: Callable[[str], None]) -> None:
+        """Lets a background tool finish on its own; its result is announced when it arrives."""
+        remaining = item.deadline.hard - (time.monotonic() - item.started)
+        timer = threading.Timer(max(0.0, remaining), item.token.set) if remaining != _NO_LIMIT else None
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+
+        def announce(future: Future) -> None:
+            if timer is not None:
+                timer.cancel()
+            result = future.result()
+            if item.token.is_set():
+                logging.info(f"Background {item.call.function} finished after its hard deadline; result dropped.")
+            elif result is not None and str(result).strip():
+                on_result(str(result))
+
+        item.future.add_done_callback(announce)
+
+    def run(self, calls: List[FunctionCall], on_status: Optional[Callable[[str], None]] = None,
+            on_result: Optional[Callable[[str], None]] = None) -> List[object]:
+        """
+        Runs the calls and returns their results in the order of `calls`.
+
+        Args:
+            calls (List[FunctionCall]): What the router asked for.
+            on_status (callable): Speaks a "still working" status when a tool passes its soft deadline.
+            on_result (callable): Announces the result of a background tool that finishes later.
+                Without it, background tools are waited for like any other.
+
+        Returns:
+            List[object]: One result per call. A call that passed its hard deadline, or was moved
+            to the background, is represented by a short spoken status instead.
+        """
+        start = time.monotonic()
+        items = [_Pending(call, deadline_for(call.function)) for call in calls]
+        # One task per lane (sequential inside) and one per independent call
+        groups: Dict[object, List[int]] = {}
+        for index, call in enumerate(calls):
+            groups.setdefault(lane(call.function) or index, []).append(index)
+        for indices in groups.values():
+            self._pool.submit(self._run_lane, [items[i] for i in indices])
+        lane_of = {index: key for key, indices in groups.items() for index in indices}
+
+        results: List[object] = [None] * len(items)
+        waiting = set(range(len(items)))
+        while waiting:
+            now = time.monotonic()
+            next_check = self.poll_interval
+            for index in sorted(waiting):
+                item = items[index]
+                if item.future.done():
+                    results[index] = item.future.result()
+                    waiting.discard(index)
+                    continue
+                if item.started is None or index not in waiting:
+                    continue
+                elapsed = now - item.started
+                label = _label(item.call.function)
+                if elapsed >= item.deadline.soft and not item.status_sent:
+                    item.status_sent = True
+                    with self._lock:
+                        self.soft_deadline_misses += 1
+                    if item.deadline.background and on_result is not None:
+                        self._detach(item, on_result)
+                        with self._lock:
+                            self.background += 1
+                        results[index] = f"{label.capitalize()} is taking a while, I will tell you when it is done."
+                        waiting.discard(index)
+                        continue
+                    if on_status is not None:
+                        on_status(f"Still working on {label}.")
+                if elapsed >= item.deadline.hard:
+                    logging.warning(f"Tool {item.call.function} passed its {item.deadline.hard}s deadline; cancelling")
+                    item.token.set()
+                    with self._lock:
+                        self.timeouts += 1
+                    results[index] = f"Sorry, {label} took too long, so I stopped waiting."
+                    waiting.discard(index)
+                    # Later calls in the same lane would act on a window in an unknown state
+                    for later in groups[lane_of[index]]:
+                        if later > index and later in waiting:
+                            items[later].token.set()
+                            results[later] = f"I skipped {_label(items[later].call.function)}."
+                            waiting.discard(later)
+                    continue
+                upcoming = item.deadline.soft if not item.status_sent else item.deadline.hard
+                next_check = min(next_check, max(0.0, upcoming - elapsed))
+            if waiting:
+                wait([items[i].future for i in waiting], timeout=next_check, return_when=FIRST_COMPLETED)
+
+        wall = time.monotonic() - start
+        durations = [item.finished - item.started for item in items
+                     if item.started is not None and item.finished is not None]
+        with self._lock:
+            self.batches += 1
+            self.calls += len(calls)
+            if len(calls) > 1:
+                self.multi_call_batches += 1
+                self.time_saved += max(0.0, sum(durations) - wall)
+        return results
+
+    def run_merged(self, calls: List[FunctionCall], on_status: Optional[Callable[[str], None]] = None,
+                   on_result: Optional[Callable[[str], None]] = None) -> str:
+        """Runs the calls and joins their non-empty results into one reply."""
+        results = self.run(calls, on_status, on_result)
+        return " ".join(str(result).strip() for result in results if result is not None and str(result).strip())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "multi_call_batches": self.multi_call_batches,
+                "calls": self.calls,
+                "errors": self.errors,
+                "soft_deadline_misses": self.soft_deadline_misses,
+                "timeouts": self.timeouts,
+                "background": self.background,
+                "time_saved_s": round(self.time_saved, 2),
+            }
@@ -0,0 +1,247 @@
+# BRAIN/ai_chat_res/tool_registry.py
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Describes one entry of functions_call.available_functions for the router prompt."""
+    name: str
+    signature: str
+    description: str
+    section: str
+    keywords: str = ""
+    core: bool = False  # always offered to the model, whatever the query
+    tokens: frozenset = field(default=frozenset(), compare=False)  # from name and keywords
+    description_tokens: frozenset = field(default=frozenset(), compare=False)
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = {
+    "a", "an", "the", "of", "to", "for", "and", "or", "in", "on", "my", "me", "is",
+    "it", "this", "that", "with", "use", "no", "args", "str", "query", "none", "please",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stop words removed; underscores split names apart."""
+    return [t for t in _TOKEN_RE.findall(text.lower().replace("_", " "))
+            if t not in _STOP_WORDS and (len(t) > 1 or t.isdigit())]
+
+
+# --- Tool descriptions (stored once, shared by every prompt) ---
+_SPECS = [
+    # General
+    ("chat_with_chatbot", "chat_with_chatbot(query: str) -> str", "Engage in a general conversation with the chatbot. Use for questions, explanations, writing and small talk.", "General", "talk chat explain tell what who why how", True),
+
+    # Search & Information
+    ("perform_google_search", "perform_google_search(query: str)", "Search Google for information and return results directly. Use for general info requests.", "Search & Information", "search google find look up information", True),
+    ("perform_duckduckgo_search", "perform_duckduckgo_search(query: str)", "Search DuckDuckGo for information and return results directly. Alternative to Google search.", "Search & Information", "search duckduckgo ddg find"),
+    ("Real_Time_Search_Engine", "Real_Time_Search_Engine(query: str)", "Provides real-time information or performs searches (news, weather, scores, current events).", "Search & Information", "latest news today current weather live realtime score who won update", True),
+    ("search_google_pywhatkit", "search_google_pywhatkit(query: str)", "**Interactive** Google search. Prompts user via voice for search term and opens browser. Use *only* for \"manual search\", \"interactive search\". `query` arg is ignored.", "Search & Information", "manual interactive browser search"),
+    ("get_stock_price_info", "get_stock_price_info(query: str)", "Get current stock price for a symbol.", "Search & Information", "stock share price market nse bse ticker"),
+    ("get_watchlist_prices_info", "get_watchlist_prices_info(query: str)", "Get current prices of several stocks at once (a watchlist or comparison).", "Search & Information", "stocks shares prices watchlist portfolio compare several multiple"),
+    ("get_stock_chart", "get_stock_chart(query: str)", "Display a stock chart for a symbol.", "Search & Information", "stock share chart graph candlestick plot"),
+
+    # File Reading
+    ("presentation_read", "presentation_read()", "Reads content from a PowerPoint presentation. Call for \"read ppt\", \"read presentation\". No arguments needed in the JSON `query`.", "File Reading", "read ppt powerpoint slides presentation file"),
+    ("pdf_read", "pdf_read()", "Reads content from a PDF file. Call for \"read PDF\", \"read pdf file\". No arguments needed in the JSON `query`.", "File Reading", "read pdf document file"),
+    ("ms_word", "ms_word()", "Reads content from a Word document. Call for \"read doc\", \"read word file\". No arguments needed in the JSON `query`.", "File Reading", "read doc docx word document file"),
+
+    # Application & Website Control
+    ("open_website", "open_website(query: str)", "Open a website URL or common name (e.g., \"google.com\", \"youtube\").", "Application & Website Control", "open website site url browser launch visit go"),
+    ("open_application", "open_application(query: str)", "Open a local application (e.g., \"Notepad\", \"Chrome\").", "Application & Website Control", "open launch start run app application program"),
+    ("close_application", "close_application(query: str)", "Close/terminate a running application (e.g., \"close Notepad\"). Use with caution.", "Application & Website Control", "close quit kill exit terminate app application program"),
+    ("close_current_tab", "close_current_tab()", "Close the currently active tab or window (browser, explorer). No args.", "Application & Website Control", "close tab window current"),
+
+    # System Status & Advice
+    ("get_battery_status", "get_battery_status()", "Check computer's battery level and charging status. No args.", "System Status & Advice", "battery level status percentage charging laptop computer power"),
+    ("get_battery_advice", "get_battery_advice()", "Provide advice based on computer's battery level. No args.", "System Status & Advice", "battery advice charge charger should laptop"),
+    ("check_pen_drive_status", "check_pen_drive_status()", "Check if a USB/pen/flash drive is connected. No args.", "System Status & Advice", "pen drive usb flash connected plugged"),
+
+    # Image Generation
+    ("generate_image", "generate_image(prompt: str)", "Generate an image from a text description. Use for \"generate image of...\", \"create picture...\".", "Image Generation", "generate create draw make image picture photo art"),
+
+    # Android Device Control (ADB)
+    ("initiate_adb_call", "initiate_adb_call(contact_query: str, sim_slot_choice: str = None)", "Call contact/number via connected phone. `sim_slot_choice` can be '1' or '2'.", "Android Device Control (ADB)", "call dial phone ring contact number sim mobile adb"),
+    ("end_adb_call", "end_adb_call()", "End the current phone call. No args.", "Android Device Control (ADB)", "end hang up cut disconnect call phone"),
+    ("toggle_adb_speaker", "toggle_adb_speaker(speaker_on_str: str = None)", "Toggle phone speakerphone. Pass \"true\" for ON, \"false\" for OFF.", "Android Device Control (ADB)", "speaker speakerphone loudspeaker phone call"),
+    ("take_adb_screenshot", "take_adb_screenshot()", "Take screenshot on connected phone. No args.", "Android Device Control (ADB)", "screenshot capture screen phone mobile"),
+    ("get_adb_battery_percentage", "get_adb_battery_percentage()", "Check connected phone's battery level. No args.", "Android Device Control (ADB)", "phone mobile battery level percentage"),
+
+    # Video Player Control
+    ("video_volume_up", "video_volume_up()", "Increase video volume.", "Video Player Control", "volume up louder increase sound"),
+    ("video_volume_down", "video_volume_down()", "Decrease video volume.", "Video Player Control", "volume down quieter decrease lower sound"),
+    ("video_mute", "video_mute()", "Mute the video.", "Video Player Control", "mute silence sound volume"),
+    ("video_unmute", "video_unmute()", "Unmute the video.", "Video Player Control", "unmute sound volume"),
+    ("video_seek_forward", "video_seek_forward()", "Seek forward a small amount (arrow key).", "Video Player Control", "seek skip forward ahead"),
+    ("video_seek_backward", "video_seek_backward()", "Seek backward a small amount (arrow key).", "Video Player Control", "seek skip backward rewind back"),
+    ("video_seek_forward_10s", "video_seek_forward_10s()", "Seek forward 10 seconds (L key).", "Video Player Control", "seek skip forward 10 ten seconds"),
+    ("video_seek_backward_10s", "video_seek_backward_10s()", "Seek backward 10 seconds (J key).", "Video Player Control", "seek rewind backward back 10 ten seconds"),
+    ("video_seek_forward_frame", "video_seek_forward_frame()", "Step forward one frame.", "Video Player Control", "frame next step forward"),
+    ("video_seek_backward_frame", "video_seek_backward_frame()", "Step backward one frame.", "Video Player Control", "frame previous step backward"),
+    ("video_seek_to_beginning", "video_seek_to_beginning()", "Jump to the start of the video (Home key).", "Video Player Control", "beginning start restart video"),
+    ("video_seek_to_end", "video_seek_to_end()", "Jump to the end of the video (End key).", "Video Player Control", "end finish video"),
+    ("video_next_chapter", "video_next_chapter()", "Go to the next chapter.", "Video Player Control", "next chapter"),
+    ("video_previous_chapter", "video_previous_chapter()", "Go to the previous chapter.", "Video Player Control", "previous chapter"),
+    ("video_next_video", "video_next_video()", "Go to next video in playlist (N key).", "Video Player Control", "next video playlist song"),
+    ("video_previous_video", "video_previous_video()", "Go to previous video in playlist (P key).", "Video Player Control", "previous video playlist song"),
+    ("video_increase_speed", "video_increase_speed()", "Increase playback speed (] key).", "Video Player Control", "speed faster playback increase"),
+    ("video_decrease_speed", "video_decrease_speed()", "Decrease playback speed ([ key).", "Video Player Control", "speed slower playback decrease"),
+    ("video_toggle_subtitles", "video_toggle_subtitles()", "Toggle captions (C key).", "Video Player Control", "subtitles captions cc"),
+    ("video_increase_font_size", "video_increase_font_size()", "Increase subtitle size (+ key).", "Video Player Control", "subtitle caption font size bigger increase"),
+    ("video_decrease_font_size", "video_decrease_font_size()", "Decrease subtitle size (- key).", "Video Player Control", "subtitle caption font size smaller decrease"),
+    ("video_rotate_text_opacity", "video_rotate_text_opacity()", "Change subtitle text opacity (O key).", "Video Player Control", "subtitle text opacity"),
+    ("video_rotate_window_opacity", "video_rotate_window_opacity()", "Change subtitle window opacity (W key).", "Video Player Control", "subtitle window opacity"),
+
+    # Browser Control
+    ("browser_open_new_tab", "browser_open_new_tab()", "Open a new browser tab.", "Browser Control", "new tab browser open"),
+    ("browser_open_menu", "browser_open_menu()", "Open browser settings/menu.", "Browser Control", "browser menu settings"),
+    ("browser_zoom_in_page", "browser_zoom_in_page()", "Zoom in on current page content.", "Browser Control", "zoom in page bigger browser"),
+    ("browser_zoom_out_page", "browser_zoom_out_page()", "Zoom out on current page content.", "Browser Control", "zoom out page smaller browser"),
+    ("browser_refresh_page", "browser_refresh_page()", "Reload current page.", "Browser Control", "refresh reload page"),
+    ("browser_switch_next_tab", "browser_switch_next_tab()", "Switch to the next tab.", "Browser Control", "next tab switch"),
+    ("browser_switch_previous_tab", "browser_switch_previous_tab()", "Switch to the previous tab.", "Browser Control", "previous tab switch last"),
+    ("browser_open_history", "browser_open_history()", "Show browser history.", "Browser Control", "history browser"),
+    ("browser_open_bookmarks", "browser_open_bookmarks()", "Show bookmarks.", "Browser Control", "bookmarks favourites browser"),
+    ("browser_go_back", "browser_go_back()", "Navigate back in page history.", "Browser Control", "back previous page browser"),
+    ("browser_go_forward", "browser_go_forward()", "Navigate forward in page history.", "Browser Control", "forward next page browser"),
+    ("browser_open_dev_tools", "browser_open_dev_tools()", "Open developer tools.", "Browser Control", "developer dev tools inspect console"),
+    ("browser_toggle_fullscreen_window", "browser_toggle_fullscreen_window()", "Toggle fullscreen for the browser window.", "Browser Control", "fullscreen full screen browser window"),
+    ("browser_open_private_window", "browser_open_private_window()", "Open new incognito/private window.", "Browser Control", "incognito private window"),
+
+    # YouTube Specific Control
+    ("youtube_pan_up", "youtube_pan_up()", "Pan up in 360/VR videos (W key).", "YouTube Specific Control", "youtube pan up 360 vr"),
+    ("youtube_pan_down", "youtube_pan_down()", "Pan down in 360/VR videos (S key).", "YouTube Specific Control", "youtube pan down 360 vr"),
+    ("youtube_pan_left", "youtube_pan_left()", "Pan left in 360/VR videos (A key).", "YouTube Specific Control", "youtube pan left 360 vr"),
+    ("youtube_pan_right", "youtube_pan_right()", "Pan right in 360/VR videos (D key).", "YouTube Specific Control", "youtube pan right 360 vr"),
+    ("youtube_zoom_in", "youtube_zoom_in()", "Zoom in in 360/VR videos.", "YouTube Specific Control", "youtube zoom in 360 vr"),
+    ("youtube_zoom_out", "youtube_zoom_out()", "Zoom out in 360/VR videos.", "YouTube Specific Control", "youtube zoom out 360 vr"),
+    ("youtube_go_to_search", "youtube_go_to_search()", "Activate YouTube search box (/).", "YouTube Specific Control", "youtube search box"),
+    ("youtube_toggle_play_pause", "youtube_toggle_play_pause()", "Play/pause video (K/Space).", "YouTube Specific Control", "youtube play pause resume stop video"),
+    ("youtube_toggle_mute", "youtube_toggle_mute()", "Mute/unmute video (M).", "YouTube Specific Control", "youtube mute unmute"),
+    ("youtube_toggle_fullscreen", "youtube_toggle_fullscreen()", "Toggle video fullscreen (F).", "YouTube Specific Control", "youtube fullscreen full screen video"),
+    ("youtube_toggle_theater_mode", "youtube_toggle_theater_mode()", "Toggle theater mode (T).", "YouTube Specific Control", "youtube theater theatre mode"),
+    ("youtube_toggle_miniplayer", "youtube_toggle_miniplayer()", "Toggle miniplayer (I).", "YouTube Specific Control", "youtube miniplayer mini player"),
+    ("youtube_exit_fullscreen", "youtube_exit_fullscreen()", "Exit fullscreen/miniplayer (Esc).", "YouTube Specific Control", "youtube exit fullscreen miniplayer escape"),
+    ("youtube_toggle_party_mode", "youtube_toggle_party_mode()", "Toggle 'awesome' Easter egg.", "YouTube Specific Control", "youtube party mode awesome easter egg"),
+]
+
+SECTION_ORDER = [
+    "General", "Search & Information", "File Reading", "Application & Website Control",
+    "System Status & Advice", "Image Generation", "Android Device Control (ADB)",
+    "Video Player Control", "Browser Control", "YouTube Specific Control",
+]
+
+
+class ToolRegistry:
+    """
+    Holds every tool's description once and picks the ones relevant to a query.
+
+    Relevance is a BM25-style keyword score over each tool's name and keywords, with
+    terms that only appear in the description counted at half weight (descriptions
+    mention other actions, e.g. "Call for 'read ppt'"). IDF weights are computed once
+    when the registry is built.
+    """
+
+    def __init__(self, specs=_SPECS) -> None:
+        self.tools: Dict[str, ToolSpec] = {}
+        for name, signature, description, section, keywords, *core in specs:
+            tokens = frozenset(tokenize(f"{name} {keywords}"))
+            description_tokens = frozenset(tokenize(description)) - tokens
+            self.tools[name] = ToolSpec(name, signature, description, section, keywords,
+                                        bool(core and core[0]), tokens, description_tokens)
+
+        document_frequency: Dict[str, int] = {}
+        for tool in self.tools.values():
+            for token in tool.tokens | tool.description_tokens:
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+        total = len(self.tools)
+        self._idf = {token: math.log(1 + (total - df + 0.5) / (df + 0.5))
+                     for token, df in document_frequency.items()}
+        self._avg_len = sum(len(t.tokens) for t in self.tools.values()) / max(total, 1)
+
+    def core_tools(self) -> List[ToolSpec]:
+        return [tool for tool in self.tools.values() if tool.core]
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Returns a relevance score for every tool that shares a term with the query."""
+        query_tokens = set(tokenize(query))
+        scores = {}
+        k1, b = 1.2, 0.75
+        for tool in self.tools.values():
+            matched = query_tokens & tool.tokens
+            matched_description = query_tokens & tool.description_tokens
+            if not matched and not matched_description:
+                continue
+            # Each term occurs at most once per tool, so BM25 reduces to a length-normalized IDF sum
+            norm = (k1 + 1) / (1 + k1 * (1 - b + b * len(tool.tokens) / self._avg_len))
+            weight = sum(self._idf[t] for t in matched) + 0.5 * sum(self._idf[t] for t in matched_description)
+            scores[tool.name] = weight * norm
+        return scores
+
+    def select(self, query: str, top_k: int = 8) -> List[ToolSpec]:
+        """
+        Picks the tools to offer the model for this query.
+
+        Args:
+            query (str): The user's utterance.
+            top_k (int): How many query-relevant tools to add on top of the core set.
+
+        Returns:
+            List[ToolSpec]: Core tools plus the top_k best-scoring tools, in registry order.
+        """
+        scores = self.score(query)
+        ranked = sorted(scores, key=scores.get, reverse=True)[:top_k]
+        chosen = {tool.name for tool in self.core_tools()} | set(ranked)
+        return [tool for tool in self.tools.values() if tool.name in chosen]
+
+    def describe(self, tools: Optional[List[ToolSpec]] = None) -> str:
+        """Formats tools as the numbered, sectioned list used in the router prompt."""
+        tools = list(self.tools.values()) if tools is None else tools
+        lines = []
+        number = 1
+        for section in SECTION_ORDER:
+            section_tools = [tool for tool in tools if tool.section == section]
+            if not section_tools:
+                continue
+            lines.append(f"    **{section}:**")
+            for tool in section_tools:
+                lines.append(f"    {number}. `{tool.signature}`: {tool.description}")
+                number += 1
+            lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def schema(tool: ToolSpec) -> dict:
+        """
+        The chat API tool definition (JSON schema) of a tool. Every function in
+        available_functions is called with one string, so its first parameter becomes a
+        "query" string, required unless the signature gives it a default.
+        """
+        parameters = {"type": "object", "properties": {}}
+        params = tool.signature[tool.signature.find("(") + 1:tool.signature.rfind(")")].strip()
+        if params:
+            first, *rest = [param.strip() for param in params.split(",")]
+            name = first.split(":")[0].split("=")[0].strip()
+            description = f"The {name.replace('_', ' ')}"
+            if rest:
+                description += f" (optionally followed by {', '.join(r.split(':')[0].strip() for r in rest)})"
+            parameters["properties"]["query"] = {"type": "string", "description": description}
+            if "=" not in first:
+                parameters["required"] = ["query"]
+        return {
+            "type": "function",
+            "function": {"name": tool.name, "description": tool.description, "parameters": parameters},
+        }
+
+    def schemas(self, tools: Optional[List[ToolSpec]] = None) -> List[dict]:
+        """Tool definitions for the chat API's native tool calling, in registry order."""
+        tools = list(self.tools.values()) if tools is None else tools
+        return [self.schema(tool) for tool in tools]
+
+
+# Shared registry used by system_prompts.py
+tool_registry = ToolRegistry()
@@ -0,0 +1,226 @@
+# BRAIN/ai_chat_res/web_search.py
+"""
+Concurrent multi-source web search for the realtime answers.
+
+Every source (Google, DuckDuckGo) is queried at the same time on a shared worker pool,
+and the search returns whatever has arrived when the shared deadline passes, so its
+latency is that of the slowest source that made it in time, not the sum of all of them.
+Results are deduplicated by canonical URL and merged into one ranked list with
+reciprocal rank fusion: a page that several sources rank highly comes first.
+
+    results = web_search.search("who won the match today")
+    prompt_text = format_results("who won the match today", results)
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from BRAIN.ai_chat_res.search_cache import search_cache
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "ref", "ref_src", "igshid", "mc_cid", "mc_eid", "_ga"}
+
+
+@dataclass
+class SearchResult:
+    url: str
+    title: str = ""
+    snippet: str = ""
+    source: str = ""      # the source that returned it first
+    rank: int = 0         # position in that source's list (0 = top)
+    sources: List[str] = field(default_factory=list)  # every source that returned it
+    score: float = 0.0    # fused rank score after merging
+
+
+def canonical_url(url: str) -> str:
+    """
+    Key that is equal for the same page reached through different links: lowercase host
+    without "www."/"m.", no scheme difference, no fragment, no tracking parameters, no
+    trailing slash and sorted query parameters.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS)
+    path = parts.path.rstrip("/") or ""
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+# --- Sources: query -> ranked results. Their libraries are imported on first use. ---
+def fetch_google_results(query: str, max_results: int = 10, timeout: float = 5.0) -> List[SearchResult]:
+    from googlesearch import search
+
+    results = []
+    for item in search(query, num_results=max_results, advanced=True, timeout=timeout):
+        if item.url.startswith("http"):
+            results.append(SearchResult(item.url, item.title or "", item.description or "", "google", len(results)))
+    return results
+
+
+def fetch_ddg_results(query: str, max_results: int = 10, timeout: float = 5.0) -> List[SearchResult]:
+    from duckduckgo_search import DDGS
+
+    results = []
+    with DDGS(timeout=int(max(1, timeout))) as ddgs:
+        for item in ddgs.text(query, max_results=max_results):
+            url = item.get("href") or item.get("link") or ""
+            if url:
+                results.append(SearchResult(url, item.get("title") or "", item.get("body") or "", "ddg", len(results)))
+    return results
+
+
+def cached_source(name: str, fetch: Callable[..., List[SearchResult]]) -> Callable[..., List[SearchResult]]:
+    """The source `fetch`, answered from search_cache while its results are fresh."""
+    def results(query: str, max_results: int = 10, timeout: float = 5.0) -> List[SearchResult]:
+        cached = search_cache.get_or_search(
+            name, query, max_results,
+            lambda: [asdict(result) for result in fetch(query, max_results=max_results, timeout=timeout)])
+        return [SearchResult(**item) for item in cached]
+
+    results.__name__ = f"{name}_results"
+    return results
+
+
+google_results = cached_source("google", fetch_google_results)
+ddg_results = cached_source("ddg", fetch_ddg_results)
+
+SEARCH_SOURCES: Dict[str, Callable[..., List[SearchResult]]] = {
+    "google": google_results,
+    "ddg": ddg_results,
+}
+
+
+def merge_results(result_lists: List[List[SearchResult]], k: int = 60) -> List[SearchResult]:
+    """
+    Deduplicates by canonical URL and ranks by reciprocal rank fusion (sum of 1 / (k + rank)
+    over the sources that returned the page). The longest title and snippet seen are kept.
+    """
+    merged: Dict[str, SearchResult] = {}
+    for results in result_lists:
+        for result in results:
+            key = canonical_url(result.url)
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = SearchResult(result.url, result.title, result.snippet,
+                                                   result.source, result.rank)
+            else:
+                if len(result.title) > len(entry.title):
+                    entry.title = result.title
+                if len(result.snippet) > len(entry.snippet):
+                    entry.snippet = result.snippet
+            if result.source not in entry.sources:
+                entry.sources.append(result.source)
+                entry.score += 1.0 / (k + result.rank)
+    return sorted(merged.values(), key=lambda entry: (-entry.score, entry.rank))
+
+
+def format_results(query: str, results: List[SearchResult], max_results: int = 10) -> str:
+    """The search results as prompt text, in the [start] ... [end] format the prompts expect."""
+    lines = [f"The search results for '{query}' are:", "[start]"]
+    if not results:
+        lines.append("No results found.")
+    for number, result in enumerate(results[:max_results], 1):
+        lines.append(f"{number}. {result.title or result.url}")
+        lines.append(f"URL: {result.url}")
+        if result.snippet:
+            lines.append(result.snippet)
+        lines.append("")
+    lines.append("[end]")
+    return "\n".join(lines)
+
+
+@dataclass
+class _SourceStats:
+    calls: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            return round(latencies[int(q * (len(latencies) - 1))] * 1000) if latencies else None
+
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "timeout_rate": round(self.timeouts / self.calls, 3) if self.calls else None,
+            "errors": self.errors,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+        }
+
+
+class MultiSearch:
+    """Fans a query out to every source at once and merges what arrives before the deadline."""
+
+    def __init__(self, sources: Optional[Dict[str, Callable[..., List[SearchResult]]]] = None,
+                 deadline: float = 4.0, max_workers: int = 8) -> None:
+        """
+        Args:
+            sources (dict): Name -> function(query, max_results, timeout) returning ranked results.
+            deadline (float): Seconds to wait for the sources, shared by all of them.
+            max_workers (int): Source requests that may run at the same time.
+        """
+        self.sources = dict(SEARCH_SOURCES if sources is None else sources)
+        self.deadline = deadline
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _SourceStats] = {}
+
+    def _run_source(self, name: str, query: str, max_results: int, timeout: float) -> List[SearchResult]:
+        start = time.perf_counter()
+        try:
+            return self.sources[name](query, max_results=max_results, timeout=timeout)
+        except Exception as e:
+            logging.warning(f"Search source {name} failed: {e}")
+            with self._lock:
+                self._stats[name].errors += 1
+            return []
+        finally:
+            with self._lock:
+                latencies = self._stats[name].latencies
+                latencies.append(time.perf_counter() - start)
+                del latencies[:-500]
+
+    def search(self, query: str, max_results: int = 10, deadline: Optional[float] = None) -> List[SearchResult]:
+        """
+        Queries every source concurrently and returns the merged, ranked results of the
+        sources that answered within the deadline (seconds, default self.deadline).
+        """
+        deadline = self.deadline if deadline is None else deadline
+        with self._lock:
+            for name in self.sources:
+                self._stats.setdefault(name, _SourceStats()).calls += 1
+        futures = {self._pool.submit(self._run_source, name, query, max_results, deadline): name
+                   for name in self.sources}
+        done, not_done = wait(futures, timeout=deadline)
+        if not_done:
+            late = sorted(futures[future] for future in not_done)
+            logging.info(f"Search deadline ({deadline}s) passed without {', '.join(late)}")
+            with self._lock:
+                for name in late:
+                    self._stats[name].timeouts += 1
+        # Keep the source order stable, so equal scores are broken the same way every time
+        ordered = [future.result() for future in futures if future in done]
+        return merge_results(ordered)
+
+    def stats(self) -> dict:
+        """Calls, timeout rate, errors and latency percentiles per source."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+
+# Shared search used by RealtimeSearchEngine_groq.py
+web_search = MultiSearch()
@@ -39,20 +39,26 @@ labels = [
 
 # Encode labels (convert text labels to numbers)
 label_encoder = LabelEncoder()
-y = label_encoder.fit_transform(labels)
 
 # Create a pipeline: TF-IDF vectorizer + Linear SVM classifier
 model = Pipeline([
     ('tfidf', TfidfVectorizer()),
     ('clf', LinearSVC())
 ])
+_model_trained = False
 
-# Train the model
-model.fit(queries, y)
+# Train the model on first use rather than at import time
+def train_model():
+    global _model_trained
+    if not _model_trained:
+        y = label_encoder.fit_transform(labels)
+        model.fit(queries, y)
+        _model_trained = True
+    return model
 
 # Function to predict query type
 def predict_query_type(query):
-    predicted_label = model.predict([query])[0]
+    predicted_label = train_model().predict([query])[0]
     query_type = label_encoder.inverse_transform([predicted_label])[0]
     return query_type
 
@@ -88,7 +94,7 @@ def interactive_input_loop():
             continue
         
         # Predict
-        predicted_label = model.predict([query])[0]
+        predicted_label = train_model().predict([query])[0]
         query_type = label_encoder.inverse_transform([predicted_label])[0]
         
         # Generate response
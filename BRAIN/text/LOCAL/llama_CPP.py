@@ -1,5 +1,9 @@
 from typing import Optional
 import os
+import logging
+import threading
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv; load_dotenv()
 
 from webscout.Local.samplers import SamplerSettings as WebscoutSamplerSettings
@@ -86,6 +90,148 @@ class GGUFChatbot:
         self.conversation_thread.interact(header="🌟 Welcome to the Jarvis-3B Prototype by Sree and OEvortex 🚀", color=True)
         # response = thread.send("Initiate system startup")
 
+class ResidentGGUF:
+    """
+    Local GGUF model that stays loaded for the lifetime of the process.
+
+    The model is loaded once on a background thread (memory-mapped, so its weights are
+    paged in from the file instead of copied). The first system message is the fixed
+    system prompt: its evaluated KV state is saved, and restored before a request with
+    the same system prompt, so a turn only evaluates the new tokens. Later system
+    messages (time, search results, summaries) change every turn and are evaluated with
+    the conversation instead. stream() has the same shape as the cloud stream functions
+    in model_cascade.py.
+    """
+
+    def __init__(self,
+                 model_repo_id: str = "MaziyarPanahi/Mistral-7B-Instruct-v0.3-GGUF",
+                 model_filename: str = "Mistral-7B-Instruct-v0.3.Q8_0.gguf",
+                 hf_token: str = os.environ.get("HUGGING_FACE_WRITE"),
+                 n_gpu_layers: int = 20,
+                 n_ctx: int = 4096,
+                 chat_format: dict = None,
+                 max_cached_prompts: int = 3) -> None:
+        self.model_repo_id = model_repo_id
+        self.model_filename = model_filename
+        self.hf_token = hf_token
+        self.n_gpu_layers = n_gpu_layers
+        self.n_ctx = n_ctx
+        self.chat_format = chat_format or formats.mistral_instruct.copy()
+        self.max_cached_prompts = max_cached_prompts
+        self.llama = None
+        self.load_error: Optional[Exception] = None
+        self._ready = threading.Event()
+        self._load_thread: Optional[threading.Thread] = None
+        self._generate_lock = threading.Lock()
+        self._prefix_states = OrderedDict()  # system prompt -> (prefix tokens, saved KV state)
+        self._primed_prompt: Optional[str] = None  # system prompt at the front of the KV cache
+
+    def start(self) -> threading.Thread:
+        """Starts loading the model in the background (only once)."""
+        if self._load_thread is None:
+            self._load_thread = threading.Thread(target=self._load, name="local-llm-load", daemon=True)
+            self._load_thread.start()
+        return self._load_thread
+
+    def _load(self) -> None:
+        start = time.perf_counter()
+        try:
+            from llama_cpp import Llama  # the engine behind webscout.Local
+            model_path = download_model(self.model_repo_id, self.model_filename, self.hf_token)
+            self.llama = Llama(model_path=model_path, n_ctx=self.n_ctx, n_gpu_layers=self.n_gpu_layers,
+                               use_mmap=True, verbose=False)
+            logging.info(f"Local model {self.model_filename} loaded in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            self.load_error = e
+            logging.error(f"Could not load local model {self.model_filename}: {e}")
+        finally:
+            self._ready.set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Starts loading if needed and waits for it; True if the model is usable."""
+        self.start()
+        self._ready.wait(timeout)
+        return self.llama is not None
+
+    def _system_prefix(self, system_prompt: str) -> str:
+        fmt = self.chat_format
+        return f"{fmt.get('system_prefix', '')}{system_prompt}{fmt.get('system_suffix', '')}"
+
+    def _context(self, system_messages) -> str:
+        """Per-turn system messages, placed before the conversation."""
+        return "".join(self._system_prefix(message["content"]) for message in system_messages)
+
+    def _conversation(self, messages) -> str:
+        fmt = self.chat_format
+        text = ""
+        for message in messages:
+            if message["role"] == "user":
+                text += f"{fmt.get('user_prefix', '')}{message['content']}{fmt.get('user_suffix', '')}"
+            elif message["role"] == "assistant":
+                text += f"{fmt.get('bot_prefix', '')}{message['content']}{fmt.get('bot_suffix', '')}"
+        return text + fmt.get("bot_prefix", "")
+
+    def _prime(self, system_prompt: str) -> list:
+        """
+        Makes the KV cache start with the evaluated system prompt and returns its tokens.
+        Called with the generate lock held.
+        """
+        cached = self._prefix_states.get(system_prompt)
+        if cached is None:
+            prefix_tokens = self.llama.tokenize(self._system_prefix(system_prompt).encode("utf-8"),
+                                                add_bos=True, special=True)
+            self.llama.reset()
+            self.llama.eval(prefix_tokens)
+            cached = (prefix_tokens, self.llama.save_state())
+            self._prefix_states[system_prompt] = cached
+            while len(self._prefix_states) > self.max_cached_prompts:
+                self._prefix_states.popitem(last=False)
+        else:
+            self._prefix_states.move_to_end(system_prompt)
+            if self._primed_prompt != system_prompt:
+                # Another system prompt was used last; restore this one's KV state
+                self.llama.load_state(cached[1])
+        self._primed_prompt = system_prompt
+        return cached[0]
+
+    def stream(self, messages, max_tokens: int = 1024, temperature: float = 0.7, top_p: float = 0.9, **_):
+        """Yields the answer to `messages` (OpenAI-style dicts) as text deltas."""
+        if not self.wait_ready():
+            raise RuntimeError(f"local model unavailable: {self.load_error}")
+        system_messages = [m for m in messages if m["role"] == "system"]
+        system_prompt = system_messages[0]["content"] if system_messages else ""
+        with self._generate_lock:
+            prefix_tokens = self._prime(system_prompt)
+            context_tokens = self.llama.tokenize(self._context(system_messages[1:]).encode("utf-8"),
+                                                 add_bos=False, special=True)
+            conversation_tokens = self.llama.tokenize(self._conversation(messages).encode("utf-8"),
+                                                      add_bos=False, special=True)
+            # Oldest conversation tokens are dropped if the prompt would not leave room for the answer
+            room = self.n_ctx - len(prefix_tokens) - len(context_tokens) - max_tokens
+            if room <= 0:
+                raise RuntimeError("system prompt too long for the local model's context")
+            conversation_tokens = conversation_tokens[-room:]
+            # llama.cpp skips the tokens already in the KV cache (the primed system prompt)
+            prompt_tokens = prefix_tokens + context_tokens + conversation_tokens
+            for chunk in self.llama.create_completion(prompt_tokens, max_tokens=max_tokens,
+                                                      temperature=temperature, top_p=top_p, stream=True,
+                                                      stop=self.chat_format.get("stops") or None):
+                text = chunk["choices"][0]["text"]
+                if text:
+                    yield text
+
+
+_resident_model: Optional[ResidentGGUF] = None
+
+
+def get_resident_model() -> ResidentGGUF:
+    """Returns the process-wide ResidentGGUF (not loaded until start() or the first request)."""
+    global _resident_model
+    if _resident_model is None:
+        _resident_model = ResidentGGUF()
+    return _resident_model
+
+
 if __name__ == "__main__":
     chatbot = GGUFChatbot(system_prompt="Be Helpful", )
     chatbot.interact_with_model()
@@ -1,7 +1,8 @@
 import requests
-import re
 from typing import Optional, Dict, List, Generator
 
+from BRAIN.text.STREAM.sentence_segmenter import SentenceSegmenter
+
 def generate(conversation_history: List[Dict[str, str]], system_prompt: Optional[str] = "Be Helpful and Friendly") -> Generator[str, None, None]:
     """
     Connects with the BasedGPT API to generate a contextually relevant response based on the provided 
@@ -29,22 +30,19 @@ def generate(conversation_history: List[Dict[str, str]], system_prompt: Optional
     request_data = {"messages": conversation_history}
 
     api_response = requests.post(api_endpoint, json=request_data, stream=True)
-    partial_sentence = ""
+    segmenter = SentenceSegmenter()
 
-    for data_chunk in api_response.iter_content(decode_unicode=True, chunk_size=1):
+    # chunk_size=None hands over whatever the socket delivered, not one character at a time
+    for data_chunk in api_response.iter_content(decode_unicode=True, chunk_size=None):
         if isinstance(data_chunk, bytes):
             data_chunk = data_chunk.decode("utf-8")
-        partial_sentence += data_chunk
         print(data_chunk, end="", flush=True)
-        # Enhanced sentence boundary detection accommodating multi-digit numbers
-        sentences = re.split(r'(?<!\b\w\.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s', partial_sentence)
-        for complete_sentence in sentences[:-1]:
-            yield complete_sentence.strip()
-        partial_sentence = sentences[-1] 
+        yield from segmenter.feed(data_chunk)
 
     # Yield any remaining portion of the incomplete sentence
-    if partial_sentence:
-        yield partial_sentence.strip()
+    remainder = segmenter.flush()
+    if remainder:
+        yield remainder
 
 if __name__ == "__main__":
     # Illustrative Example
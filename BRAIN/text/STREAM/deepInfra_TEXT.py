@@ -1,7 +1,9 @@
 import json
 import requests
-from typing import Union, Generator
-import re
+from typing import Optional, Union, Generator
+
+from BRAIN.text.STREAM.sentence_segmenter import SentenceSegmenter
+from BRAIN.text.STREAM.sse import iter_openai_deltas
 
 def generate(conversation_history: list, 
               model: str = 'meta-llama/Meta-Llama-3-70B-Instruct', 
@@ -9,7 +11,7 @@ def generate(conversation_history: list,
               max_tokens: int = 512, 
               temperature: float = 0.7, 
               stream: bool = True, 
-              chunk_size: int = 1) -> Union[Generator[str, None, None], str]:
+              chunk_size: Optional[int] = None) -> Union[Generator[str, None, None], str]:
     """
     Utilizes a variety of large language models (LLMs) to engage in conversational interactions.
     
@@ -20,7 +22,7 @@ def generate(conversation_history: list,
         - max_tokens (int): Optional. The maximum number of tokens to be generated by the LLM. Defaults to 512.
         - temperature (float): Optional. The temperature of the LLM. Defaults to 0.7.
         - stream (bool): Optional. Whether to stream the response from the LLM. Defaults to False.
-        - chunk_size (int): Optional. The size of the chunks to be streamed from the LLM. Defaults to 24.
+        - chunk_size (int): Optional. Bytes per socket read while streaming. Defaults to None (whatever has arrived).
 
     Models:
             - "meta-llama/Meta-Llama-3-70B-Instruct"
@@ -80,26 +82,16 @@ def generate(conversation_history: list,
 
 def _stream_response(api_url, headers, payload, chunk_size):
     """Streams the response from the API and yields sentences."""
-    partial_sentence = ""
+    segmenter = SentenceSegmenter()
     try:
         response = requests.post(api_url, headers=headers, json=payload, stream=True)
-        for value in response.iter_lines(decode_unicode=True, chunk_size=chunk_size):
-            modified_value = re.sub("data:", "", value)
-            if modified_value and "[DONE]" not in modified_value:
-                json_modified_value = json.loads(modified_value)
-                try:
-                    if json_modified_value["choices"][0]["delta"]["content"] != None:
-                        data_chunk = json_modified_value["choices"][0]["delta"]["content"]
-                        partial_sentence += data_chunk
-                        print(data_chunk, end="", flush=True)
-                        sentences = re.split(r'(?<!\b\w\.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s', partial_sentence)
-                        for complete_sentence in sentences[:-1]:
-                            yield complete_sentence.strip()
-                        partial_sentence = sentences[-1] 
-                except: 
-                    continue
-        if partial_sentence:
-            yield partial_sentence.strip()
+        # Raw byte chunks go to the buffered SSE decoder, which splits events and parses their JSON
+        for data_chunk in iter_openai_deltas(response.iter_content(chunk_size=chunk_size)):
+            print(data_chunk, end="", flush=True)
+            yield from segmenter.feed(data_chunk)
+        remainder = segmenter.flush()
+        if remainder:
+            yield remainder
     
     except json.JSONDecodeError: 
         pass
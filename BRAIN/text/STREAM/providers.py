@@ -0,0 +1,370 @@
+# BRAIN/text/STREAM/providers.py
+"""
+One async streaming interface for every LLM backend.
+
+    provider = get_provider("groq")
+    async for chunk in provider.stream(messages, cancel=cancel_event):
+        print(chunk.text, end="")
+    print(provider.last_metrics)
+
+Every provider yields StreamChunk objects, can be cancelled (through an asyncio.Event or
+by cancelling the task) and records StreamMetrics: time to first token, total latency
+and tokens per second. sync_stream() adapts a provider to the plain text generators used
+by model_cascade.py; it runs every provider on one long-lived background event loop, so
+all synchronous callers share a single pooled async HTTP client.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from BRAIN.ai_chat_res.llm_client import env, get_async_http_client
+from BRAIN.text.STREAM.sentence_segmenter import split_sentences_async
+from BRAIN.text.STREAM.sse import DONE, ToolCallAccumulator, aiter_openai_deltas, aiter_sse_data
+
+
+@dataclass
+class StreamChunk:
+    provider: str
+    text: str
+    index: int               # position of the chunk in the answer
+    elapsed: float           # seconds since the request was sent
+    done: bool = False       # the final chunk has empty text and done=True
+    finish_reason: Optional[str] = None  # "stop", "cancelled" or "error" on the final chunk
+
+
+@dataclass
+class StreamMetrics:
+    provider: str
+    ttft: Optional[float] = None          # seconds to the first non-empty chunk
+    total: Optional[float] = None         # seconds until the stream ended
+    chunks: int = 0
+    tokens: int = 0
+    cancelled: bool = False
+    error: Optional[str] = None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if self.ttft is None or self.total is None or self.total <= self.ttft:
+            return None
+        return self.tokens / (self.total - self.ttft)
+
+
+class StreamingProvider:
+    """Base class: subclasses implement _stream() yielding text deltas."""
+
+    name = "provider"
+
+    def __init__(self, history_size: int = 200) -> None:
+        self.metrics: deque = deque(maxlen=history_size)
+
+    @property
+    def last_metrics(self) -> Optional[StreamMetrics]:
+        return self.metrics[-1] if self.metrics else None
+
+    def configured(self) -> bool:
+        """False if required credentials are missing."""
+        return True
+
+    async def _stream(self, messages: List[Dict[str, str]], **params) -> AsyncIterator[str]:
+        raise NotImplementedError
+        yield ""
+
+    async def stream(self, messages: List[Dict[str, str]], cancel: Optional[asyncio.Event] = None,
+                     **params) -> AsyncIterator[StreamChunk]:
+        """
+        Streams the answer as StreamChunks, ending with a chunk whose done=True.
+        Setting `cancel` stops the request at the next chunk; errors are raised after
+        they have been recorded in the metrics.
+        """
+        from BRAIN.ai_chat_res.context_window import count_tokens
+
+        metrics = StreamMetrics(self.name)
+        self.metrics.append(metrics)
+        start = time.perf_counter()
+        parts = []
+        deltas = self._stream(messages, **params)
+        finish_reason = "stop"
+        try:
+            async for delta in deltas:
+                if cancel is not None and cancel.is_set():
+                    finish_reason = "cancelled"
+                    break
+                if not delta:
+                    continue
+                elapsed = time.perf_counter() - start
+                if metrics.ttft is None:
+                    metrics.ttft = elapsed
+                parts.append(delta)
+                metrics.chunks += 1
+                yield StreamChunk(self.name, delta, metrics.chunks - 1, elapsed)
+        except (asyncio.CancelledError, GeneratorExit):
+            # Task cancelled, or the consumer stopped iterating (aclose)
+            finish_reason = "cancelled"
+            raise
+        except Exception as e:
+            finish_reason = "error"
+            metrics.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            await deltas.aclose()
+            metrics.total = time.perf_counter() - start
+            metrics.cancelled = finish_reason == "cancelled"
+            metrics.tokens = count_tokens("".join(parts)) if parts else 0
+        yield StreamChunk(self.name, "", metrics.chunks, metrics.total, done=True, finish_reason=finish_reason)
+
+    async def sentences(self, messages: List[Dict[str, str]], **params) -> AsyncIterator[str]:
+        """Streams the answer as complete sentences (for the TTS chunker)."""
+
+        async def texts():
+            async for chunk in self.stream(messages, **params):
+                if chunk.text:
+                    yield chunk.text
+
+        async for sentence in split_sentences_async(texts()):
+            yield sentence
+
+    async def complete(self, messages: List[Dict[str, str]], **params) -> str:
+        return "".join([chunk.text async for chunk in self.stream(messages, **params)])
+
+    def summary(self) -> dict:
+        """Latency distribution over the recorded requests (milliseconds)."""
+        def percentile(values, q):
+            return round(values[int(q * (len(values) - 1))] * 1000) if values else None
+
+        ttft = sorted(m.ttft for m in self.metrics if m.ttft is not None)
+        total = sorted(m.total for m in self.metrics if m.total is not None and m.error is None)
+        rates = [m.tokens_per_second for m in self.metrics if m.tokens_per_second]
+        return {
+            "requests": len(self.metrics),
+            "errors": sum(1 for m in self.metrics if m.error),
+            "ttft_p50_ms": percentile(ttft, 0.5),
+            "ttft_p95_ms": percentile(ttft, 0.95),
+            "ttft_p99_ms": percentile(ttft, 0.99),
+            "total_p50_ms": percentile(total, 0.5),
+            "total_p95_ms": percentile(total, 0.95),
+            "tokens_per_second": round(sum(rates) / len(rates), 1) if rates else None,
+        }
+
+
+class OpenAICompatibleProvider(StreamingProvider):
+    """Any /chat/completions endpoint that streams server-sent events (Groq, DeepInfra, local servers)."""
+
+    def __init__(self, name: str, base_url: str, model: str, api_key_env: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None, requires_key: bool = True) -> None:
+        """
+        Args:
+            name (str): Provider name used in chunks and metrics.
+            base_url (str): Endpoint root, e.g. "https://api.groq.com/openai/v1".
+            model (str): Model sent with every request.
+            api_key_env (str): .env key holding the API key (read on first use), or None.
+            headers (dict): Extra request headers.
+            requires_key (bool): Whether the endpoint is unusable without an API key.
+        """
+        super().__init__()
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.api_key_env = api_key_env
+        self.headers = dict(headers or {})
+        self.requires_key = requires_key
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return env(self.api_key_env) if self.api_key_env else None
+
+    def configured(self) -> bool:
+        return bool(self.api_key) or not self.requires_key
+
+    async def _stream(self, messages, max_tokens: int = 512, temperature: float = 0.7, top_p: float = 1,
+                      tools: Optional[List[dict]] = None, tool_choice: str = "auto", **_):
+        """
+        With `tools` (JSON schemas), the model may answer with native tool calls; they are
+        yielded after any text as one {"tool_calls": [...]} JSON delta.
+        """
+        headers = {"Accept": "text/event-stream", "Content-Type": "application/json", **self.headers}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        payload = {"model": self.model, "messages": messages, "max_tokens": max_tokens,
+                   "temperature": temperature, "top_p": top_p, "stream": True}
+        if tools:
+            payload["tools"] = tools
+            payload["tool_choice"] = tool_choice
+        client = get_async_http_client()
+        async with client.stream("POST", f"{self.base_url}/chat/completions", headers=headers, json=payload) as response:
+            response.raise_for_status()
+            if not tools:
+                async for delta in aiter_openai_deltas(response.aiter_bytes()):
+                    yield delta
+                return
+            tool_calls = ToolCallAccumulator()
+            async for data in aiter_sse_data(response.aiter_bytes()):
+                if data == DONE:
+                    break
+                delta = tool_calls.feed(data)
+                if delta:
+                    yield delta
+            if tool_calls.calls:
+                yield tool_calls.to_json()
+
+
+class GroqProvider(OpenAICompatibleProvider):
+    def __init__(self, model: str = "llama-3.1-8b-instant") -> None:
+        super().__init__("groq", "https://api.groq.com/openai/v1", model, api_key_env="GroqAPIKey")
+
+
+class DeepInfraProvider(OpenAICompatibleProvider):
+    def __init__(self, model: str = "meta-llama/Meta-Llama-3-70B-Instruct") -> None:
+        # Same web-page access as deepInfra_TEXT.generate (no key needed)
+        super().__init__("deepinfra", "https://api.deepinfra.com/v1/openai", model,
+                         api_key_env="DeepInfraAPIKey", requires_key=False,
+                         headers={"Origin": "https://deepinfra.com", "Referer": "https://deepinfra.com/",
+                                  "X-Deepinfra-Source": "web-page"})
+
+
+class BasedGPTProvider(StreamingProvider):
+    """The BasedGPT chat endpoint (basedGPT.generate), which streams plain text."""
+
+    name = "basedgpt"
+    api_endpoint = "https://www.basedgpt.chat/api/chat"
+
+    async def _stream(self, messages, **_):
+        client = get_async_http_client()
+        async with client.stream("POST", self.api_endpoint, json={"messages": messages}) as response:
+            response.raise_for_status()
+            async for text in response.aiter_text():
+                yield text
+
+
+class CohereProvider(StreamingProvider):
+    """Cohere chat_stream, as used by BRAIN/model2.FirstLayerDMM."""
+
+    name = "cohere"
+
+    def __init__(self, model: str = "command-r-plus") -> None:
+        super().__init__()
+        self.model = model
+        self._client = None
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return env("cohereAPIKey")
+
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    async def _stream(self, messages, temperature: float = 0.7, **_):
+        import cohere
+        if self._client is None:
+            self._client = cohere.AsyncClient(api_key=self.api_key)
+        roles = {"user": "User", "assistant": "Chatbot", "system": "System"}
+        preamble = "\n".join(m["content"] for m in messages if m["role"] == "system") or None
+        conversation = [m for m in messages if m["role"] != "system"]
+        history = [{"role": roles[m["role"]], "message": m["content"]} for m in conversation[:-1]]
+        message = conversation[-1]["content"] if conversation else ""
+        async for event in self._client.chat_stream(model=self.model, message=message, chat_history=history,
+                                                     preamble=preamble, temperature=temperature):
+            if event.event_type == "text-generation":
+                yield event.text
+
+
+class LocalProvider(StreamingProvider):
+    """The resident local GGUF model; its blocking generator runs on a worker thread."""
+
+    name = "local"
+
+    async def _stream(self, messages, **params):
+        from BRAIN.text.LOCAL.llama_CPP import get_resident_model
+
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def worker():
+            try:
+                for delta in get_resident_model().stream(messages, **params):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(deltas.put_nowait, delta)
+                loop.call_soon_threadsafe(deltas.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(deltas.put_nowait, e)
+
+        threading.Thread(target=worker, name="local-provider", daemon=True).start()
+        try:
+            while True:
+                item = await deltas.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the background event loop that synchronous callers run providers on.
+    It lives for the whole process, so its pooled httpx.AsyncClient is reused by every call.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="provider-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def sync_stream(provider: StreamingProvider, messages: List[Dict[str, str]], **params) -> Iterator[str]:
+    """
+    Yields plain text deltas of provider.stream(), which runs on the background event loop.
+    Closing the generator (e.g. a cancelled cascade attempt) cancels the request.
+    """
+    loop = get_event_loop()
+    chunks = provider.stream(messages, **params)
+    try:
+        while True:
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+            if chunk.text:
+                yield chunk.text
+    finally:
+        asyncio.run_coroutine_threadsafe(chunks.aclose(), loop).result()
+
+
+def provider_stream(provider: StreamingProvider) -> Callable[..., Iterator[str]]:
+    """Stream function (messages, **params) -> text deltas, as expected by model_cascade.ModelTier."""
+
+    def stream(messages, **params):
+        return sync_stream(provider, messages, **params)
+
+    stream.provider = provider
+    return stream
+
+
+PROVIDERS = {
+    "groq": GroqProvider,
+    "deepinfra": DeepInfraProvider,
+    "basedgpt": BasedGPTProvider,
+    "cohere": CohereProvider,
+    "local": LocalProvider,
+}
+
+
+def get_provider(name: str, **kwargs) -> StreamingProvider:
+    try:
+        return PROVIDERS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown provider '{name}'. Available: {', '.join(PROVIDERS)}") from None
@@ -0,0 +1,175 @@
+import re
+from typing import AsyncIterator, Iterable, Iterator, List
+
+# Words that end in a full stop without ending the sentence (compared lowercased, without the final ".")
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "sh", "shri", "smt", "km", "kumari",
+    "vs", "etc", "e.g", "i.e", "approx", "dept", "est", "fig", "inc", "ltd", "pvt", "co", "corp",
+    "no", "nos", "vol", "rs", "inr", "mt", "ft", "hrs", "min", "max", "govt", "univ", "ave",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}
+
+# Terminators that need whitespace after them; a full stop may also be an abbreviation or decimal point
+_SOFT_TERMINATORS = ".?!"
+# Devanagari danda and double danda always end a sentence (Hinglish answers use them too)
+_HARD_TERMINATORS = "।॥"
+# Closing quotes and brackets that belong to the sentence they follow
+_CLOSERS = "\"')]}”’»"
+_CANDIDATE = re.compile(r"[.?!।॥\n]")
+# Characters of context kept for the word before a full stop
+_TAIL_SIZE = 16
+# Numbers and amounts ("3.14", "$1,234.50", "₹2.5") that a full stop after them ends
+_NUMBER = re.compile(r"[\d.,$₹%]+")
+
+
+class SentenceSegmenter:
+    """
+    Incrementally splits a stream of text deltas into complete sentences.
+
+    Each delta is scanned once, starting where the previous one ended, and the
+    unfinished sentence is kept as a list of pieces that is only joined when the
+    sentence completes, so feeding an answer costs O(delta) per call whatever the
+    delta size (single characters from a raw HTTP body or whole SSE events).
+
+    A sentence ends at ".", "?" or "!" followed by whitespace (after any closing
+    quotes or brackets), at "।"/"॥", or at a line break. A full stop does not end a
+    sentence after a known abbreviation ("Dr.", "e.g."), an initial ("A. P. J.",
+    "U.S."), a title-case two-letter word ("Mr.", "St.") or a list number ("1. India");
+    decimals ("3.14") never have whitespace after the point, and a full stop after a
+    number ("It is 3.14.") ends the sentence.
+    """
+
+    def __init__(self) -> None:
+        self._parts: List[str] = []   # pieces of the unfinished sentence
+        self._tail = ""               # last characters fed, for the word before a terminator
+        self._pending = False         # text so far ends with a terminator; waiting for whitespace
+
+    def _emit(self, sentences: List[str], last_piece: str) -> None:
+        self._parts.append(last_piece)
+        sentence = "".join(self._parts).strip()
+        self._parts = []
+        if sentence:
+            sentences.append(sentence)
+
+    def _is_abbreviation(self, delta: str, start: int, dot: int) -> bool:
+        """Whether the full stop at delta[dot] belongs to the word before it."""
+        before = delta[max(start, dot - _TAIL_SIZE):dot]
+        if dot - start < _TAIL_SIZE:
+            before = (self._tail + before)[-_TAIL_SIZE:] if start == 0 else before
+        words = before.split()
+        if not words or before[-1].isspace():
+            return False
+        word = words[-1].lstrip("\"'([{“‘«")
+        if not word or word[-1] in _CLOSERS:
+            return False  # "(approx.)." ends the sentence
+        if word.lower() in ABBREVIATIONS or ("." in word and not _NUMBER.fullmatch(word)):
+            return True  # "e.g.", initialisms like "U.S." (but not "The value is 3.14.")
+        if len(word) == 1 and word.isalpha():
+            return True  # Initials: "A. P. J. Abdul Kalam"
+        if len(word) == 2 and word[0].isupper() and word[1].islower() and word.isalpha():
+            return True  # "Mr.", "Dr.", "St."
+        if word.isdigit() and len(word) <= 2:
+            # List numbers ("1. India is ...") start the sentence; "I have 5." ends one
+            return not ("".join(self._parts) + delta[start:dot])[:-len(word)].strip()
+        return False
+
+    def _close_pending(self, delta: str, start: int) -> int:
+        """
+        Continues a terminator left pending at the end of the previous delta. Returns where
+        scanning resumes, -1 if the delta ran out while still pending.
+        """
+        k = start
+        while k < len(delta) and (delta[k] in _SOFT_TERMINATORS or delta[k] in _CLOSERS):
+            k += 1
+        if k == len(delta):
+            return -1
+        self._pending = False
+        return k
+
+    def feed(self, delta: str) -> List[str]:
+        """
+        Adds a delta and returns every sentence it completed.
+
+        Args:
+            delta (str): The next piece of streamed text.
+
+        Returns:
+            List[str]: Complete sentences, in order. Empty if none finished yet.
+        """
+        if not delta:
+            return []
+        sentences: List[str] = []
+        n = len(delta)
+        seg_start = 0  # start of the unfinished sentence within delta
+        pos = 0
+        if self._pending:
+            pos = self._close_pending(delta, 0)
+            if pos == -1:
+                pos = n
+            elif delta[pos].isspace():
+                self._emit(sentences, delta[:pos])
+                seg_start = pos
+        while pos < n:
+            match = _CANDIDATE.search(delta, pos)
+            if match is None:
+                break
+            j = match.start()
+            char = delta[j]
+            if char == "\n":
+                self._emit(sentences, delta[seg_start:j])
+                seg_start = pos = j + 1
+                continue
+            if char in _HARD_TERMINATORS:
+                k = j + 1
+                while k < n and delta[k] in _CLOSERS:
+                    k += 1
+                self._emit(sentences, delta[seg_start:k])
+                seg_start = pos = k
+                continue
+            k = j + 1
+            while k < n and (delta[k] in _SOFT_TERMINATORS or delta[k] in _CLOSERS):
+                k += 1
+            if k < n and not delta[k].isspace():
+                pos = k  # Decimal point, "?!" inside a word, ...
+                continue
+            if char == "." and self._is_abbreviation(delta, seg_start, j):
+                pos = j + 1
+                continue
+            if k == n:
+                self._pending = True
+                break
+            self._emit(sentences, delta[seg_start:k])
+            seg_start = pos = k
+        if seg_start < n:
+            self._parts.append(delta[seg_start:])
+        self._tail = (self._tail + delta[-_TAIL_SIZE:])[-_TAIL_SIZE:]
+        return sentences
+
+    def flush(self) -> str:
+        """Returns whatever is left in the buffer and resets the segmenter."""
+        remainder = "".join(self._parts).strip()
+        self._parts = []
+        self._tail = ""
+        self._pending = False
+        return remainder
+
+
+def split_sentences(deltas: Iterable[str]) -> Iterator[str]:
+    """Turns a stream of text deltas into a stream of complete sentences."""
+    segmenter = SentenceSegmenter()
+    for delta in deltas:
+        yield from segmenter.feed(delta)
+    remainder = segmenter.flush()
+    if remainder:
+        yield remainder
+
+
+async def split_sentences_async(deltas: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Async variant of split_sentences for the streaming providers."""
+    segmenter = SentenceSegmenter()
+    async for delta in deltas:
+        for sentence in segmenter.feed(delta):
+            yield sentence
+    remainder = segmenter.flush()
+    if remainder:
+        yield remainder
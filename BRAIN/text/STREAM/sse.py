@@ -0,0 +1,181 @@
+# BRAIN/text/STREAM/sse.py
+"""
+Buffered decoder for server-sent event streams from OpenAI-compatible endpoints.
+
+Socket reads of any size go into a byte buffer that is split into events with one
+scan per read; only the "data:" payloads are kept, and their JSON is parsed (with
+orjson) only for events that can carry text. There is no per-byte or per-character
+Python work, so large reads cost a handful of C-level calls. A malformed event is
+logged and skipped rather than ending the answer.
+
+    for delta in iter_openai_deltas(response.iter_content(chunk_size=None)):
+        print(delta, end="")
+"""
+import json
+import logging
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # orjson is in requirements.txt; the standard library is only a fallback
+    _loads = json.loads
+
+DONE = b"[DONE]"
+
+
+class SSEDecoder:
+    """Splits a stream of byte chunks into the data payloads of its events."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Adds bytes read from the socket and returns the data of every event they completed.
+        Multi-line data fields are joined with "\\n"; comments and other fields are dropped.
+        """
+        if not chunk:
+            return []
+        # Only the new bytes (and the one before them) can complete an event
+        scan_from = max(len(self._buffer) - 1, 0)
+        self._buffer += chunk
+        if b"\r" in chunk or self._buffer.endswith(b"\r", 0, scan_from + 1):
+            # Normalise CRLF/CR line endings (rare; most servers send LF). A trailing CR may be
+            # the first half of a CRLF split across reads, so it waits for the next chunk.
+            trailing_cr = self._buffer.endswith(b"\r")
+            body = bytes(self._buffer[:-1] if trailing_cr else self._buffer)
+            self._buffer = bytearray(body.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+            if trailing_cr:
+                self._buffer += b"\r"
+            scan_from = 0
+        end = self._buffer.rfind(b"\n\n", scan_from)
+        if end == -1:
+            return []
+        block = bytes(self._buffer[:end])
+        del self._buffer[:end + 2]
+        return [data for data in map(self._event_data, block.split(b"\n\n")) if data is not None]
+
+    @staticmethod
+    def _event_data(event: bytes) -> Optional[bytes]:
+        if event.startswith(b"data:") and b"\n" not in event:
+            # Common case: one data line per event
+            return event[5:].lstrip(b" ")
+        lines = [line[5:].lstrip(b" ") for line in event.split(b"\n") if line.startswith(b"data:")]
+        return b"\n".join(lines) if lines else None
+
+    def flush(self) -> List[bytes]:
+        """Data of a final event that was not followed by a blank line."""
+        remainder = bytes(self._buffer).replace(b"\r", b"").strip()
+        self._buffer.clear()
+        data = self._event_data(remainder) if remainder else None
+        return [data] if data is not None else []
+
+
+def _event(data: bytes) -> Optional[dict]:
+    """The parsed payload, or None for a malformed one (logged and skipped, the stream goes on)."""
+    try:
+        event = _loads(data)
+    except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
+        logging.warning(f"Skipping malformed SSE event ({e}): {data[:200]!r}")
+        return None
+    return event if isinstance(event, dict) else None
+
+
+def _content(data: bytes) -> Optional[str]:
+    """Text delta of one chat.completion.chunk payload, or None."""
+    if b'"content"' not in data:
+        return None  # Role-only, usage and keep-alive events: no need to parse them
+    event = _event(data)
+    if event is None:
+        return None
+    choices = event.get("choices")
+    if not choices:
+        return None
+    delta = choices[0].get("delta") or {}
+    return delta.get("content")
+
+
+class ToolCallAccumulator:
+    """
+    Joins the tool_calls fragments of a streamed chat completion (native tool calling).
+    The function name arrives once per call and its JSON arguments in pieces, keyed by index.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[int, dict] = {}
+
+    def feed(self, data: bytes) -> Optional[str]:
+        """Takes one event's data; returns its text delta, if any."""
+        if b'"tool_calls"' not in data:
+            return _content(data)
+        event = _event(data)
+        if event is None:
+            return None
+        choices = event.get("choices")
+        if not choices:
+            return None
+        delta = choices[0].get("delta") or {}
+        for fragment in delta.get("tool_calls") or []:
+            call = self._calls.setdefault(fragment.get("index", len(self._calls)), {"name": "", "arguments": ""})
+            function = fragment.get("function") or {}
+            if function.get("name"):
+                call["name"] = function["name"]
+            call["arguments"] += function.get("arguments") or ""
+        return delta.get("content")
+
+    @property
+    def calls(self) -> List[dict]:
+        """[{"function": name, "arguments": {...}}] in call order; unparseable arguments stay a string."""
+        calls = []
+        for index in sorted(self._calls):
+            call = self._calls[index]
+            try:
+                arguments = json.loads(call["arguments"]) if call["arguments"].strip() else {}
+            except json.JSONDecodeError:
+                arguments = call["arguments"]
+            calls.append({"function": call["name"], "arguments": arguments})
+        return calls
+
+    def to_json(self) -> str:
+        """The calls as text, {"tool_calls": [...]}, for callers that only pass text along."""
+        return json.dumps({"tool_calls": self.calls}, ensure_ascii=False)
+
+
+def iter_sse_data(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Yields the data payload of every event in a stream of byte chunks."""
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+
+def iter_openai_deltas(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Yields the text deltas of an OpenAI-style chat completion stream, up to [DONE]."""
+    for data in iter_sse_data(chunks):
+        if data == DONE:
+            return
+        content = _content(data)
+        if content:
+            yield content
+
+
+async def aiter_sse_data(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Async variant of iter_sse_data, e.g. over httpx's response.aiter_bytes()."""
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for data in decoder.feed(chunk):
+            yield data
+    for data in decoder.flush():
+        yield data
+
+
+async def aiter_openai_deltas(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Async variant of iter_openai_deltas."""
+    async for data in aiter_sse_data(chunks):
+        if data == DONE:
+            return
+        content = _content(data)
+        if content:
+            yield content
@@ -2,7 +2,6 @@
 import subprocess
 import threading
 
-from pyautogui import KEYBOARD_KEYS
 # from torch import P
 # from torch import T
 import pygame
@@ -0,0 +1,63 @@
+# ENGINE/TTS/stream_speaker.py
+import queue
+import threading
+import logging
+from typing import Callable, Iterable, Optional
+
+from BRAIN.text.STREAM.sentence_segmenter import SentenceSegmenter
+
+
+def speak_stream(chunks: Iterable[str],
+                 speak: Callable[[str], None],
+                 on_text: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Speaks a streamed answer sentence by sentence while it is still being generated.
+
+    The chunks are consumed on the calling thread and cut into sentences; a
+    speaker thread plays each finished sentence with the active TTS engine, so
+    the first sentence is heard while the rest of the answer is still arriving.
+
+    Args:
+        chunks (Iterable[str]): Text deltas, e.g. from a streaming LLM completion.
+        speak (Callable[[str], None]): The active TTS engine's speak function.
+        on_text (Callable[[str], None], optional): Called with every delta as it
+            arrives (used to echo the answer to the console/UI).
+
+    Returns:
+        str: The complete answer text.
+    """
+    sentence_queue = queue.Queue()
+
+    def speaker():
+        while True:
+            sentence = sentence_queue.get()
+            if sentence is None:
+                break
+            try:
+                speak(sentence)
+            except Exception as e:
+                logging.error(f"TTS failed while speaking streamed sentence: {e}")
+
+    speaker_thread = threading.Thread(target=speaker, daemon=True)
+    speaker_thread.start()
+
+    segmenter = SentenceSegmenter()
+    answer_parts = []
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            answer_parts.append(chunk)
+            if on_text:
+                on_text(chunk)
+            for sentence in segmenter.feed(chunk):
+                sentence_queue.put(sentence)
+        remainder = segmenter.flush()
+        if remainder:
+            sentence_queue.put(remainder)
+    finally:
+        # Always release the speaker thread, even if the stream broke midway.
+        sentence_queue.put(None)
+        speaker_thread.join()
+
+    return "".join(answer_parts)
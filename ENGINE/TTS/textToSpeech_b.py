@@ -15,13 +15,21 @@ chrome_options.add_argument('--headless')
 chrome_options.add_argument('--log-level=3')
 chrome_options.add_argument('--disable-blink-features=AutomationControlled')
 
-chrome_service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
-driver.get("https://tts.5e7en.me/")
-# driver.get("https://ttsmp3.com/")
+# Chrome is started by the first speak() call, not at import time
+driver = None
+
+def get_driver():
+    global driver
+    if driver is None:
+        chrome_service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
+        driver.get("https://tts.5e7en.me/")
+        # driver.get("https://ttsmp3.com/")
+    return driver
 
 def speak(text):
     try:
+        driver = get_driver()
         element_to_click = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, '//*[@id="text"]'))
         )
@@ -0,0 +1,159 @@
+# TOOLS/BENCH/providers.py
+"""
+Runs the same prompt set against every configured streaming provider and compares
+time to first token, total latency and tokens per second.
+
+    python -m TOOLS.BENCH.providers                         # configured providers + local stand-in
+    python -m TOOLS.BENCH.providers standin                 # offline: only the local stand-in
+    python -m TOOLS.BENCH.providers --runs 5 --concurrency 2 groq deepinfra
+
+The stand-in is a local OpenAI-compatible HTTP server streaming server-sent events with a
+configurable first-token delay and per-token delay. It gives a network-free baseline for
+the client-side overhead of the streaming path.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from BRAIN.text.STREAM.providers import PROVIDERS, OpenAICompatibleProvider, get_provider
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_OUTPUT = os.path.join("TOOLS", "BENCH", "results", "providers.json")
+
+PROMPTS = [
+    "Write two sentences about India.",
+    "What is the capital of France? Answer in one line.",
+    "Explain quantum computing in simple words.",
+    "Give me three tips to save battery on my phone.",
+    "Tell me a short joke.",
+]
+
+STANDIN_TEXT = ("Sure. Here is a short answer that streams one word at a time, so the client "
+                "sees many small server-sent events just like from a real provider.")
+
+
+def start_standin(ttft: float = 0.2, token_delay: float = 0.01, port: int = 0) -> ThreadingHTTPServer:
+    """Starts the stand-in server on a daemon thread; its URL is http://127.0.0.1:<server.server_port>/v1."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(ttft)
+            try:
+                for index, word in enumerate(STANDIN_TEXT.split(" ")):
+                    delta = word if index == 0 else f" {word}"
+                    self._write(f"data: {json.dumps({'choices': [{'delta': {'content': delta}}]})}\n\n")
+                    time.sleep(token_delay)
+                self._write("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # Client cancelled the stream
+
+        def _write(self, text: str) -> None:
+            data = text.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="provider-standin", daemon=True).start()
+    return server
+
+
+def standin_provider(server: ThreadingHTTPServer) -> OpenAICompatibleProvider:
+    return OpenAICompatibleProvider("standin", f"http://127.0.0.1:{server.server_port}/v1", "standin",
+                                    requires_key=False)
+
+
+async def run_provider(provider, prompts: list, runs: int, concurrency: int, max_tokens: int) -> None:
+    """Streams every prompt `runs` times, at most `concurrency` at once; metrics end up in provider.metrics."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(prompt):
+        async with semaphore:
+            try:
+                async for _ in provider.stream([{"role": "user", "content": prompt}], max_tokens=max_tokens):
+                    pass
+            except Exception:
+                pass  # Recorded in the provider's metrics
+
+    await asyncio.gather(*(one(prompt) for _ in range(runs) for prompt in prompts))
+
+
+def format_ms(value) -> str:
+    return f"{value:8d}" if value is not None else f"{'-':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare streaming latency of the LLM providers.")
+    parser.add_argument("providers", nargs="*",
+                        help=f"Providers to run ({', '.join(PROVIDERS)}, standin). Default: every configured one.")
+    parser.add_argument("--runs", type=int, default=3, help="Times each prompt is sent per provider.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight per provider.")
+    parser.add_argument("--max-tokens", type=int, default=128, help="max_tokens sent with every request.")
+    parser.add_argument("--standin-ttft", type=float, default=0.2, help="Stand-in delay before the first token (s).")
+    parser.add_argument("--standin-token-delay", type=float, default=0.01, help="Stand-in delay between tokens (s).")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    args = parser.parse_args()
+
+    server = start_standin(args.standin_ttft, args.standin_token_delay)
+    names = args.providers or [*PROVIDERS, "standin"]
+    providers = []
+    for name in names:
+        provider = standin_provider(server) if name == "standin" else get_provider(name)
+        if not provider.configured():
+            print(f"skipping {name}: not configured")
+            continue
+        providers.append(provider)
+
+    async def run_all():
+        for provider in providers:
+            await run_provider(provider, PROMPTS, args.runs, args.concurrency, args.max_tokens)
+
+    asyncio.run(run_all())
+    server.shutdown()
+
+    results = {
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": args.runs,
+        "concurrency": args.concurrency,
+        "providers": {},
+    }
+    print(f"\n{'provider':12} {'reqs':>5} {'errs':>5} {'ttft p50':>8} {'ttft p95':>8} {'ttft p99':>8} "
+          f"{'tot p50':>8} {'tot p95':>8} {'tok/s':>7}")
+    for provider in providers:
+        summary = provider.summary()
+        errors = sorted({m.error for m in provider.metrics if m.error})
+        results["providers"][provider.name] = {**summary, "error_samples": errors[:3]}
+        rate = f"{summary['tokens_per_second']:7.1f}" if summary["tokens_per_second"] else f"{'-':>7}"
+        print(f"{provider.name:12} {summary['requests']:5d} {summary['errors']:5d} "
+              f"{format_ms(summary['ttft_p50_ms'])} {format_ms(summary['ttft_p95_ms'])} "
+              f"{format_ms(summary['ttft_p99_ms'])} {format_ms(summary['total_p50_ms'])} "
+              f"{format_ms(summary['total_p95_ms'])} {rate}")
+        for error in errors[:3]:
+            print(f"    {error[:100]}")
+
+    output = os.path.join(PROJECT_ROOT, args.output) if not os.path.isabs(args.output) else args.output
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+# TOOLS/BENCH/search.py
+"""
+Benchmarks the realtime search path end-to-end without touching Google, DuckDuckGo or an LLM.
+
+    python -m TOOLS.BENCH.search                                  # defaults, cold caches
+    python -m TOOLS.BENCH.search --runs 3 --concurrency 4 --page-latency 0.3 --error-rate 0.1
+    python -m TOOLS.BENCH.search --fixtures path/to/recorded      # replay recorded pages
+    python -m TOOLS.BENCH.search --serve --port 8765              # only run the fixture server
+
+The fixture server is a local HTTP server that stands in for the search engines and the
+result pages. /google/search?q=... and /ddg/html?q=... return result pages in the layout
+of the real ones, /page/<name> returns article HTML (menus, scripts and all). Recorded
+pages are replayed from --fixtures (google/<slug>.html, ddg/<slug>.html, page/<name>.html),
+anything not recorded is generated from a fixed seed, so runs are reproducible. Latency
+(with jitter), HTTP errors and hanging requests are injected per route.
+
+RealTimeSearchEngine runs unmodified, except that its search sources point at the server
+and its LLM is a stub streaming a fixed answer, and the completion and search caches start
+empty (--search-cache keeps the search cache across runs). stockRealtime.get_web_results
+is measured the same way. Reported: throughput, end-to-end latency and time to first token,
+the prompt size and the latency of every stage (sources, search, fetch, extract, rank); the
+LLM's share is the stub's fixed --llm-ttft.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, quote, urlsplit
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_OUTPUT = os.path.join("TOOLS", "BENCH", "results", "search.json")
+
+QUERIES = [
+    "who won the cricket match today",
+    "latest news about tata motors",
+    "what is quantum computing",
+    "weather in delhi tomorrow",
+    "nifty 50 closing today",
+    "best budget phones 2024",
+    "how does a solar panel work",
+    "who is the prime minister of japan",
+]
+
+PAGES_PER_SEARCH = 10
+PAGE_POOL = 40
+PARAGRAPHS = [
+    "The committee published its report on {topic} after months of review, and experts said the findings "
+    "would shape policy for the next decade.",
+    "Analysts tracking {topic} noted a sharp change compared with last year, pointing to demand, supply and "
+    "regulation as the main drivers.",
+    "Residents interviewed about {topic} gave mixed reactions, with several saying the details were still "
+    "unclear and more information was needed.",
+    "Historically, {topic} has been studied by researchers at many universities, who describe it in terms of "
+    "simple underlying principles.",
+    "Officials confirmed the latest figures on {topic} on Tuesday and promised an update once the final numbers "
+    "are verified.",
+]
+FILLER = ("Subscribe to our newsletter for daily updates. Advertisement. Read more stories from our team of "
+          "reporters covering business, sports, science and entertainment from around the world.")
+
+
+def slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.casefold()).strip("-")[:80]
+
+
+def _rng(seed: int, *parts) -> random.Random:
+    return random.Random(hashlib.sha256(":".join(map(str, (seed, *parts))).encode()).hexdigest())
+
+
+# --- Fixture content ---
+def result_pages(query: str, engine: str, seed: int) -> List[str]:
+    """Names of the pages an engine returns for a query; the two engines overlap by about half."""
+    shared = _rng(seed, "results", query).sample(range(PAGE_POOL), PAGES_PER_SEARCH)
+    own = _rng(seed, "results", query, engine).sample(range(PAGE_POOL), PAGES_PER_SEARCH)
+    names = shared[:PAGES_PER_SEARCH // 2] + [n for n in own if n not in shared][:PAGES_PER_SEARCH // 2]
+    return [f"{slug(query)}-{number}" for number in names]
+
+
+def google_page(query: str, base: str, seed: int) -> str:
+    items = "".join(
+        f'<div class="g"><a href="{base}/page/{name}"><h3>{name.replace("-", " ").title()}</h3></a>'
+        f'<div class="VwiC3b">Everything about {query}: result {rank + 1} with the key facts.</div></div>'
+        for rank, name in enumerate(result_pages(query, "google", seed)))
+    return f"<html><head><title>{query} - Google Search</title></head><body><div id=\"search\">{items}</div></body></html>"
+
+
+def ddg_page(query: str, base: str, seed: int) -> str:
+    items = "".join(
+        f'<div class="result"><a class="result__a" href="{base}/page/{name}">{name.replace("-", " ").title()}</a>'
+        f'<a class="result__snippet">What we know about {query} so far ({rank + 1}).</a></div>'
+        for rank, name in enumerate(result_pages(query, "ddg", seed)))
+    return f"<html><body><div id=\"links\">{items}</div></body></html>"
+
+
+def article_page(name: str, seed: int) -> str:
+    rng = _rng(seed, "page", name)
+    topic = name.rsplit("-", 1)[0].replace("-", " ")
+    paragraphs = []
+    for _ in range(rng.randint(15, 40)):
+        if rng.random() < 0.3:
+            paragraphs.append(f"<p>{rng.choice(PARAGRAPHS).format(topic=topic)}</p>")
+        else:
+            paragraphs.append(f"<p>{FILLER} {rng.choice(PARAGRAPHS).format(topic='the economy')}</p>")
+    menu = "".join(f"<li><a href=\"/section/{i}\">Section {i}</a></li>" for i in range(30))
+    script = "<script>" + "var tracking = {};".join(str(i) for i in range(400)) + "</script>"
+    return (f"<html><head><title>{topic}</title>{script}<style>body {{ margin: 0 }}</style></head><body>"
+            f"<header><nav><ul>{menu}</ul></nav></header><article><h1>{topic.title()}</h1>{''.join(paragraphs)}"
+            f"</article><aside>{FILLER * 5}</aside><footer>{FILLER}</footer></body></html>")
+
+
+# --- Fixture server ---
+def start_fixture_server(seed: int = 0, fixtures: Optional[str] = None, search_latency: float = 0.2,
+                         page_latency: float = 0.15, jitter: float = 0.5, error_rate: float = 0.0,
+                         hang_rate: float = 0.0, hang_seconds: float = 30.0, port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the fixture server on a daemon thread; its URL is http://127.0.0.1:<server.server_port>.
+
+    Latency is search_latency / page_latency seconds, varied by up to +-jitter (fraction).
+    error_rate of the requests get a 503, hang_rate of them sleep hang_seconds before answering.
+    The outcome for a URL depends only on the seed and the URL, so runs are reproducible.
+    """
+
+    def recorded(kind: str, name: str) -> Optional[str]:
+        if not fixtures:
+            return None
+        path = os.path.join(fixtures, kind, f"{name}.html")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        return None
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query).get("q", [""])[0]
+            base = f"http://127.0.0.1:{self.server.server_port}"
+            if parts.path == "/google/search":
+                latency, kind, name = search_latency, "google", slug(query)
+                body = recorded(kind, name) or google_page(query, base, seed)
+            elif parts.path == "/ddg/html":
+                latency, kind, name = search_latency, "ddg", slug(query)
+                body = recorded(kind, name) or ddg_page(query, base, seed)
+            elif parts.path.startswith("/page/"):
+                latency, kind, name = page_latency, "page", parts.path[len("/page/"):]
+                body = recorded(kind, name) or article_page(name, seed)
+            else:
+                self._send(404, "not found")
+                return
+            rng = _rng(seed, "fault", self.path)
+            time.sleep(max(0.0, latency * (1 + jitter * (2 * rng.random() - 1))))
+            fault = rng.random()
+            if fault < error_rate:
+                self._send(503, "service unavailable")
+                return
+            if fault < error_rate + hang_rate:
+                time.sleep(hang_seconds)
+            self._send(200, body)
+
+        def _send(self, status: int, body: str) -> None:
+            data = body.encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # Client gave up (deadline)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="search-fixtures", daemon=True).start()
+    return server
+
+
+# --- Sources that search the fixture server ---
+def fixture_sources(base: str) -> Dict[str, object]:
+    """google and ddg sources (same signature as web_search's) that parse the fixture result pages."""
+    from bs4 import BeautifulSoup
+
+    from BRAIN.ai_chat_res.llm_client import get_http_client
+    from BRAIN.ai_chat_res.web_search import SearchResult, cached_source
+
+    def fetch(path: str, query: str, timeout: float) -> BeautifulSoup:
+        response = get_http_client().get(f"{base}{path}?q={quote(query)}", timeout=timeout)
+        response.raise_for_status()
+        return BeautifulSoup(response.text, "lxml")
+
+    def google(query: str, max_results: int = 10, timeout: float = 5.0) -> List[SearchResult]:
+        results = []
+        for item in fetch("/google/search", query, timeout).select("div.g")[:max_results]:
+            link, snippet = item.find("a"), item.select_one("div.VwiC3b")
+            results.append(SearchResult(link["href"], link.get_text(strip=True),
+                                        snippet.get_text(strip=True) if snippet else "", "google", len(results)))
+        return results
+
+    def ddg(query: str, max_results: int = 10, timeout: float = 5.0) -> List[SearchResult]:
+        results = []
+        for item in fetch("/ddg/html", query, timeout).select("div.result")[:max_results]:
+            link, snippet = item.select_one("a.result__a"), item.select_one("a.result__snippet")
+            results.append(SearchResult(link["href"], link.get_text(strip=True),
+                                        snippet.get_text(strip=True) if snippet else "", "ddg", len(results)))
+        return results
+
+    return {"google": cached_source("google", google), "ddg": cached_source("ddg", ddg)}
+
+
+# --- Stub LLM ---
+class StubCascade:
+    """Stands in for search_cascade: streams a fixed answer and records the prompt size."""
+
+    ANSWER = "According to the search results, here is a short answer with the key facts you asked for."
+
+    def __init__(self, ttft: float, token_delay: float) -> None:
+        self.ttft = ttft
+        self.token_delay = token_delay
+        self.prompt_tokens: List[int] = []
+        self._lock = threading.Lock()
+
+    def stream(self, messages, **params):
+        from BRAIN.ai_chat_res.context_window import count_message_tokens
+
+        with self._lock:
+            self.prompt_tokens.append(count_message_tokens(messages))
+        time.sleep(self.ttft)
+        for index, word in enumerate(self.ANSWER.split(" ")):
+            yield word if index == 0 else f" {word}"
+            time.sleep(self.token_delay)
+
+
+# --- Measurement ---
+class StageTimer:
+    """Collects the duration of every call of the wrapped functions, per stage."""
+
+    def __init__(self) -> None:
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage: str, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+
+        return timed
+
+    def summary(self) -> dict:
+        def percentile(values, q):
+            return round(values[int(q * (len(values) - 1))] * 1000, 1)
+
+        summary = {}
+        for stage, values in self.samples.items():
+            values = sorted(values)
+            summary[stage] = {"calls": len(values), "p50_ms": percentile(values, 0.5),
+                              "p95_ms": percentile(values, 0.95), "mean_ms": round(statistics.mean(values) * 1000, 1)}
+        return summary
+
+
+def install(base: str, timer: StageTimer, stub: StubCascade, keep_search_cache: bool) -> None:
+    """Points the search path at the fixture server and the stub LLM, with timing wrappers."""
+    import BRAIN.ai_chat_res.RealtimeSearchEngine_groq as realtime
+    import BRAIN.ai_chat_res.retrieval as retrieval
+    import BRAIN.ai_chat_res.stock.stockRealtime as stock
+    import BRAIN.ai_chat_res.web_search as web_search
+    from BRAIN.ai_chat_res.completion_cache import CompletionCache
+    from BRAIN.ai_chat_res.model_cascade import set_offline_mode
+    from BRAIN.ai_chat_res.search_cache import SearchCache
+
+    set_offline_mode(False)
+    # Nothing is read from or written to the real caches in Data/
+    realtime.completion_cache = CompletionCache(max_entries=0)
+    web_search.search_cache = SearchCache(path=None, max_entries=100000 if keep_search_cache else 0)
+
+    sources = fixture_sources(base)
+    web_search.web_search.sources = {name: timer.wrap(f"source:{name}", source) for name, source in sources.items()}
+    web_search.web_search.search = timer.wrap("search", web_search.web_search.search)
+    stock.google_results, stock.ddg_results = sources["google"], sources["ddg"]
+    realtime.search_cascade = stub
+
+    retrieval.fetch_pages = timer.wrap("fetch", retrieval.fetch_pages)
+    retrieval.extract_blocks = timer.wrap("extract (per page)", retrieval.extract_blocks)
+    retrieval.rank_passages = timer.wrap("rank", retrieval.rank_passages)
+
+
+def run_realtime(queries: List[str], runs: int, concurrency: int, timer: StageTimer) -> dict:
+    from BRAIN.ai_chat_res.RealtimeSearchEngine_groq import AnswerModifier, RealTimeSearchEngineStream
+
+    errors = []
+
+    def one(query: str) -> None:
+        start = time.perf_counter()
+        first = None
+        parts = []
+        for delta in RealTimeSearchEngineStream(query, save_history=False):
+            if first is None:
+                first = time.perf_counter()
+                timer.add("end-to-end ttft", first - start)
+            parts.append(delta)
+        answer = AnswerModifier("".join(parts))
+        timer.add("end-to-end", time.perf_counter() - start)
+        if answer.startswith("An error occured"):
+            errors.append(answer)
+
+    jobs = [query for _ in range(runs) for query in queries]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, jobs))
+    wall = time.perf_counter() - start
+    return {"queries": len(jobs), "wall_s": round(wall, 3), "queries_per_s": round(len(jobs) / wall, 2),
+            "errors": len(errors), "error_samples": errors[:3]}
+
+
+def run_web_results(queries: List[str], runs: int, timer: StageTimer) -> dict:
+    from BRAIN.ai_chat_res.stock.stockRealtime import get_web_results
+
+    timed = timer.wrap("stockRealtime.get_web_results", get_web_results)
+    jobs = [query for _ in range(runs) for query in queries]
+    start = time.perf_counter()
+    for query in jobs:
+        timed(query)
+    wall = time.perf_counter() - start
+    return {"queries": len(jobs), "wall_s": round(wall, 3), "queries_per_s": round(len(jobs) / wall, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the realtime search path against local fixtures.")
+    parser.add_argument("--runs", type=int, default=2, help="Times each query is asked.")
+    parser.add_argument("--concurrency", type=int, default=1, help="RealTimeSearchEngine calls in flight.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated fixtures and faults.")
+    parser.add_argument("--fixtures", help="Directory with recorded google/, ddg/ and page/ HTML files.")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="Result page latency (s).")
+    parser.add_argument("--page-latency", type=float, default=0.15, help="Article page latency (s).")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Latency varies by up to this fraction.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503.")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of requests that hang.")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="How long a hanging request hangs (s).")
+    parser.add_argument("--llm-ttft", type=float, default=0.3, help="Stub LLM delay before the first token (s).")
+    parser.add_argument("--llm-token-delay", type=float, default=0.005, help="Stub LLM delay between tokens (s).")
+    parser.add_argument("--search-cache", action="store_true", help="Keep search results cached across runs.")
+    parser.add_argument("--serve", action="store_true", help="Only run the fixture server until interrupted.")
+    parser.add_argument("--port", type=int, default=0, help="Fixture server port (default: any free port).")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.seed, args.fixtures, args.search_latency, args.page_latency, args.jitter,
+                                  args.error_rate, args.hang_rate, args.hang_seconds, args.port)
+    base = f"http://127.0.0.1:{server.server_port}"
+    if args.serve:
+        print(f"fixture server on {base} (/google/search?q=, /ddg/html?q=, /page/<name>); Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+            return
+
+    timer = StageTimer()
+    stub = StubCascade(args.llm_ttft, args.llm_token_delay)
+    install(base, timer, stub, args.search_cache)
+    realtime = run_realtime(QUERIES, args.runs, args.concurrency, timer)
+    web_results = run_web_results(QUERIES, args.runs, timer)
+    server.shutdown()
+
+    from BRAIN.ai_chat_res.retrieval import retriever
+
+    results = {
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "serve", "port")},
+        "realtime_search_engine": realtime,
+        "get_web_results": web_results,
+        "prompt_tokens": {"mean": round(statistics.mean(stub.prompt_tokens)) if stub.prompt_tokens else None,
+                          "max": max(stub.prompt_tokens, default=None)},
+        "stages": timer.summary(),
+        "retrieval": retriever.stats(),
+    }
+
+    print(f"\nRealTimeSearchEngine: {realtime['queries']} queries in {realtime['wall_s']}s "
+          f"({realtime['queries_per_s']}/s, concurrency {args.concurrency}, {realtime['errors']} errors)")
+    print(f"get_web_results:      {web_results['queries']} queries in {web_results['wall_s']}s "
+          f"({web_results['queries_per_s']}/s)")
+    print(f"prompt tokens:        mean {results['prompt_tokens']['mean']}, max {results['prompt_tokens']['max']}")
+    print(f"\n{'stage':32} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for stage, row in results["stages"].items():
+        print(f"{stage:32} {row['calls']:6d} {row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {row['mean_ms']:9.1f}")
+
+    output = os.path.join(PROJECT_ROOT, args.output) if not os.path.isabs(args.output) else args.output
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
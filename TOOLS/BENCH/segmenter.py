@@ -0,0 +1,88 @@
+# TOOLS/BENCH/segmenter.py
+"""
+Micro-benchmark of sentence segmentation on streamed answers: the old approach of
+re-running re.split over the whole unfinished sentence after every delta (basedGPT,
+deepInfra_TEXT) against the incremental SentenceSegmenter.
+
+    python -m TOOLS.BENCH.segmenter
+    python -m TOOLS.BENCH.segmenter --delta-sizes 1 4 32 --repeat 5
+
+Sentence length matters most for the old approach (the re-split is quadratic in it),
+so answers with short and with long sentences are both measured.
+"""
+import argparse
+import re
+import time
+
+from BRAIN.text.STREAM.sentence_segmenter import SentenceSegmenter
+
+# The pattern basedGPT.generate and deepInfra_TEXT used before the shared segmenter
+OLD_PATTERN = re.compile(r'(?<!\b\w\.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s')
+
+SHORT_SENTENCES = ("India is a country in South Asia. It is the seventh largest country by area. "
+                   "Dr. A. P. J. Abdul Kalam was its 11th President. Its GDP grew 8.2 percent last year. "
+                   "Delhi is the capital। Aap kaise ho? ") * 40
+LONG_SENTENCES = (("India, officially the Republic of India, is a country in South Asia that is home to "
+                   "more than a billion people, hundreds of languages, many religions and a long history, ") * 12
+                  + "and it is the most populous democracy. ") * 6
+
+NUMBER_SENTENCES = ("The value is 3.14. Pi is irrational. The share closed at $1234.50. It rose 2%. "
+                    "Petrol costs ₹94.72. Diesel is cheaper. ") * 40
+
+SAMPLES = {"short sentences": SHORT_SENTENCES, "long sentences": LONG_SENTENCES, "numbers": NUMBER_SENTENCES}
+
+
+def old_split(deltas):
+    sentences = []
+    partial_sentence = ""
+    for delta in deltas:
+        partial_sentence += delta
+        parts = OLD_PATTERN.split(partial_sentence)
+        sentences.extend(part.strip() for part in parts[:-1])
+        partial_sentence = parts[-1]
+    if partial_sentence:
+        sentences.append(partial_sentence.strip())
+    return sentences
+
+
+def new_split(deltas):
+    segmenter = SentenceSegmenter()
+    sentences = []
+    for delta in deltas:
+        sentences.extend(segmenter.feed(delta))
+    remainder = segmenter.flush()
+    if remainder:
+        sentences.append(remainder)
+    return sentences
+
+
+def best_time(function, deltas, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(deltas)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming sentence segmentation.")
+    parser.add_argument("--delta-sizes", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Characters per streamed delta (1 = basedGPT's chunk_size=1).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (the best one is kept).")
+    args = parser.parse_args()
+
+    print(f"{'sample':16} {'delta':>5} {'chars':>6} {'old ms':>9} {'new ms':>9} {'speed-up':>8} {'sentences':>10}")
+    for name, text in SAMPLES.items():
+        for size in args.delta_sizes:
+            deltas = [text[i:i + size] for i in range(0, len(text), size)]
+            old_ms = best_time(old_split, deltas, args.repeat) * 1000
+            new_ms = best_time(new_split, deltas, args.repeat) * 1000
+            counts = f"{len(old_split(deltas))}/{len(new_split(deltas))}"
+            print(f"{name:16} {size:5d} {len(text):6d} {old_ms:9.2f} {new_ms:9.2f} {old_ms / new_ms:7.1f}x {counts:>10}")
+    print("\nsentences: old/new count; they differ where the new segmenter also handles "
+          "abbreviations, list numbers and '।'.")
+
+
+if __name__ == "__main__":
+    main()
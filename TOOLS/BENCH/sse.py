@@ -0,0 +1,95 @@
+# TOOLS/BENCH/sse.py
+"""
+Micro-benchmark of SSE parsing for OpenAI-compatible streams (deepInfra_TEXT, the
+providers): the old requests iter_lines(chunk_size=1) + re.sub + json.loads loop against
+the buffered SSEDecoder with orjson.
+
+    python -m TOOLS.BENCH.sse
+    python -m TOOLS.BENCH.sse --tokens 4000 --chunk-sizes 1 1024 65536
+
+The recorded stream is replayed from memory through a real requests.Response, so the
+numbers are the client-side CPU cost only, without any network time.
+"""
+import argparse
+import io
+import json
+import re
+import time
+
+import requests
+
+from BRAIN.text.STREAM.sse import iter_openai_deltas
+
+
+def make_stream(tokens: int) -> bytes:
+    """An OpenAI-style chat.completion.chunk stream with `tokens` content events."""
+    words = "India is a country in South Asia and the most populous democracy in the world".split()
+    events = [{"choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}]}]
+    for index in range(tokens):
+        events.append({"id": "chatcmpl-bench", "object": "chat.completion.chunk", "model": "bench",
+                       "choices": [{"index": 0, "delta": {"content": f" {words[index % len(words)]}"},
+                                    "finish_reason": None}]})
+    body = b"".join(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n" for event in events)
+    return body + b"data: [DONE]\n\n"
+
+
+def replay(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    response.encoding = "utf-8"
+    return response
+
+
+def old_parser(body: bytes, chunk_size: int) -> str:
+    """The loop deepInfra_TEXT._stream_response used before the SSE decoder."""
+    parts = []
+    for value in replay(body).iter_lines(decode_unicode=True, chunk_size=chunk_size):
+        modified_value = re.sub("data:", "", value)
+        if modified_value and "[DONE]" not in modified_value:
+            json_modified_value = json.loads(modified_value)
+            try:
+                if json_modified_value["choices"][0]["delta"]["content"] != None:
+                    parts.append(json_modified_value["choices"][0]["delta"]["content"])
+            except Exception:
+                continue
+    return "".join(parts)
+
+
+def new_parser(body: bytes, chunk_size: int) -> str:
+    return "".join(iter_openai_deltas(replay(body).iter_content(chunk_size=chunk_size)))
+
+
+def best_time(function, body: bytes, chunk_size: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(body, chunk_size)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SSE stream parsing.")
+    parser.add_argument("--tokens", type=int, default=2000, help="Content events in the replayed stream.")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[1, 512, 8192],
+                        help="Bytes per socket read (1 = the old deepInfra default).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (the best one is kept).")
+    args = parser.parse_args()
+
+    body = make_stream(args.tokens)
+    assert old_parser(body, 8192) == new_parser(body, 8192), "parsers disagree"
+    print(f"stream: {args.tokens} events, {len(body) / 1024:.0f} KiB")
+    print(f"{'chunk bytes':>11} {'old ms':>9} {'new ms':>9} {'speed-up':>8} {'new us/event':>13}")
+    for chunk_size in args.chunk_sizes:
+        old_ms = best_time(old_parser, body, chunk_size, args.repeat) * 1000
+        new_ms = best_time(new_parser, body, chunk_size, args.repeat) * 1000
+        print(f"{chunk_size:11d} {old_ms:9.1f} {new_ms:9.1f} {old_ms / new_ms:7.1f}x "
+              f"{new_ms * 1000 / args.tokens:13.2f}")
+    old_default = best_time(old_parser, body, 1, args.repeat) * 1000
+    new_default = best_time(new_parser, body, None, args.repeat) * 1000
+    print(f"\nold default (chunk_size=1): {old_default:.1f} ms, new default (chunk_size=None): {new_default:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# TOOLS/BENCH/startup.py
+"""
+Measures import time of the assistant's top-level modules, like `python -X importtime`
+but aggregated into a tree per module with the heaviest offenders ranked.
+
+    python -m TOOLS.BENCH.startup                              # all modules, results JSON written
+    python -m TOOLS.BENCH.startup main ENGINE.TTS.*            # only some modules (fnmatch patterns)
+    python -m TOOLS.BENCH.startup --tree main                  # also print the import tree of main
+    python -m TOOLS.BENCH.startup --write-budget TOOLS/BENCH/startup_budget.json
+    python -m TOOLS.BENCH.startup --budget TOOLS/BENCH/startup_budget.json   # exit 1 on regressions
+
+Every import runs in a fresh interpreter. "cold" compiles every module from source (empty
+bytecode cache), "warm" is the best of --runs imports with the bytecode cache filled.
+Importing a module runs its top-level code, so modules that start browsers, open devices or
+ask for input will do that here too; --timeout stops the ones that never return.
+"""
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_OUTPUT = os.path.join("TOOLS", "BENCH", "results", "startup.json")
+
+# Fixed entry points, plus every module in these packages
+ENTRY_MODULES = ["main", "BRAIN.ai_chat_res.functions_call"]
+MODULE_PACKAGES = ["ENGINE/TTS", "ENGINE/STT", "Automation"]
+
+
+def discover_modules() -> list:
+    """Lists the modules to profile as dotted names."""
+    modules = list(ENTRY_MODULES)
+    for package in MODULE_PACKAGES:
+        for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, package, "*.py"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name != "__init__":
+                modules.append(f"{package.replace('/', '.')}.{name}")
+    return modules
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Turns `-X importtime` output into a list of root nodes.
+
+    Each line is reported after all of its children, and its nesting depth is given by
+    the indentation of the name (two spaces per level).
+    """
+    pending = {}  # depth -> finished nodes waiting for their parent
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name_part = fields
+        name = name_part.strip()
+        depth = (len(name_part) - len(name_part.lstrip(" ")) - 1) // 2
+        node = {
+            "name": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def find_node(nodes: list, name: str):
+    for node in nodes:
+        if node["name"] == name:
+            return node
+        found = find_node(node["children"], name)
+        if found:
+            return found
+    return None
+
+
+def walk(node: dict):
+    yield node
+    for child in node["children"]:
+        yield from walk(child)
+
+
+def prune(node: dict, min_ms: float) -> dict:
+    """Drops subtrees cheaper than min_ms so the JSON stays readable."""
+    return {
+        "name": node["name"],
+        "self_ms": round(node["self_ms"], 3),
+        "cumulative_ms": round(node["cumulative_ms"], 3),
+        "children": [prune(child, min_ms) for child in node["children"] if child["cumulative_ms"] >= min_ms],
+    }
+
+
+def import_once(module: str, timeout: float, pycache_prefix: str) -> dict:
+    """Imports module in a fresh interpreter and returns its parsed import tree."""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=pycache_prefix)
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "error": f"timed out after {timeout:.0f}s", "wall_ms": timeout * 1000, "root": None}
+    wall_ms = (time.perf_counter() - start) * 1000
+    root = find_node(parse_importtime(proc.stderr), module)
+    error = None
+    if proc.returncode != 0:
+        messages = [line for line in proc.stderr.splitlines() if line.strip() and not line.startswith("import time:")]
+        error = messages[-1] if messages else f"exit code {proc.returncode}"
+    return {"ok": error is None, "error": error, "wall_ms": wall_ms, "root": root}
+
+
+def profile_module(module: str, runs: int, timeout: float, min_ms: float, top: int) -> dict:
+    """Cold import with an empty bytecode cache, then the best of `runs` warm imports."""
+    with tempfile.TemporaryDirectory(prefix="jarvis-pycache-") as cold_cache:
+        cold = import_once(module, timeout, cold_cache)
+    warm_cache = os.path.join(tempfile.gettempdir(), "jarvis-startup-pycache")
+    import_once(module, timeout, warm_cache)  # fill the bytecode cache
+    warm_runs = [import_once(module, timeout, warm_cache) for _ in range(runs)]
+    best = min(warm_runs, key=lambda run: run["root"]["cumulative_ms"] if run["root"] else float("inf"))
+
+    result = {
+        "ok": cold["ok"] and best["ok"],
+        "error": best["error"] or cold["error"],
+        "cold_ms": round(cold["root"]["cumulative_ms"], 3) if cold["root"] else None,
+        "warm_ms": round(best["root"]["cumulative_ms"], 3) if best["root"] else None,
+        "wall_ms": round(best["wall_ms"], 3),
+        "offenders": [],
+        "tree": None,
+    }
+    if best["root"]:
+        nodes = sorted(walk(best["root"]), key=lambda node: node["self_ms"], reverse=True)
+        result["offenders"] = [
+            {"name": node["name"], "self_ms": round(node["self_ms"], 3), "cumulative_ms": round(node["cumulative_ms"], 3)}
+            for node in nodes[:top]
+        ]
+        result["tree"] = prune(best["root"], min_ms)
+    return result
+
+
+def print_tree(node: dict, indent: str = "") -> None:
+    print(f"{indent}{node['name']}  {node['cumulative_ms']:.1f} ms (self {node['self_ms']:.1f})")
+    for child in sorted(node["children"], key=lambda child: child["cumulative_ms"], reverse=True):
+        print_tree(child, indent + "  ")
+
+
+def check_budget(results: dict, budget_path: str, tolerance: float) -> list:
+    """
+    Returns (module, warm_ms, budget_ms) for every budgeted module that is over its budget,
+    or that failed or timed out on import (warm_ms None). Modules not profiled are skipped.
+    """
+    with open(budget_path, "r") as f:
+        budget = json.load(f)
+    regressions = []
+    for module, limit in budget.get("modules", {}).items():
+        result = results["modules"].get(module)
+        if result is None:
+            continue
+        if result["warm_ms"] is None or result["warm_ms"] > limit * (1 + tolerance):
+            regressions.append((module, result["warm_ms"], limit))
+    return regressions
+
+
+def write_budget(results: dict, budget_path: str, headroom: float) -> None:
+    """Writes a budget of the current warm import times plus headroom."""
+    budget = {
+        "headroom": headroom,
+        "modules": {
+            module: round(result["warm_ms"] * (1 + headroom), 1)
+            for module, result in results["modules"].items() if result["warm_ms"] is not None
+        },
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(budget_path)), exist_ok=True)
+    with open(budget_path, "w") as f:
+        json.dump(budget, f, indent=4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile import time of the assistant's modules.")
+    parser.add_argument("patterns", nargs="*", help="Only profile modules matching these fnmatch patterns.")
+    parser.add_argument("--runs", type=int, default=3, help="Warm imports per module (the best one is kept).")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds before an import is abandoned.")
+    parser.add_argument("--top", type=int, default=10, help="Offenders kept per module and printed overall.")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Subtrees cheaper than this are left out of the tree.")
+    parser.add_argument("--tree", action="append", default=[], metavar="MODULE", help="Print the import tree of MODULE.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    parser.add_argument("--budget", help="Budget JSON file; exit 1 if a module's warm import time exceeds it.")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Allowed fraction over budget, e.g. 0.1.")
+    parser.add_argument("--write-budget", metavar="PATH", help="Write a budget file from this run.")
+    parser.add_argument("--headroom", type=float, default=0.25, help="Headroom added by --write-budget.")
+    args = parser.parse_args()
+
+    modules = discover_modules()
+    if args.patterns:
+        modules = [m for m in modules if any(fnmatch.fnmatch(m, p) for p in args.patterns)]
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": args.runs,
+        "modules": {},
+    }
+    print(f"{'module':50} {'cold ms':>9} {'warm ms':>9}  status")
+    for module in modules:
+        result = profile_module(module, args.runs, args.timeout, args.min_ms, args.top)
+        results["modules"][module] = result
+        cold = f"{result['cold_ms']:9.1f}" if result["cold_ms"] is not None else f"{'-':>9}"
+        warm = f"{result['warm_ms']:9.1f}" if result["warm_ms"] is not None else f"{'-':>9}"
+        print(f"{module[:50]:50} {cold} {warm}  {'ok' if result['ok'] else result['error']}")
+
+    # Heaviest offenders across all modules, each import counted once
+    offenders = {}
+    for result in results["modules"].values():
+        for node in result["offenders"]:
+            if node["self_ms"] > offenders.get(node["name"], {"self_ms": -1})["self_ms"]:
+                offenders[node["name"]] = node
+    ranked = sorted(offenders.values(), key=lambda node: node["self_ms"], reverse=True)[:args.top]
+    results["offenders"] = ranked
+    print("\nheaviest imports (self time):")
+    for node in ranked:
+        print(f"  {node['self_ms']:9.1f} ms  {node['name']}")
+
+    for module in args.tree:
+        tree = results["modules"].get(module, {}).get("tree")
+        print(f"\nimport tree of {module}:")
+        if tree:
+            print_tree(tree)
+        else:
+            print("  (not profiled or failed to import)")
+
+    output = os.path.join(PROJECT_ROOT, args.output) if not os.path.isabs(args.output) else args.output
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nresults written to {output}")
+
+    if args.write_budget:
+        write_budget(results, args.write_budget, args.headroom)
+        print(f"budget written to {args.write_budget}")
+
+    if args.budget:
+        regressions = check_budget(results, args.budget, args.tolerance)
+        for module, warm_ms, limit in regressions:
+            if warm_ms is None:
+                print(f"IMPORT FAILED: {module} ({results['modules'][module]['error']}), budget {limit:.1f} ms")
+            else:
+                print(f"OVER BUDGET: {module} {warm_ms:.1f} ms > {limit:.1f} ms")
+        if regressions:
+            sys.exit(1)
+        print("all modules within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# TOOLS/BENCH/tool_prompt.py
+"""
+Compares the full function-calling prompt with the per-query tool subset.
+
+    python -m TOOLS.BENCH.tool_prompt            # prompt tokens only (offline)
+    python -m TOOLS.BENCH.tool_prompt --live 5   # also end-to-end router latency, 5 runs per query
+"""
+import argparse
+import statistics
+import time
+
+from BRAIN.ai_chat_res.system_prompts import get_function_calling_system_prompt
+
+SAMPLE_QUERIES = [
+    "open youtube and check battery",
+    "what is the stock price of tata motors",
+    "call mom using sim 2 on my phone",
+    "increase the playback speed",
+    "generate an image of a dog on the moon",
+    "who won the cricket match yesterday",
+    "read my pdf file",
+    "take a screenshot on my phone",
+    "switch to the next tab",
+    "explain quantum computing in simple words",
+]
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken when available, otherwise estimates ~4 characters per token."""
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    except Exception:
+        # tiktoken missing, or its encoding file could not be downloaded
+        return max(1, len(text) // 4)
+
+
+def measure_latency(prompt: str, query: str, runs: int) -> list:
+    """Times the router completion (same settings as main_loop) for one query."""
+    from BRAIN.ai_chat_res.llm_client import get_groq_client
+
+    client = get_groq_client()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        client.chat.completions.create(
+            model="llama-3.1-8b-instant",
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": query},
+            ],
+            temperature=0.7,
+            max_tokens=1024,
+            top_p=1,
+            stream=False,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the function-calling prompt size and latency.")
+    parser.add_argument("--live", type=int, default=0, metavar="RUNS",
+                        help="Also call the Groq router RUNS times per query and prompt variant.")
+    parser.add_argument("--top-k", type=int, default=8, help="Tools selected per query besides the core set.")
+    args = parser.parse_args()
+
+    full_prompt = get_function_calling_system_prompt()
+    full_tokens = count_tokens(full_prompt)
+
+    print(f"{'query':45} {'full':>6} {'subset':>7} {'saved':>6}")
+    subset_tokens = []
+    full_latency, subset_latency = [], []
+    for query in SAMPLE_QUERIES:
+        subset_prompt = get_function_calling_system_prompt(query, top_k=args.top_k)
+        tokens = count_tokens(subset_prompt)
+        subset_tokens.append(tokens)
+        print(f"{query[:45]:45} {full_tokens:6d} {tokens:7d} {1 - tokens / full_tokens:6.0%}")
+        if args.live:
+            full_latency += measure_latency(full_prompt, query, args.live)
+            subset_latency += measure_latency(subset_prompt, query, args.live)
+
+    print(f"\nmean prompt tokens: full={full_tokens} subset={statistics.mean(subset_tokens):.0f}")
+    if args.live:
+        for name, timings in (("full", full_latency), ("subset", subset_latency)):
+            timings.sort()
+            p95 = timings[int(0.95 * (len(timings) - 1))]
+            print(f"{name:6} latency ms: mean={statistics.mean(timings):.0f} "
+                  f"p50={statistics.median(timings):.0f} p95={p95:.0f}")
+
+
+if __name__ == "__main__":
+    main()
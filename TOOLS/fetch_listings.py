@@ -0,0 +1,67 @@
+# TOOLS/fetch_listings.py
+"""
+Downloads the exchange listing files that BRAIN/ai_chat_res/stock/ticker_index.py builds
+its index from, into Data/listings/. Run it once, and again now and then for new listings:
+
+    python -m TOOLS.fetch_listings
+    python -m TOOLS.fetch_listings --only nse nasdaq
+
+BSE has no stable download link: export "Equity.csv" from
+https://www.bseindia.com/corporates/List_Scrips.html into Data/listings/ by hand.
+"""
+import argparse
+import os
+import sys
+
+from BRAIN.ai_chat_res.stock.ticker_index import LISTINGS_DIR
+
+# Name -> (URL, file name in Data/listings/)
+LISTINGS = {
+    "nse": ("https://archives.nseindia.com/content/equities/EQUITY_L.csv", "EQUITY_L.csv"),
+    "nasdaq": ("https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt", "nasdaqlisted.txt"),
+    "nyse": ("https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt", "otherlisted.txt"),
+}
+
+# NSE refuses requests without a browser User-Agent
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/124.0 Safari/537.36",
+    "Accept": "text/csv,text/plain,*/*",
+}
+
+
+def fetch(url: str, path: str, timeout: float = 30.0) -> int:
+    """Downloads url to path (replaced only once the download is complete); returns its line count."""
+    from BRAIN.ai_chat_res.llm_client import get_http_client
+
+    response = get_http_client().get(url, headers=_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(response.content)
+    os.replace(temp_path, path)
+    return response.content.count(b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the stock exchange listing files for the ticker index.")
+    parser.add_argument("--only", nargs="+", choices=list(LISTINGS), help="Listings to download (default: all).")
+    parser.add_argument("--directory", default=LISTINGS_DIR, help="Where to save them.")
+    args = parser.parse_args()
+
+    failed = 0
+    for name in args.only or LISTINGS:
+        url, file_name = LISTINGS[name]
+        path = os.path.join(args.directory, file_name)
+        try:
+            lines = fetch(url, path)
+            print(f"{name:7} {lines:7d} lines -> {path}")
+        except Exception as e:
+            failed += 1
+            print(f"{name:7} failed: {e}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
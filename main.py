@@ -1,8 +1,5 @@
 # In main.py
 import os
-from re import I
-
-from sympy import im
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"  # Hide pygame welcome message
 os.environ["Device_set_to_use_cpu"] = "hide"  # Set the device to "cpu" hide
 # from ENGINE.STT.Vosk_offline import speech_to_text
@@ -26,6 +23,7 @@ from ENGINE.STT.apple_stt import speech_to_text # <-- Use Apple STT
 # from ENGINE.TTS.speechify import speak
 # from ENGINE.TTS.deepAI import speak
 from ENGINE.TTS.eSpeakNG_fast50ms import speak
+from ENGINE.TTS.stream_speaker import speak_stream
 import concurrent.futures
 # from modules.web import open_website, search_google, close_tab  # Import functions from web module
 import datetime
@@ -37,14 +35,24 @@ import random
 # from BRAIN.model2 import FirstLayerDMM
 # from BRAIN.model import generate_response, predict_query_type
 # from BRAIN.ai_chat_res.Chatbot import ChatBot
-from BRAIN.ai_chat_res.RealtimeSearchEngine_groq import Information
-from BRAIN.ai_chat_res.Chatbot import ChatBot
 from Data.DLG import res1, res_bye
+from BRAIN.ai_chat_res.lazy_loader import lazy_function, prewarm
 
-from Automation.pen_drive_plug_check import pen_drive_connected
-from Automation.battery_plug_check import check_plugin_status
-from Automation.battery_alert import battery_alert
+# Heavy modules are imported on first use so the assistant can start listening sooner
+Information = lazy_function("BRAIN.ai_chat_res.RealtimeSearchEngine_groq", "Information")
+ChatBotStream = lazy_function("BRAIN.ai_chat_res.Chatbot", "ChatBotStream")
 
+# Imported in the background while the user authenticates, most likely first use first
+PREWARM_MODULES = [
+    "groq",
+    "BRAIN.ai_chat_res.Chatbot",
+    "BRAIN.ai_chat_res.RealtimeSearchEngine_groq",
+    "Automation.open_closeWebApp",
+    "Automation.battery_alert",
+    "Automation.battery_plug_check",
+    "Automation.pen_drive_plug_check",
+    "BRAIN.ai_chat_res.stock.stockRealtime",
+]
 
 
 import logging # import log
@@ -53,20 +61,27 @@ import logging # import log
 logging.basicConfig(filename='main.log', level=logging.WARNING, 
         format='%(asctime)s - %(levelname)s - %(message)s')
 
-import json
-from BRAIN.ai_chat_res.functions_call import available_functions
+from BRAIN.ai_chat_res.functions_call import available_functions, streaming_functions
 import BRAIN.ai_chat_res.functions_call as functions_module # Import the module itself
-from BRAIN.ai_chat_res.system_prompts import get_function_calling_system_prompt
-#  --Authentication--
-from BRAIN.auth.recoganize import AuthenticateFace
-
-from groq import Groq
+from BRAIN.ai_chat_res.system_prompts import get_function_calling_system_prompt, get_function_calling_tools
+from BRAIN.ai_chat_res.function_call_parser import FunctionCall, FunctionCallParser, calls_to_json
+from BRAIN.ai_chat_res.tool_executor import ToolExecutor
+from BRAIN.ai_chat_res.tool_cache import tool_cache
+from BRAIN.ai_chat_res.retrieval import retriever
+from BRAIN.ai_chat_res.search_cache import search_cache
+from BRAIN.ai_chat_res.stock.history_store import history_store
+from BRAIN.ai_chat_res.stock.quote_service import quote_service
+from BRAIN.ai_chat_res.stock.ticker_index import ticker_index
+from BRAIN.ai_chat_res.web_search import web_search
+from BRAIN.ai_chat_res.intent_router import route_intent, router_stats
+from BRAIN.ai_chat_res.completion_cache import completion_cache, make_key
+from BRAIN.ai_chat_res.model_cascade import chat_cascade, router_cascade, set_offline_mode
 import argparse
 import sys
-from dotenv import dotenv_values
+from BRAIN.ai_chat_res.llm_client import get_env, prewarm_connections
 
-# Load environment variables from .env file
-env_vars = dotenv_values(".env")
+# Load environment variables from .env file (parsed once, shared with the BRAIN modules)
+env_vars = get_env()
 
 # Access environment variables
 GroqAPIKey = env_vars.get("GroqAPIKey")
@@ -74,10 +89,16 @@ USER = os.getenv("user", "Sir")
 AI_NAME = os.getenv("ai_name", "Jarvis").lower()
 
 
-# Initialize Groq client
-client = Groq(api_key=GroqAPIKey)
 
 # ... (rest of your imports) ...
+# How long a function-router answer is reused for the same utterance
+ROUTER_CACHE_TTL = 24 * 3600
+# Fenced, quoted or misspelled router answers are repaired here instead of going to ChatBot
+function_call_parser = FunctionCallParser(set(available_functions) | set(streaming_functions))
+# Several tool calls in one answer ("open youtube and check battery") run concurrently here,
+# and no tool can block the loop past its deadline
+tool_executor = ToolExecutor(available_functions)
+
 # --- UI Input Magic Strings ---
 UI_INPUT_MAGIC_START = "__UI_EXPECTING_INPUT_START__:" # Note the colon
 
@@ -144,6 +165,16 @@ def output_text(text):
     thread_speak.join()
     # thread_print.join()
 
+def output_stream(chunks):
+    """
+    Prints and speaks a streamed answer. Each sentence is spoken as soon as it is
+    complete, while the rest of the answer is still being generated.
+    """
+    print("Jarvis: ", end="", flush=True)
+    answer = speak_stream(chunks, speak, on_text=lambda delta: print(delta, end="", flush=True))
+    print(flush=True)
+    return answer
+
 # def stt():
 #     result_queue = queue.Queue()
 
@@ -164,7 +195,6 @@ def main_loop():
     MAX_INACTIVITY_TIME = 10  # Auto-sleep after inactivity
     last_command_time = time.time()
 
-    function_calling_system_prompt = get_function_calling_system_prompt()
     try:
 
         while True:
@@ -204,53 +234,73 @@ def main_loop():
                 output_text(dlg)
                 break
             
-            # Function calling logic
-            completion = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[
-                    {"role": "system", "content": Information()},
-                    {"role": "system", "content": function_calling_system_prompt},
-                    {"role": "user", "content": speech}
-                ],
-                temperature=0.7,
-                max_tokens=1024,
-                # max_tokens=2000,
-                top_p=1,
-                stream=False,
-                stop=None
-            )
-
-            response_content = completion.choices[0].message.content
+            # Fixed commands ("video mute", "next tab") are resolved locally without a network round trip
+            routed = route_intent(speech)
+            if routed:
+                function_name, query, confidence = routed
+                output_text(tool_executor.run_merged([FunctionCall(function_name, query)], on_status=output_text))
+                continue
+
+            # Function calling logic: only the tools relevant to this utterance are described,
+            # in the prompt and as native tool schemas (the local model only sees the prompt)
+            function_calling_system_prompt = get_function_calling_system_prompt(speech)
+            router_tools = [tool for tool in get_function_calling_tools(speech)
+                            if tool["function"]["name"] in available_functions]
+            router_messages = [
+                {"role": "system", "content": Information(speech)},
+                {"role": "system", "content": function_calling_system_prompt},
+                {"role": "user", "content": speech}
+            ]
+            # The same utterance routes the same way, so valid router answers are cached
+            router_cache_key = make_key("llama-3.1-8b-instant", router_messages, max_tokens=1024, temperature=0.7)
+            response_content = completion_cache.get(router_cache_key)
+            router_cache_hit = response_content is not None
+            if not router_cache_hit:
+                try:
+                    # llama-3.1-8b-instant, hedged to another model (or the local one) when slow or down
+                    response_content = router_cascade.complete(router_messages, temperature=0.7, max_tokens=1024, top_p=1,
+                                                               tools=router_tools)
+                except RuntimeError as e:
+                    logging.error(f"Function router unavailable: {e}")
+                    response_content = ""
             # print("AI Response:", response_content)
 
-            try:
-                # Attempt to parse the response as JSON
-                function_call = json.loads(response_content)
-                function_name = function_call["function"]
-                query = function_call["query"]
-
-                # Check if the function exists
-                if function_name in available_functions:
-                    function_to_call = available_functions[function_name]
-                    result = function_to_call(query)
-                    output_text(result)
-                else:
-                    result = f"Function '{function_name}' not found."
-                    output_text(result)
-
-            except json.JSONDecodeError:
-                # If not JSON, treat it as a direct response
-                # output_text(response_content)
-                # If not JSON, it means the LLM failed to use a tool or format its response correctly.
-                # Fallback to using ChatBot with the original user's speech.
-                logging.warning(f"LLM response was not valid JSON: '{response_content}'. Falling back to ChatBot with original speech: '{speech}'")
-                result = ChatBot(speech) # Directly use ChatBot with the original user speech
-                output_text(result)
+            function_calls = function_call_parser.parse_all(response_content)
+            if not function_calls:
+                # A direct answer, or no known function: answer with ChatBot from the original speech
+                logging.warning(f"LLM response named no function: '{response_content}'. Falling back to ChatBot with original speech: '{speech}'")
+                output_stream(ChatBotStream(speech))
+                continue
+
+            if not router_cache_hit:
+                # Cached in canonical form, so a repaired answer parses cleanly next time
+                completion_cache.put(router_cache_key, calls_to_json(function_calls), ROUTER_CACHE_TTL)
+
+            if len(function_calls) == 1 and function_calls[0].function in streaming_functions:
+                # Long answers are spoken sentence by sentence as they stream in
+                output_stream(streaming_functions[function_calls[0].function](function_calls[0].query))
+            else:
+                # Independent calls run concurrently, each within its deadline; their results become
+                # one reply. Slow background tools (image generation, search) announce their result later.
+                output_text(tool_executor.run_merged(function_calls, on_status=output_text, on_result=output_text))
 
     except KeyboardInterrupt:
         print("Program terminated by the user.")
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        logging.info(f"Intent router stats: {router_stats()}")
+        logging.info(f"Function call parser stats: {function_call_parser.stats()}")
+        logging.info(f"Tool executor stats: {tool_executor.stats()}")
+        logging.info(f"Tool cache stats: {tool_cache.stats()}")
+        logging.info(f"Web search stats: {web_search.stats()}")
+        logging.info(f"Search cache stats: {search_cache.stats()}")
+        logging.info(f"Retrieval stats: {retriever.stats()}")
+        logging.info(f"Ticker index stats: {ticker_index.stats()}")
+        logging.info(f"Quote service stats: {quote_service.stats()}")
+        logging.info(f"Stock history stats: {history_store.stats()}")
+        logging.info(f"Completion cache stats: {completion_cache.stats()}")
+        logging.info(f"Model cascade stats: router={router_cascade.stats()} chat={chat_cascade.stats()}")
 
 def main():
     # # --- Authentication Check ---
@@ -259,6 +309,8 @@ def main():
 
     parser = argparse.ArgumentParser(description="Jarvis AI Assistant")
     parser.add_argument("--ui-mode", action="store_true", help="Run in UI mode, bypassing initial hotword detection and enabling UI input.")
+    parser.add_argument("--no-prewarm", action="store_true", help="Do not import heavy modules in the background during authentication.")
+    parser.add_argument("--offline", action="store_true", help="Answer with the local model only (no cloud LLM calls).")
     args = parser.parse_args()
 
     if args.ui_mode:
@@ -267,7 +319,17 @@ def main():
     functions_module.set_main_ui_mode_status(IS_UI_MODE, UI_INPUT_MAGIC_START)
 
     output_text("Please authenticate.")
+    if args.offline:
+        # Load the local model while the user authenticates; it then stays resident
+        from BRAIN.text.LOCAL.llama_CPP import get_resident_model
+        set_offline_mode(True)
+        get_resident_model().start()
+    if not args.no_prewarm:
+        prewarm(PREWARM_MODULES)
+        if not args.offline:
+            prewarm_connections()
     try:
+        from BRAIN.auth.recoganize import AuthenticateFace # Imported here: OpenCV is slow to load
         auth_status = AuthenticateFace()
         # auth_status = 1 # Uncomment for testing without camera/auth
     except Exception as auth_exc:
@@ -282,6 +344,21 @@ def main():
         return # Stop execution if auth fails
     # --- End Authentication ---
 
+    # --- Start Background Tasks in Threads ---
+    # Started before the interaction loop, which only returns at shutdown, so the
+    # battery and pen drive watchers run (and invalidate the tool cache) meanwhile.
+    # Use daemon=True so they exit automatically when the main thread exits
+    from Automation.pen_drive_plug_check import pen_drive_connected
+    from Automation.battery_plug_check import check_plugin_status
+    from Automation.battery_alert import battery_alert
+    thread_battery_alert = threading.Thread(target=battery_alert, daemon=True)
+    thread_plugin_check = threading.Thread(target=check_plugin_status, daemon=True)
+    thread_pen_drive = threading.Thread(target=pen_drive_connected, daemon=True)
+
+    thread_battery_alert.start()
+    thread_plugin_check.start()
+    thread_pen_drive.start()
+
     # speak("Authentication successful. Starting Jarvis.")
     # logging.info("Authentication successful. Starting background tasks and main loop.")
     listener_thread = None # Initialize
@@ -317,16 +394,6 @@ def main():
             logging.info("KeyboardInterrupt in main_loop (standalone mode).")
 
 
-    # --- Start Background Tasks in Threads ---
-    # Use daemon=True so they exit automatically when the main thread exits
-    thread_battery_alert = threading.Thread(target=battery_alert, daemon=True)
-    thread_plugin_check = threading.Thread(target=check_plugin_status, daemon=True)
-    thread_pen_drive = threading.Thread(target=pen_drive_connected, daemon=True)
-
-    thread_battery_alert.start()
-    thread_plugin_check.start()
-    thread_pen_drive.start()
-
     # --- Start Main Conversational Loop (can be in main thread or its own thread) ---
     # Running main_loop directly in the main thread after auth is fine
     # main_loop()